@@ -1,12 +1,22 @@
 import sys
 import os
+import time
 from src.camera import CameraControl, Camera
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer  ,QDateTime
-from PyQt6.QtGui import QIntValidator, QPixmap, QImage, QIcon , QPen , QPainter , QColor , QTransform 
-from threading import Thread
+from src.pipeline import FramePipeline, FrameMailbox, BurstConverter
+from src.saver import SAVE_FORMATS, PNG_COMPRESSION_LEVELS
+from src.burstfile import openCapture, BURST_EXTENSION, TRIGGER_PRESET_FILE
+from src.transforms import prepareDisplayImage
+from src.framecache import ScaledFrameCache
+from src.thumbnails import ThumbnailCache, THUMBNAIL_HEIGHT, THUMBNAIL_MAX_WIDTH
+from src.export import ExportManager, SEQUENCE_FORMATS
+from src.synccapture import SyncCapture
+from src.telemetry import TelemetryService
+from src.profiling import profiler
+from PyQt6.QtCore import Qt, QObject, QThread, QSize, pyqtSignal, QTimer
+from PyQt6.QtGui import QIntValidator, QPixmap, QImage, QIcon 
+from threading import Condition
 from enum import Enum
 import numpy as np
-import cv2
 from PyQt6.QtWidgets import (
     QFrame,
     QApplication,
@@ -26,6 +36,10 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
     QScrollArea,
     QFileDialog,
+    QProgressBar,
+    QListWidget,
+    QListWidgetItem,
+    QProgressDialog,
 )
 
 class CameraSettingsFrame(QWidget):
@@ -83,6 +97,38 @@ class CameraSettingsFrame(QWidget):
         triggerActivationCombobox.setMinimumSize(30 , 30)
         triggerActivationCombobox.currentTextChanged.connect(self.triggerActivationChanged.emit)
         triggerLayout.addLayout(triggerActivationLayout)
+
+        saveFormatLayout = QHBoxLayout()
+        saveFormatLabel = QLabel("Save Format")
+        saveFormatLabel.setStyleSheet("font-size : 14px")
+        saveFormatLayout.addWidget(saveFormatLabel)
+        saveFormatCombobox = QComboBox()
+        saveFormatCombobox.addItems(SAVE_FORMATS)
+        saveFormatCombobox.setCurrentText(self.camera.frameSaver.saveFormat)
+        saveFormatCombobox.setMinimumSize(30 , 30)
+        saveFormatCombobox.currentTextChanged.connect(self._changeSaveFormat)
+        saveFormatLayout.addWidget(saveFormatCombobox)
+        self.pngCompressionCombobox = QComboBox()
+        self.pngCompressionCombobox.addItems([str(level) for level in PNG_COMPRESSION_LEVELS])
+        self.pngCompressionCombobox.setCurrentText(str(self.camera.frameSaver.pngCompression))
+        self.pngCompressionCombobox.setToolTip("PNG compression level")
+        self.pngCompressionCombobox.currentTextChanged.connect(lambda level: self.camera.frameSaver.setPngCompression(int(level)))
+        saveFormatLayout.addWidget(self.pngCompressionCombobox)
+        triggerLayout.addLayout(saveFormatLayout)
+
+        self.saveProgressBar = QProgressBar()
+        self.saveProgressBar.setFormat("Saving %v/%m")
+        self.saveProgressBar.setVisible(False)
+        triggerLayout.addWidget(self.saveProgressBar)
+
+    def _changeSaveFormat(self, saveFormat: str):
+        self.camera.frameSaver.setFormat(saveFormat)
+        self.pngCompressionCombobox.setEnabled(saveFormat == "png")
+
+    def updateSaveProgress(self, done: int, total: int):
+        self.saveProgressBar.setVisible(done < total)
+        self.saveProgressBar.setMaximum(total)
+        self.saveProgressBar.setValue(done)
         
 
     def _initCameraControlLayout(self):
@@ -176,6 +222,14 @@ class CameraSettingsFrame(QWidget):
         colorModeLayout.addWidget(monoButton)
         self.colorModeButtonGroup.addButton(monoButton , 1)
 
+        self.rawStorageButton = QPushButton("Keep Raw")
+        self.rawStorageButton.setToolTip("Keep trigger bursts as Bayer data and demosaic frames when viewed or saved")
+        self.rawStorageButton.setCheckable(True)
+        self.rawStorageButton.setEnabled(self.camera.supportsRawStorage())
+        self.rawStorageButton.setChecked(self.camera.rawStorage)
+        self.rawStorageButton.toggled.connect(lambda checked: setattr(self.camera , "rawStorage" , checked))
+        colorModeLayout.addWidget(self.rawStorageButton)
+
         if self.camera.colored:
             colorButton.setChecked(True)
         else:
@@ -361,6 +415,7 @@ class SettingsWindow(QWidget):
 
         self._initCameraDisplayLayout()
         self._initCameraSettingsLayout()
+        self._initCaptureToolsLayout()
         self._initFrameViewerLayout()
         
         if cameras:
@@ -449,6 +504,24 @@ class SettingsWindow(QWidget):
         
         self.cameraSettingsSelectionGroup.buttonClicked.connect(self._onCameraSettingsClicked)
 
+    def _initCaptureToolsLayout(self):
+        captureToolsLayout = QVBoxLayout()
+        captureToolsLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.syncTriggerButton = QPushButton("Trigger All Cameras")
+        self.syncTriggerButton.setToolTip("Start one burst on every camera at the same moment")
+        self.syncTriggerButton.setEnabled(len(self.cameras) > 1)
+        captureToolsLayout.addWidget(self.syncTriggerButton)
+        self.telemetryLogButton = QPushButton("Log Telemetry")
+        self.telemetryLogButton.setCheckable(True)
+        self.telemetryLogButton.setToolTip("Write stream and pipeline counters to a CSV or JSON lines file")
+        captureToolsLayout.addWidget(self.telemetryLogButton)
+        self.profileButton = QPushButton("Profile Stages")
+        self.profileButton.setCheckable(True)
+        self.profileButton.setChecked(profiler.enabled)
+        self.profileButton.setToolTip("Time every pipeline stage, the p50/p99/max report is printed when switched off")
+        captureToolsLayout.addWidget(self.profileButton)
+        self.mainLayout.addLayout(captureToolsLayout)
+
     def _initFrameViewerLayout(self):
         frameViewerLayout = QVBoxLayout()
         frameViewerLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -469,70 +542,117 @@ class SettingsWindow(QWidget):
 
 class TriggerWorker(QThread):
     workerEnd = pyqtSignal()
-    imagesProcessed = pyqtSignal(int , list , list)
+    imagesProcessed = pyqtSignal(int , object , list)
+    saveProgress = pyqtSignal(int , int , int)
+    saveFinished = pyqtSignal(int , str , int)
+    conversionFailed = pyqtSignal(int , int , int)
 
-    def __init__(self, camera: Camera, cameraIndex: int):
+    def __init__(self, camera: Camera, cameraIndex: int, conversionWorkers=2):
         super().__init__()
         self.camera = camera
         self.cameraIndex = cameraIndex
+        self.conversionWorkers = conversionWorkers
+        self.firstTimestamp = 0
         self.dir = f"output/Camera{cameraIndex+1}"
         self.triggerSource = "Software"
         self.triggerActivation = "FallingEdge"
+        self.syncCapture = None
+        self.syncIndex = 0
 
     def run(self):
-        
+        converter = None
         try:
-            if self.triggerSource == "Software":
+            delay = self.camera.TriggerDelay.get()
+            converter = BurstConverter(
+                self.camera.storeFrame,
+                self.camera.frameStore,
+                workers=self.conversionWorkers,
+                createWorkerState=self.camera.createConversionContext,
+                release=lambda rawImage: rawImage.release(),
+            )
+
+            # A synchronized capture is fired by the coordinator once every camera is armed
+            if self.triggerSource == "Software" and self.syncCapture is None:
                 self.camera.TriggerSoftware.send_command()
 
             while self.camera.isTriggered:
-                rawImage = self.camera.getRawImage()  
-                if rawImage is None:
+                remaining = self.camera.FramesQuantity - self.camera.FramesCaptured
+                with profiler.span("burstDequeue", self.cameraIndex):
+                    rawImages = self.camera.getRawImages(remaining)
+                if not rawImages:
                     continue
                     
                 if self.camera.type == "MER" and self.camera.FramesCaptured == 0:
                     self.camera.TriggerMode.set("OFF")
 
-                self.camera.rawImages.append(rawImage)
+                # Conversion runs on the pool while the next batch is being captured
+                for rawImage in rawImages:
+                    self._record_timestamp(rawImage, delay)
+                    converter.submit(self.camera.FramesCaptured, rawImage)
+                    self.camera.FramesCaptured += 1
                 
-                if self.camera.FramesCaptured + 1 >= self.camera.FramesQuantity:
+                if self.camera.FramesCaptured >= self.camera.FramesQuantity:
                     break
-                    
-                self.camera.FramesCaptured += 1
 
-            if len(self.camera.rawImages) >= 5:
+            converter.finish()
+            print(f"Camera {self.cameraIndex+1} conversion: {converter.getStatistics()}")
+            self._drop_failed_frames()
+            self._finish_sync()
+            if len(self.camera.frameStore) >= 5:
                 self._process_images()
                 
         except Exception as e:
             print(f"Error in trigger worker {self.cameraIndex}: {e}")
+            if converter is not None:
+                converter.cancel()
         finally:
+            if self.syncCapture is not None:
+                # Never leave the other cameras waiting for this one
+                self.syncCapture.drop(self.syncIndex)
+                self.syncCapture = None
             self.stopTrigger()
 
+    def _finish_sync(self):
+        if self.syncCapture is None:
+            return
+        firstTimestamp = self.firstTimestamp if self.camera.timestamps else None
+        startOffset = self.syncCapture.burstGathered(self.syncIndex, firstTimestamp)
+        # Put this burst on the time axis shared by all cameras of the capture
+        if startOffset:
+            self.camera.timestamps[:] = [timestamp + startOffset for timestamp in self.camera.timestamps]
+
+    def _drop_failed_frames(self):
+        # Frames that could not be converted leave empty slots, they are removed rather than saved as black frames
+        missing = self.camera.frameStore.compact(self.camera.FramesCaptured)
+        if not missing:
+            return
+        missingIndices = set(missing)
+        self.camera.timestamps[:] = [timestamp for index, timestamp in enumerate(self.camera.timestamps)
+                                     if index not in missingIndices]
+        self.conversionFailed.emit(self.cameraIndex, len(missing), self.camera.FramesCaptured)
+
+    def _record_timestamp(self, rawImage, delay):
+        # First frame is stamped with the trigger delay, the rest relative to it in μs
+        if not self.camera.timestamps:
+            self.firstTimestamp = rawImage.get_timestamp()
+            self.camera.timestamps.append(delay)
+        else:
+            self.camera.timestamps.append(int(rawImage.get_timestamp() - self.firstTimestamp) / 1000 + delay)
+        self.camera.frameStore.frameIds.append(rawImage.get_frame_id())
+
 
     def _process_images(self):
         try:
-            delay = self.camera.TriggerDelay.get()
-            # delay *=1e12 
-            print(delay)
-            for i, rawImage in enumerate(self.camera.rawImages):
-                if i > 0:
-                    self.camera.timestamps.append(int(rawImage.get_timestamp() - self.camera.timestamps[0] ) / 1000  + delay)
-                else:
-                    self.camera.timestamps.append(rawImage.get_timestamp())
-                numpyImage = self.camera.convertRawImage(rawImage)
-                self.camera.numpyImages.append(numpyImage)
-
-                self.camera.images.append(self.camera.getImage(numpyImage))
-            
-            if self.camera.timestamps:
-                self.camera.timestamps[0] = delay
-                
-                
-            print(f"Camera {self.cameraIndex+1} recorded: {len(self.camera.rawImages)} frames")
+            print(f"Camera {self.cameraIndex+1} recorded: {len(self.camera.frameStore)} frames")
             dirPath = self.checkDir()
-            self.camera.presetManager.saveToFile("trigger" , f"{dirPath}/Trigger_preset.json") 
-            Thread(target=self.camera.saveImages , args=(dirPath ,) , daemon=True).start()
-            self.imagesProcessed.emit(self.cameraIndex , self.camera.numpyImages , self.camera.timestamps)
+            self.camera.frameStore.path = dirPath
+            self.camera.presetManager.saveToFile("trigger" , f"{dirPath}/{TRIGGER_PRESET_FILE}") 
+            self.camera.saveImages(
+                dirPath,
+                onProgress=lambda done, total: self.saveProgress.emit(self.cameraIndex, done, total),
+                onFinished=lambda path, failed: self.saveFinished.emit(self.cameraIndex, path, failed),
+            )
+            self.imagesProcessed.emit(self.cameraIndex , self.camera.frameStore , self.camera.timestamps)
  
             
         except Exception as e:
@@ -540,22 +660,25 @@ class TriggerWorker(QThread):
 
 
     
-    def startTrigger(self):
+    def startTrigger(self, syncCapture=None, syncIndex=0):
         try:
             if self.isRunning():
                 print(f"Camera {self.cameraIndex+1} thread is already running!")
                 return False
+            self.syncCapture = syncCapture
+            self.syncIndex = syncIndex
+            triggerSource = syncCapture.triggerSource() if syncCapture is not None else self.triggerSource
             self.camera.isTriggered = True
             
-            self.camera.rawImages.clear()
-            self.camera.numpyImages.clear()
-            self.camera.images.clear()
-            self.camera.timestamps.clear()
+            # Fresh containers per burst: the frame viewer may still hold the previous ones
+            self.camera.frameStore = self.camera.createFrameStore()
+            self.camera.timestamps = []
             self.camera.FramesCaptured = 0
 
             self.camera.cam.stream_off()
 
-            self.camera.triggerSettings(self.triggerSource , self.triggerActivation)
+            self.camera.triggerSettings(triggerSource , self.triggerActivation)
+            self.camera.enableFramePool()
 
             self.camera.cam.stream_on()
 
@@ -563,14 +686,18 @@ class TriggerWorker(QThread):
 
             print(f"Camera {self.cameraIndex+1} Trigger Started")
             self.start()
+            return True
         except Exception as e:
             print(f"Error starting trigger: {e}")
+            self.syncCapture = None
+            return False
 
     def stopTrigger(self):
         if not self.camera.isTriggered:
             return
         self.camera.isTriggered = False
         print(f"Stopping camera {self.cameraIndex+1} trigger...")
+        self.camera.disableFramePool()
         self.camera.defaultSettings()
         self.camera.FramesCaptured = 0
         
@@ -600,91 +727,119 @@ class TriggerWorker(QThread):
         return destPath
 
 class ImageWorker(QThread):
-    imageReady = pyqtSignal(int, QPixmap)  
-
-    
-    def __init__(self, camera: Camera, cameraIndex: int):
+    def __init__(self, camera: Camera, cameraIndex: int, conversionWorkers: int = 2, queueSize: int = 4):
         super().__init__()
         self.camera = camera
         self.cameraIndex = cameraIndex
         self.is_running = True
+        self.conversionWorkers = conversionWorkers
+        self.queueSize = queueSize
+        self.pipeline = None
+        self.mailbox = FrameMailbox()
+        self.targetSize = (0, 0)
         
     def run(self):
+        self.camera.cam.stream_off()
+        self.camera.enableFramePool()
         self.camera.cam.stream_on()
         self.is_running = True
-        while self.is_running:
-            try:
-                rawImage = self.camera.getRawImage()
-                if rawImage is None:
-                    self.msleep(10)
-                    continue
+        self.pipeline = FramePipeline(
+            self.processFrame,
+            self.mailbox.post,
+            workers=self.conversionWorkers,
+            queueSize=self.queueSize,
+            createWorkerState=self.camera.createConversionContext,
+            release=lambda rawImage: rawImage.release(),
+        )
+        self.pipeline.start()
+        try:
+            while self.is_running:
+                try:
+                    start = time.perf_counter()
+                    with profiler.span("dequeue", self.cameraIndex):
+                        rawImage = self.camera.acquireFrame()
+                    if rawImage is None:
+                        self.msleep(10)
+                        continue
+                    self.pipeline.recordAcquire(time.perf_counter() - start)
+                    self.pipeline.submit(rawImage)
+                except Exception as e:
+                    self.msleep(100)
+        finally:
+            self.pipeline.stop()
+            print(f"Camera {self.cameraIndex+1} preview pipeline: {self.getStatistics()}")
 
-                numpyImage = self.camera.convertRawImage(rawImage)
-                pixmap = self.numpyToPixmap(numpyImage)
-                if self.camera.crosshairEnabled:
-                    pixmap = self.addCrosshair(pixmap)
-                if self.camera.imageAngle != 0 :
-                    pixmap = self.rotateImage(pixmap , self.camera.imageAngle)
-                if self.camera.flipHorEnabled or self.camera.flipVerEnabled:
-                    pixmap = self.flipImage(pixmap)
-                if pixmap:
-                    self.imageReady.emit(self.cameraIndex, pixmap)
-                self.msleep(10)
-            except Exception as e:
-                self.msleep(100)
+    def processFrame(self, rawImage, conversionContext):
+        with profiler.span("convert", self.cameraIndex):
+            numpyImage = self.camera.convertRawImage(rawImage, context=conversionContext)
+        if numpyImage is None:
+            return None
+        width, height = self.targetSize
+        with profiler.span("transform", self.cameraIndex):
+            displayImage = prepareDisplayImage(
+                numpyImage,
+                width,
+                height,
+                self.camera.imageAngle,
+                self.camera.flipHorEnabled,
+                self.camera.flipVerEnabled,
+                self.camera.crosshairEnabled,
+            )
+        with profiler.span("toQImage", self.cameraIndex):
+            return self.numpyToQImage(displayImage)
+
+    def getStatistics(self):
+        statistics = {"display" : self.mailbox.getStatistics()}
+        if self.pipeline is not None:
+            statistics.update(self.pipeline.getStatistics())
+        return statistics
+
+    def getTelemetry(self):
+        # Telemetry source: SDK stream counters plus the host side of the preview pipeline
+        counters = self.camera.readStreamCounters()
+        display = self.mailbox.getStatistics()
+        counters["displayed"] = display["displayed"]
+        counters["displaySkipped"] = display["skipped"]
+        gauges = {
+            "previewRunning" : self.isRunning(),
+            "triggered" : self.camera.isTriggered,
+            "poolOutstanding" : self.camera.getPoolStatistics()["outstanding"],
+        }
+        timers = {}
+        pipeline = self.pipeline
+        if pipeline is not None:
+            statistics = pipeline.getStatistics()
+            counters["converted"] = statistics["delivered"]
+            counters["dropped"] = statistics["dropped"]
+            gauges["queueDepth"] = statistics["queueDepth"]
+            for name, key in (("dequeue", "acquire"), ("queueWait", "queueWait"), ("convert", "convert")):
+                timers[name] = (statistics[key]["count"], statistics[key]["totalMs"])
+        return {"counters" : counters, "timers" : timers, "gauges" : gauges}
     
     def stop(self):
         self.is_running = False
         self.wait()
 
 
-    def numpyToPixmap(self, numpyImage):
+    def numpyToQImage(self, numpyImage):
         try:
             if numpyImage is None:
                 return None
                 
             if numpyImage.ndim == 2:
                 height, width = numpyImage.shape
-                bytes_per_line = width
-                q_image = QImage(numpyImage.data, width, height, bytes_per_line, QImage.Format.Format_Grayscale8)
+                q_image = QImage(numpyImage.data, width, height, numpyImage.strides[0], QImage.Format.Format_Grayscale8)
             elif numpyImage.ndim == 3 and numpyImage.shape[2] == 3:
                 height, width, channels = numpyImage.shape
-                bytes_per_line = 3 * width
-                q_image = QImage(numpyImage.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
+                q_image = QImage(numpyImage.data, width, height, numpyImage.strides[0], QImage.Format.Format_RGB888)
             else:
                 print(f"Unsupported image format: {numpyImage.shape}")
                 return None
                 
-            return QPixmap.fromImage(q_image)
+            return q_image.copy()
         except Exception as e:
-            print(f"Error converting numpy to pixmap: {e}")
+            print(f"Error converting numpy to image: {e}")
             return None
-
-    def addCrosshair(self , pixmap:QPixmap):
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        pen = QPen(QColor(255 , 0 , 0))
-        pen.setWidth(3)
-        painter.setPen(pen)
-
-        width = pixmap.width()
-        height = pixmap.height()
-        x = int(width/2)
-        y = int(height/2)
-
-        painter.drawLine(0 , y , width , y)
-        painter.drawLine(x , 0 , x , height)
-        painter.end()
-
-        return pixmap
-
-    def rotateImage(self , pixmap:QPixmap , angle):
-        return pixmap.transformed(QTransform().rotate(angle))
-    
-    def flipImage(self , pixmap:QPixmap):
-        flipped_image = QImage(pixmap).mirrored(horizontal=self.camera.flipHorEnabled , vertical=self.camera.flipVerEnabled)
-        return pixmap.fromImage(flipped_image)
     
 class ImageWindow(QVBoxLayout):
     def __init__(self, parent, cameras: list[Camera]):
@@ -791,16 +946,15 @@ class ImageWindow(QVBoxLayout):
 
 
 
-    def updateImage(self, camera_index: int, pixmap: QPixmap):
+    def updateImage(self, camera_index: int, image: QImage):
         if 0 <= camera_index < len(self.displayImagesLabels):
-            scaled_pixmap = pixmap.scaled(
-                self.displayImagesLabels[camera_index].size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.displayImagesLabels[camera_index].setPixmap(scaled_pixmap)
+            with profiler.span("display", camera_index):
+                self.displayImagesLabels[camera_index].setPixmap(QPixmap.fromImage(image))
 
 class MainWindow(QMainWindow):
+    syncCaptureReported = pyqtSignal(object)
+    telemetrySampled = pyqtSignal(object, object)
+
     def __init__(self):
         super().__init__()
         self.setMinimumSize(1024, 780)
@@ -834,7 +988,11 @@ class MainWindow(QMainWindow):
         self.settingsWindow.cameraDisplaySelectionGroup.buttonClicked.connect(lambda button: self.imageLayout.setDisplayMode("Single", self.settingsWindow.cameraDisplaySelectionGroup.id(button)))
         
         self.settingsWindow.frameViewerButton.clicked.connect(self._showFrameViewer)
+        self.settingsWindow.syncTriggerButton.clicked.connect(self._triggerAllCameras)
+        self.syncCaptureReported.connect(self._onSyncCaptureReported)
         self._initCameraWorkers()
+        self._initDisplayTimer()
+        self._initTelemetry()
 
         self.setCentralWidget(self.stackedWidget)
         self.stackedWidget.setCurrentIndex(0)
@@ -843,7 +1001,6 @@ class MainWindow(QMainWindow):
     def _initCameraWorkers(self):
         for i, camera in enumerate(self.cameraControl.cameras):
             imageWorker = ImageWorker(camera, i)
-            imageWorker.imageReady.connect(self._onImageReady)
             self.imageWorkers.append(imageWorker)
 
             triggerWorker = TriggerWorker(camera, i )
@@ -852,6 +1009,9 @@ class MainWindow(QMainWindow):
             self.triggerWorkers.append(triggerWorker)
             
             settings_frame = self.settingsWindow.cameraSettingsFrames[i]
+            triggerWorker.saveProgress.connect(lambda idx , done , total , frame=settings_frame: frame.updateSaveProgress(done , total))
+            triggerWorker.saveFinished.connect(lambda idx , path , failed: self._onImagesSaved(idx , path , failed))
+            triggerWorker.conversionFailed.connect(lambda idx , dropped , total: self._onConversionFailed(idx , dropped , total))
             settings_frame.playButton.clicked.connect(lambda checked, idx=i: self._toggleCameraRecording(checked, idx))
             settings_frame.applyButton.clicked.connect(lambda checked, idx=i: self._applyCameraSettings(idx))
             settings_frame.triggerButton.clicked.connect(lambda checked , idx = i : self._toggleCameraTrigger(checked , idx))
@@ -859,6 +1019,67 @@ class MainWindow(QMainWindow):
             settings_frame.triggerActivationChanged.connect(triggerWorker._onTriggerActivationChange)
             settings_frame.captureModeButtonGroup.buttonClicked.connect(lambda btn , idx = i : self._toggleCaptureMode(btn , idx))
 
+    def _initTelemetry(self):
+        self.telemetry = TelemetryService(onSample=self.telemetrySampled.emit)
+        for cameraIndex, imageWorker in enumerate(self.imageWorkers):
+            self.telemetry.addSource(cameraIndex, imageWorker.getTelemetry)
+        self.telemetrySampled.connect(self._onTelemetrySample)
+        self.settingsWindow.telemetryLogButton.toggled.connect(self._toggleTelemetryLog)
+        self.settingsWindow.profileButton.toggled.connect(self._toggleProfiling)
+        self.telemetry.start()
+
+    def _onTelemetrySample(self, cameraIndex, sample: dict):
+        if not 0 <= cameraIndex < len(self.imageLayout.fpsLabels):
+            return
+        fpsLabel = self.imageLayout.fpsLabels[cameraIndex]
+        fpsLabel.setText(
+            f"FPS : {sample.get('StreamDeliveredFrameCountRate', 0.0):.1f}"
+            f"  Display : {sample.get('displayedRate', 0.0):.1f}"
+            f"  Lost : {sample.get('StreamLostFrameCount', 0)}"
+            f"  Incomplete : {sample.get('StreamIncompleteFrameCount', 0)}"
+        )
+        fpsLabel.setToolTip("\n".join(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}" for key, value in sample.items()))
+
+    def _toggleTelemetryLog(self, checked: bool):
+        if not checked:
+            self.telemetry.stopLog()
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Telemetry Log", "output/telemetry.csv", "CSV (*.csv);;JSON Lines (*.jsonl)")
+        if not path:
+            self.settingsWindow.telemetryLogButton.setChecked(False)
+            return
+        try:
+            logFormat = self.telemetry.startLog(path)
+            print(f"Logging telemetry to {path} ({logFormat})")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Cannot write telemetry log: {str(e)}")
+            self.settingsWindow.telemetryLogButton.setChecked(False)
+
+    def _toggleProfiling(self, checked: bool):
+        if checked:
+            profiler.reset()
+            profiler.setEnabled(True)
+        else:
+            profiler.setEnabled(False)
+            print(profiler.report())
+
+    def _initDisplayTimer(self):
+        refreshRate = 60.0
+        screen = QApplication.primaryScreen()
+        if screen is not None and screen.refreshRate() > 0:
+            refreshRate = screen.refreshRate()
+        self.displayTimer = QTimer(self)
+        self.displayTimer.timeout.connect(self._refreshDisplays)
+        self.displayTimer.start(max(1, int(1000 / refreshRate)))
+
+    def _refreshDisplays(self):
+        for cameraIndex, worker in enumerate(self.imageWorkers):
+            label = self.imageLayout.displayImagesLabels[cameraIndex]
+            worker.targetSize = (label.width(), label.height())
+            image = worker.mailbox.take()
+            if image is not None:
+                self.imageLayout.updateImage(cameraIndex, image)
+
     def startCameraTrigger(self, cameraIndex:int):
         triggerWorker = self.triggerWorkers[cameraIndex]
         imageWorker = self.imageWorkers[cameraIndex]
@@ -883,17 +1104,63 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.settingsWindow.cameraSettingsFrames[cameraIndex].triggerButton.setChecked(False)
 
-    def _onImageReady(self, cameraIndex: int, pixmap: QPixmap):
-        self.imageLayout.updateImage(cameraIndex, pixmap)
+    def _triggerAllCameras(self):
+        cameras = self.cameraControl.cameras
+        syncCapture = SyncCapture(cameras, self.cameraControl.deviceManager, onReport=self.syncCaptureReported.emit)
+        try:
+            syncCapture.arm()
+            print(f"Synchronized capture of {len(cameras)} cameras ({syncCapture.mode})")
+
+            for cameraIndex, triggerWorker in enumerate(self.triggerWorkers):
+                self.imageWorkers[cameraIndex].stop()
+                settingsFrame = self.settingsWindow.cameraSettingsFrames[cameraIndex]
+                settingsFrame.captureModeButtonGroup.button(1).setChecked(True)
+                if triggerWorker.startTrigger(syncCapture, cameraIndex):
+                    settingsFrame.triggerButton.setChecked(True)
+                else:
+                    syncCapture.drop(cameraIndex)
+
+            # Clocks are latched last so the offsets are as fresh as possible when the trigger goes out
+            syncCapture.calibrate()
+            syncCapture.fire()
+        except Exception as e:
+            print(f"Error in synchronized capture: {e}")
+            QMessageBox.critical(self, "Error", f"Synchronized capture failed: {str(e)}")
+            # Release every burst from waiting on the others before stopping the workers one by one
+            for cameraIndex in range(len(cameras)):
+                syncCapture.drop(cameraIndex)
+            for triggerWorker in self.triggerWorkers:
+                triggerWorker.stopTrigger()
+
+    def _onSyncCaptureReported(self, report: dict):
+        offsets = ", ".join(f"camera {index+1}: {offset:.1f} µs" for index, offset in sorted(report["startOffsetsUs"].items()))
+        skew = "n/a" if report["skewUs"] is None else f"{report['skewUs']:.1f} µs"
+        print(f"Synchronized capture ({report['mode']}): start skew {skew}, {report['gathered']}/{report['cameras']} cameras [{offsets}]")
 
     def _omImagesProcessed(self, index:int , images:list , timestamps:list):
         if len(images) >=5:
-            self.frameViewer.load_camera_data(index , images , timestamps)
+            frameRate = self.cameraControl.cameras[index].presetManager.getPreset("trigger").get("FrameRate")
+            self.frameViewer.load_camera_data(index , images , timestamps , frameRate)
 
             QTimer.singleShot(100 , lambda: [self.frameViewer.update_display_for_camera(index), self._showFrameViewer()])
             
 
 
+    def _onImagesSaved(self, cameraIndex: int, dirPath: str, failed: int):
+        settingsFrame = self.settingsWindow.cameraSettingsFrames[cameraIndex]
+        settingsFrame.saveProgressBar.setVisible(False)
+        if failed:
+            print(f"Camera {cameraIndex+1}: {failed} frames failed to save to {dirPath}")
+        else:
+            print(f"Camera {cameraIndex+1} saved to {dirPath}")
+
+
+    def _onConversionFailed(self, cameraIndex: int, dropped: int, total: int):
+        QMessageBox.warning(self, "Capture Warning",
+                            f"Camera {cameraIndex+1}: {dropped} of {total} frames could not be converted "
+                            f"and were left out of the capture.")
+
+
     def _onTriggerWorkerFinished(self,  cameraIndex: int): 
         QTimer.singleShot(50, lambda: self._update_trigger_ui(cameraIndex))
 
@@ -952,9 +1219,17 @@ class MainWindow(QMainWindow):
             camera.presetManager.changePreset("trigger", triggerPreset)
             print(f"Applying preset for camera {cameraIndex + 1}: {triggerPreset}")
 
-            camera.cam.stream_off()
-            camera.applyPreset(triggerPreset)
-            camera.cam.stream_on()
+            # Only changed features are written, the stream restarts only for features locked while it runs.
+            # The preview is paused so none of its pooled frames are in flight when the stream restarts
+            previewWorker = self.imageWorkers[cameraIndex]
+            previewRunning = previewWorker is not None and previewWorker.isRunning()
+            if previewRunning:
+                previewWorker.stop()
+            try:
+                camera.applyPreset(triggerPreset)
+            finally:
+                if previewRunning:
+                    previewWorker.start()
 
             fpsLabel.setText(str(camera.CurrentFrameRate.get()))
             
@@ -976,6 +1251,9 @@ class MainWindow(QMainWindow):
         
 
     def closeEvent(self, event):
+        self.telemetry.stop()
+        if profiler.enabled:
+            print(profiler.report())
         for worker in self.imageWorkers:
             if worker and worker.isRunning():
                 worker.stop()
@@ -989,37 +1267,35 @@ class MainWindow(QMainWindow):
         event.accept()
 
 
+def capture_directory(images):
+    # Directory a burst was saved to or opened from, None for bursts that only live in memory
+    path = getattr(images, "path", None)
+    if path and os.path.isfile(path):
+        path = os.path.dirname(path)
+    return path
+
+
 class VideoDirection(Enum):
     forward = 1
     backward = -1
 
-class FrameWorker(QThread):
-    frame_ready = pyqtSignal(int, QPixmap, str) 
-    
+# Renders frames on the PlaybackEngine thread and posts them to a mailbox the viewer's display
+# timer drains, so a slow GUI only ever skips frames instead of queueing them. target_size is
+# published by the GUI thread, widgets are never touched from here.
+class FrameWorker(QObject):
     def __init__(self, camera_index, cam_attributes):
         super().__init__()
         self.camera_index = camera_index
         self.cam_attributes = cam_attributes
-        self.is_running = False
         self.video_direction = VideoDirection.forward
-        self.target_fps = 10
-        self.frame_delay_ms = 1000 // self.target_fps
-        self.last_frame_time = 0
+        self.frame_cache = ScaledFrameCache()
+        self.mailbox = FrameMailbox()
+        self.target_size = (0, 0)
+        self._timeline = None
+        self._timeline_key = None
 
-    def run(self):
-        self.is_running = True
-        while self.is_running:
-            if not self.cam_attributes or not self.cam_attributes["images"]:
-                self.msleep(16)  
-                continue
-                
-            current_time = QDateTime.currentMSecsSinceEpoch()
-            if current_time - self.last_frame_time < self.frame_delay_ms:
-                self.msleep(1)  
-                continue
-                
-            self.last_frame_time = current_time
-            self._process_frame()
+    def has_frames(self):
+        return bool(self.cam_attributes and self.cam_attributes["images"])
 
     def set_current_index(self, index):
         if self.cam_attributes and "images" in self.cam_attributes:
@@ -1027,84 +1303,366 @@ class FrameWorker(QThread):
             if images and 0 <= index < len(images):
                 self.cam_attributes["currentIndex"] = index
 
-    def _process_frame(self):
-        images = self.cam_attributes["images"]
+    def frame_interval(self, current_index, new_index):
+        # Seconds between two neighbouring frames as captured, None when unknown or wrapping around
         timestamps = self.cam_attributes["timestamps"]
-        
+        if abs(new_index - current_index) != 1 or not timestamps or max(current_index, new_index) >= len(timestamps):
+            return None
+        return abs(timestamps[new_index] - timestamps[current_index]) / 1e6
+
+    def advance(self):
+        images = self.cam_attributes["images"]
         if not images:
-            return
+            return None
             
         current_index = self.cam_attributes["currentIndex"]
-        
-        if self.video_direction == VideoDirection.forward:
-            new_index = (current_index + 1) % len(images)
-        else:
-            new_index = (current_index - 1) % len(images)
-        
-        self.cam_attributes["currentIndex"] = new_index
-        
-        frame = images[new_index]
-        timestamp = timestamps[new_index] if timestamps else 0
-        
-        pixmap = self._numpy_to_pixmap(frame)
-        if pixmap:
-            scaled_pixmap = self._get_scaled_pixmap(pixmap)
-            info_text = f"Frame: {new_index}\nTime: {timestamp}"
-            self.frame_ready.emit(self.camera_index, scaled_pixmap, info_text)
+        new_index = (current_index + self.video_direction.value) % len(images)
+        self.show_frame(new_index)
+        return new_index
 
-    def _numpy_to_pixmap(self, numpy_image):
+    def show_frame(self, index):
+        timestamps = self.cam_attributes["timestamps"]
+        self.cam_attributes["currentIndex"] = index
+        timestamp = timestamps[index] if index < len(timestamps) else 0
+        
+        q_image = self.render_image(index)
+        if q_image is not None:
+            info_text = f"Frame: {index}\nTime: {timestamp}"
+            self.mailbox.post((q_image, info_text, index))
+        self.prefetch(index, self.video_direction)
+
+    def timeline(self):
+        # Capture times in μs as a sorted array, rebuilt only when the loaded burst changes
+        images = self.cam_attributes["images"]
+        timestamps = self.cam_attributes["timestamps"]
+        key = (id(images), len(images), id(timestamps), len(timestamps))
+        if self._timeline_key != key:
+            if len(timestamps) >= len(images):
+                self._timeline = np.asarray(timestamps[:len(images)], dtype=np.float64)
+            else:
+                self._timeline = np.arange(len(images), dtype=np.float64) * self.frame_period()
+            self._timeline_key = key
+        return self._timeline
+
+    def frame_period(self, default_fps=10):
+        # μs between frames at the frame rate the burst was captured with
+        frame_rate = self.cam_attributes.get("frameRate") or default_fps
+        return 1e6 / frame_rate
+
+    def index_at(self, position, mode="nearest"):
+        timeline = self.timeline()
+        index = int(np.searchsorted(timeline, position, side="right")) - 1
+        if index < 0:
+            return 0
+        if mode == "nearest" and index + 1 < len(timeline) and timeline[index + 1] - position < position - timeline[index]:
+            return index + 1
+        return min(index, len(timeline) - 1)
+
+    @staticmethod
+    def _numpy_to_qimage(numpy_image):
         if numpy_image is None:
             return None
-            
         try:
-            if numpy_image is None:
-                return None
-                
             if numpy_image.ndim == 2:
                 height, width = numpy_image.shape
-                bytes_per_line = width
-                q_image = QImage(numpy_image.data, width, height, bytes_per_line, QImage.Format.Format_Grayscale8)
+                return QImage(numpy_image.data, width, height, numpy_image.strides[0], QImage.Format.Format_Grayscale8).copy()
             elif numpy_image.ndim == 3 and numpy_image.shape[2] == 3:
                 height, width, channels = numpy_image.shape
-                bytes_per_line = 3 * width
-                q_image = QImage(numpy_image.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-            
-            return QPixmap.fromImage(q_image)
-            
+                return QImage(numpy_image.data, width, height, numpy_image.strides[0], QImage.Format.Format_RGB888).copy()
         except Exception as e:
-            print(f"Error converting numpy to pixmap: {e}")
+            print(f"Error converting numpy to image: {e}")
+        return None
+
+    def render_image(self, index):
+        # Scaled frames come from the cache, only the small QImage wrapper is built per display
+        width, height = self.target_size
+        frame = self.frame_cache.get(index, width, height)
+        return self._numpy_to_qimage(frame)
+
+    def render_pixmap(self, index):
+        q_image = self.render_image(index)
+        if q_image is None:
             return None
+        return QPixmap.fromImage(q_image)
 
-    def _get_scaled_pixmap(self, pixmap):
-        label_size = self.cam_attributes["imageLabel"].size()
-        if (hasattr(self, '_cached_size') and 
-            hasattr(self, '_cached_pixmap') and
-            self._cached_size == label_size and
-            self._cached_pixmap is not None):
-            return self._cached_pixmap
-            
-        scaled_pixmap = pixmap.scaled(
-            label_size, 
-            Qt.AspectRatioMode.KeepAspectRatio, 
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self._cached_size = label_size
-        self._cached_pixmap = scaled_pixmap
-        return scaled_pixmap
+    def prefetch(self, index, direction: VideoDirection):
+        width, height = self.target_size
+        self.frame_cache.prefetch(index, direction.value, width, height)
 
     def change_video_direction(self, direction: VideoDirection):
         self.video_direction = direction
 
+
+# One scheduling thread for every camera in the frame viewer. Each camera has its own
+# deadline which is advanced by the frame interval, not reset from the current time, so
+# pacing does not drift. While paused or with nothing to show the thread sleeps on a condition.
+# In synchronized mode a single clock walks the capture timeline instead and every camera
+# shows its frame for the same moment in one tick.
+class PlaybackEngine(QThread):
+    MAX_FPS = 240
+    SYNC_MODES = ("nearest", "hold")
+
+    def __init__(self, workers: list[FrameWorker]):
+        super().__init__()
+        self.workers = workers
+        self.fps = 10
+        self.realtime = False
+        self.speed = 1.0
+        self.playing = False
+        self.running = True
+        self.deadlines: dict[int, float] = {}
+        self.condition = Condition()
+
+        self.synchronized = False
+        self.sync_mode = "nearest"
+        self.direction = VideoDirection.forward
+        self.position = None
+        self.clock_deadline = None
+        self.last_tick = None
+
+    def run(self):
+        while True:
+            with self.condition:
+                active = self._active_workers()
+                while self.running and not active:
+                    self.condition.wait()
+                    active = self._active_workers()
+                if not self.running:
+                    return
+
+                now = time.perf_counter()
+                if self.synchronized:
+                    if self.clock_deadline is None:
+                        self.clock_deadline = now
+                    if self.clock_deadline > now:
+                        self.condition.wait(self.clock_deadline - now)
+                        continue
+                    due = None
+                else:
+                    due = self._due_workers(active, now)
+                    if due is None:
+                        continue
+
+            if due is None:
+                self._tick(active, now)
+            else:
+                for worker in due:
+                    self._step(worker, now)
+
+    def _due_workers(self, active, now):
+        # Called with the condition held, returns None after waiting for the next deadline
+        for worker in active:
+            self.deadlines.setdefault(worker.camera_index, now)
+        deadline = min(self.deadlines[worker.camera_index] for worker in active)
+        if deadline > now:
+            self.condition.wait(deadline - now)
+            return None
+        return [worker for worker in active if self.deadlines[worker.camera_index] <= now]
+
+    def _active_workers(self):
+        if not self.playing:
+            return []
+        return [worker for worker in self.workers if worker.has_frames()]
+
+    def _step(self, worker: FrameWorker, now: float):
+        previous_index = worker.cam_attributes["currentIndex"]
+        try:
+            new_index = worker.advance()
+        except Exception as e:
+            print(f"Error playing camera {worker.camera_index+1}: {e}")
+            new_index = None
+
+        interval = 1.0 / self.fps
+        if self.realtime and new_index is not None:
+            captured = worker.frame_interval(previous_index, new_index)
+            if captured is not None:
+                interval = captured / self.speed
+
+        with self.condition:
+            deadline = self.deadlines.get(worker.camera_index, now) + interval
+            # Resynchronise instead of bursting frames after a stall
+            if deadline < now:
+                deadline = now + interval
+            self.deadlines[worker.camera_index] = deadline
+
+    def _tick(self, active, now):
+        # The position is shared with step_synchronized on the GUI thread, frames are rendered outside the lock
+        with self.condition:
+            step = self._clock_step(active)
+            if self.position is None:
+                self._start_position(active)
+            else:
+                advance = (now - self.last_tick) * 1e6 * self.speed if self.realtime else step
+                self._move_position(active, self.direction.value * advance)
+            self.last_tick = now
+            position = self.position
+
+        self._show_position(active, position)
+
+        interval = max(step / 1e6 / self.speed, 1.0 / self.MAX_FPS) if self.realtime else 1.0 / self.fps
+        with self.condition:
+            deadline = self.clock_deadline + interval
+            if deadline < now:
+                deadline = now + interval
+            self.clock_deadline = deadline
+
+    def _clock_step(self, active):
+        # One clock step is a frame of the fastest camera, in μs. Repeated timestamps are skipped,
+        # cameras without distinct ones are paced by their configured frame rate.
+        steps = []
+        for worker in active:
+            intervals = np.diff(worker.timeline())
+            intervals = intervals[intervals > 0]
+            steps.append(np.median(intervals) if len(intervals) else worker.frame_period(self.fps))
+        return min(steps) if steps else 1e6 / self.fps
+
+    def _start_position(self, active):
+        first = active[0]
+        timeline = first.timeline()
+        self.position = float(timeline[min(first.cam_attributes["currentIndex"], len(timeline) - 1)])
+
+    def _move_position(self, active, delta):
+        start = min(worker.timeline()[0] for worker in active)
+        end = max(worker.timeline()[-1] for worker in active)
+        self.position += delta
+        if self.position > end:
+            self.position = start
+        elif self.position < start:
+            self.position = end
+
+    def _show_position(self, active, position):
+        for worker in active:
+            try:
+                index = worker.index_at(position, self.sync_mode)
+                if index != worker.cam_attributes["currentIndex"]:
+                    worker.show_frame(index)
+            except Exception as e:
+                print(f"Error playing camera {worker.camera_index+1}: {e}")
+
+    def step_synchronized(self, direction: VideoDirection):
+        # Manual step of the shared clock by one frame of the fastest camera, runs on the caller's thread
+        with self.condition:
+            active = [worker for worker in self.workers if worker.has_frames()]
+            if not active:
+                return
+            if self.position is None:
+                self._start_position(active)
+            self._move_position(active, direction.value * self._clock_step(active))
+            position = self.position
+        self._show_position(active, position)
+
+    def play(self):
+        with self.condition:
+            self.playing = True
+            self.deadlines.clear()
+            self.clock_deadline = None
+            self.position = None
+            self.condition.notify()
+
+    def pause(self):
+        with self.condition:
+            self.playing = False
+            self.deadlines.clear()
+            self.clock_deadline = None
+            self.condition.notify()
+
+    def set_synchronized(self, enabled: bool):
+        with self.condition:
+            self.synchronized = enabled
+            self.deadlines.clear()
+            self.clock_deadline = None
+            self.position = None
+            self.condition.notify()
+
+    def set_sync_mode(self, mode: str):
+        if mode not in self.SYNC_MODES:
+            raise ValueError(f"Unknown sync mode {mode}, expected one of {self.SYNC_MODES}")
+        with self.condition:
+            self.sync_mode = mode
+
+    def wake(self, camera_index=None):
+        with self.condition:
+            if camera_index is None:
+                self.deadlines.clear()
+            else:
+                self.deadlines.pop(camera_index, None)
+            self.position = None
+            self.condition.notify()
+
     def set_fps(self, fps):
-        self.target_fps = max(1, min(30, fps))  
-        self.frame_delay_ms = 1000 // self.target_fps
+        with self.condition:
+            self.fps = max(1, min(self.MAX_FPS, fps))
+            self.condition.notify()
+
+    def set_realtime(self, enabled: bool, speed: float = 1.0):
+        with self.condition:
+            self.realtime = enabled
+            self.speed = max(speed, 1e-3)
+            self.condition.notify()
+
+    def set_direction(self, direction: VideoDirection):
+        self.direction = direction
+        for worker in self.workers:
+            worker.change_video_direction(direction)
 
-    def stop(self):
-        self.is_running = False
-        self.wait(500) 
+    def shutdown(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.wait()
+
+
+# Horizontal strip of thumbnails under a camera view, filled in as the pool finishes chunks
+class Filmstrip(QListWidget):
+    frame_selected = pyqtSignal(int)
+    thumbnails_ready = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.setViewMode(QListWidget.ViewMode.IconMode)
+        self.setFlow(QListWidget.Flow.LeftToRight)
+        self.setWrapping(False)
+        self.setMovement(QListWidget.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setIconSize(QSize(THUMBNAIL_MAX_WIDTH, THUMBNAIL_HEIGHT))
+        self.setFixedHeight(THUMBNAIL_HEIGHT + 40)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnails_ready.connect(self._on_thumbnails_ready)
+        self.itemClicked.connect(lambda item: self.frame_selected.emit(self.row(item)))
+
+    def load(self, images, cache_dir=None):
+        self.clear()
+        self.setUpdatesEnabled(False)
+        for i in range(len(images)):
+            self.addItem(QListWidgetItem(str(i)))
+        self.setUpdatesEnabled(True)
+        # onReady is called from the pool, the signal hands the indices over to the GUI thread
+        self.thumbnail_cache.load(images, self.thumbnails_ready.emit, cache_dir)
+
+    def _on_thumbnails_ready(self, indices):
+        for index in indices:
+            item = self.item(index)
+            q_image = FrameWorker._numpy_to_qimage(self.thumbnail_cache.get(index))
+            if item is not None and q_image is not None:
+                item.setIcon(QIcon(QPixmap.fromImage(q_image)))
+
+    def set_current(self, index):
+        if 0 <= index < self.count():
+            self.blockSignals(True)
+            self.setCurrentRow(index)
+            self.blockSignals(False)
+            self.scrollToItem(self.item(index), QListWidget.ScrollHint.PositionAtCenter)
+
+    def clear_frames(self):
+        self.thumbnail_cache.clear()
+        self.clear()
 
 
 class FrameViewer(QWidget):
+    export_progress = pyqtSignal(int, int, int)
+    export_finished = pyqtSignal(int, str, bool, str)
+
     def __init__(self, cameras_amount: int):
         super().__init__()
         self.cameras_amount = cameras_amount
@@ -1116,6 +1674,7 @@ class FrameViewer(QWidget):
         self._setupStyles()
         self._setupUi()
         self._setup_workers()
+        self._setup_export()
 
     def _setupStyles(self):
         self.colors = {
@@ -1221,9 +1780,13 @@ class FrameViewer(QWidget):
             info_label.setFixedHeight(40)
             info_label.setStyleSheet(f"color: {self.colors['text_primary']};")
 
+            filmstrip = Filmstrip()
+            filmstrip.frame_selected.connect(lambda index, camera_index=i: self._jump_to_frame(camera_index, index))
+
             frame_layout.addWidget(camera_label)
             frame_layout.addWidget(image_label)
             frame_layout.addWidget(info_label)
+            frame_layout.addWidget(filmstrip)
 
             self.all_frames_layout.addWidget(frame_widget)
             self.frame_widgets.append(frame_widget)
@@ -1231,16 +1794,36 @@ class FrameViewer(QWidget):
             self.camera_attributes.append({
                 "imageLabel": image_label,
                 "infoLabel": info_label,
+                "filmstrip": filmstrip,
                 "images": [],
                 "timestamps": [],
                 "currentIndex": 0,
+                "frameRate": None,
             })
 
     def _setup_workers(self):
         for i in range(self.cameras_amount):
             worker = FrameWorker(i, self.camera_attributes[i])
-            worker.frame_ready.connect(self._on_frame_ready)
             self.frame_workers.append(worker)
+        self.playback = PlaybackEngine(self.frame_workers)
+        self.playback.set_synchronized(self.camera_selected_index == -2)
+        self.playback.start()
+
+        refresh_rate = 60.0
+        screen = QApplication.primaryScreen()
+        if screen is not None and screen.refreshRate() > 0:
+            refresh_rate = screen.refreshRate()
+        self.display_timer = QTimer(self)
+        self.display_timer.timeout.connect(self._refresh_displays)
+        self.display_timer.start(max(1, int(1000 / refresh_rate)))
+
+    def _setup_export(self):
+        # The manager calls back from its pool, the signals move progress onto the GUI thread
+        self.export_manager = ExportManager(onProgress=self.export_progress.emit, onFinished=self.export_finished.emit)
+        self.export_progress_by_job = {}
+        self.export_dialog = None
+        self.export_progress.connect(self._on_export_progress)
+        self.export_finished.connect(self._on_export_finished)
 
     def _initControlLayout(self):
         main_control_layout = QVBoxLayout(self.right_widget)
@@ -1277,7 +1860,7 @@ class FrameViewer(QWidget):
         self.fps_value_label = QLabel("10")
         
         self.fps_slider = QSlider(Qt.Orientation.Horizontal)
-        self.fps_slider.setRange(1, 30)
+        self.fps_slider.setRange(1, PlaybackEngine.MAX_FPS)
         self.fps_slider.setValue(10)
         self.fps_slider.valueChanged.connect(self._on_fps_changed)
         
@@ -1285,6 +1868,24 @@ class FrameViewer(QWidget):
         fps_control_layout.addWidget(self.fps_slider)
         fps_control_layout.addWidget(self.fps_value_label)
         fps_layout.addLayout(fps_control_layout)
+
+        self.realtime_button = QPushButton("Real Time")
+        self.realtime_button.setToolTip("Play frames at the pace they were captured")
+        self.realtime_button.setCheckable(True)
+        self.realtime_button.toggled.connect(self._on_realtime_toggled)
+        fps_layout.addWidget(self.realtime_button)
+
+        sync_layout = QHBoxLayout()
+        sync_label = QLabel("Sync:")
+        self.sync_mode_combobox = QComboBox()
+        self.sync_mode_combobox.addItem("Nearest frame", "nearest")
+        self.sync_mode_combobox.addItem("Hold last", "hold")
+        self.sync_mode_combobox.setToolTip("How cameras are matched to the shared clock in All Cameras mode")
+        self.sync_mode_combobox.currentIndexChanged.connect(
+            lambda index: self.playback.set_sync_mode(self.sync_mode_combobox.itemData(index)))
+        sync_layout.addWidget(sync_label)
+        sync_layout.addWidget(self.sync_mode_combobox)
+        fps_layout.addLayout(sync_layout)
         
         main_control_layout.addWidget(fps_group)
 
@@ -1334,6 +1935,12 @@ class FrameViewer(QWidget):
         export_group.setAlignment(Qt.AlignmentFlag.AlignTop)
         export_layout = QVBoxLayout(export_group)
         
+        self.export_format_combobox = QComboBox()
+        self.export_format_combobox.addItem("MP4 video", None)
+        for sequence_format in SEQUENCE_FORMATS:
+            self.export_format_combobox.addItem(f"{sequence_format.upper()} sequence", sequence_format)
+        export_layout.addWidget(self.export_format_combobox)
+
         self.export_button = QPushButton("Export Video")
         self.export_button.clicked.connect(self.exportVideo)
         self.export_button.setStyleSheet("""
@@ -1353,6 +1960,33 @@ class FrameViewer(QWidget):
             }
         """)
         export_layout.addWidget(self.export_button)
+
+        export_options_layout = QHBoxLayout()
+        self.export_timestamps_button = QPushButton("Real Timing")
+        self.export_timestamps_button.setToolTip("Place frames by their captured timestamps, repeating or skipping frames to keep a constant rate")
+        self.export_timestamps_button.setCheckable(True)
+        export_options_layout.addWidget(self.export_timestamps_button)
+        self.export_slow_motion_combobox = QComboBox()
+        for factor in (1, 2, 5, 10, 20, 50, 100, 1000):
+            self.export_slow_motion_combobox.addItem(f"{factor}x slower" if factor > 1 else "Real speed", factor)
+        self.export_slow_motion_combobox.setEnabled(False)
+        self.export_timestamps_button.toggled.connect(self.export_slow_motion_combobox.setEnabled)
+        export_options_layout.addWidget(self.export_slow_motion_combobox)
+        export_layout.addLayout(export_options_layout)
+
+        self.export_overlay_button = QPushButton("Burn In Frame Info")
+        self.export_overlay_button.setToolTip("Draw the frame index and timestamp into the exported video")
+        self.export_overlay_button.setCheckable(True)
+        export_layout.addWidget(self.export_overlay_button)
+
+        self.export_disk_button = QPushButton("Export From Disk")
+        self.export_disk_button.setToolTip("Export a saved capture without loading it into the viewer")
+        self.export_disk_button.clicked.connect(self._export_from_disk)
+        export_layout.addWidget(self.export_disk_button)
+
+        self.open_capture_button = QPushButton("Open Capture")
+        self.open_capture_button.clicked.connect(self._openCapture)
+        export_layout.addWidget(self.open_capture_button)
         main_control_layout.addWidget(export_group)
 
 
@@ -1373,11 +2007,29 @@ class FrameViewer(QWidget):
 
         
 
-    def _on_frame_ready(self, camera_index, pixmap, info_text):
-        if camera_index < len(self.camera_attributes):
+    def _publish_target_size(self, camera_index):
+        label = self.camera_attributes[camera_index]["imageLabel"]
+        self.frame_workers[camera_index].target_size = (label.width(), label.height())
+
+    def _refresh_displays(self):
+        # Only the newest frame rendered by the playback thread is shown, older ones are skipped
+        for camera_index, worker in enumerate(self.frame_workers):
+            self._publish_target_size(camera_index)
+            frame = worker.mailbox.take()
+            if frame is None:
+                continue
+            image, info_text, index = frame
             cam_attr = self.camera_attributes[camera_index]
-            cam_attr["imageLabel"].setPixmap(pixmap)
+            cam_attr["imageLabel"].setPixmap(QPixmap.fromImage(image))
             cam_attr["infoLabel"].setText(info_text)
+            cam_attr["filmstrip"].set_current(index)
+
+    def _render_pixmap(self, camera_index, index):
+        # Rendered on the GUI thread, a frame the playback thread posted before must not overwrite it
+        self._publish_target_size(camera_index)
+        worker = self.frame_workers[camera_index]
+        worker.mailbox.take()
+        return worker.render_pixmap(index)
     
     def update_display_for_camera(self, camera_index: int):
         if 0 <= camera_index < len(self.camera_attributes):
@@ -1387,16 +2039,10 @@ class FrameViewer(QWidget):
             current_index = cam_attr["currentIndex"]
 
             if images and 0 <= current_index < len(images):
-                worker = self.frame_workers[camera_index]
-                pixmap = worker._numpy_to_pixmap(images[current_index])
+                pixmap = self._render_pixmap(camera_index, current_index)
                 if pixmap:
-                    if hasattr(worker, '_cached_size'):
-                        delattr(worker, '_cached_size')
-                    if hasattr(worker, '_cached_pixmap'):
-                        delattr(worker, '_cached_pixmap')
-
-                    scaled_pixmap = worker._get_scaled_pixmap(pixmap)
-                    cam_attr["imageLabel"].setPixmap(scaled_pixmap)
+                    cam_attr["imageLabel"].setPixmap(pixmap)
+                    cam_attr["filmstrip"].set_current(current_index)
                     cam_attr["infoLabel"].setText(
                         f"Frame: {current_index}\nTime: {timestamps[current_index] if timestamps else 0} μs"
                     )
@@ -1404,6 +2050,7 @@ class FrameViewer(QWidget):
     def _on_camera_selection(self, button):
         button_id = self.camera_selection_group.id(button)
         self.camera_selected_index = button_id
+        self.playback.set_synchronized(button_id == -2)
 
         if self.is_playing:
             self._toggle_video(False)
@@ -1428,14 +2075,16 @@ class FrameViewer(QWidget):
 
     def _on_fps_changed(self, value):
         self.fps_value_label.setText(str(value))
-        for worker in self.frame_workers:
-            worker.set_fps(value)
+        self.playback.set_fps(value)
+
+    def _on_realtime_toggled(self, checked):
+        self.fps_slider.setEnabled(not checked)
+        self.playback.set_realtime(checked)
 
     def _on_video_direction_changed(self, button):
         button_id = self.video_direction_group.id(button)
         direction = VideoDirection.backward if button_id == 0 else VideoDirection.forward
-        for worker in self.frame_workers:
-            worker.change_video_direction(direction)
+        self.playback.set_direction(direction)
 
     def _prev_frame(self):
         self._step_frame(VideoDirection.backward)
@@ -1449,8 +2098,7 @@ class FrameViewer(QWidget):
             self.toggle_video_btn.setChecked(False)
 
         if self.camera_selected_index == -2:
-            for i, cam_attr in enumerate(self.camera_attributes):
-                self._update_frame_manual(cam_attr, direction, i)
+            self.playback.step_synchronized(direction)
         else: 
             cam_attr = self.camera_attributes[self.camera_selected_index]
             self._update_frame_manual(cam_attr, direction, self.camera_selected_index)
@@ -1466,15 +2114,11 @@ class FrameViewer(QWidget):
         new_index = (current_index + direction.value) % len(images)
         cam_attr["currentIndex"] = new_index
         
-        worker = self.frame_workers[worker_index]
-        pixmap = worker._numpy_to_pixmap(images[new_index])
+        pixmap = self._render_pixmap(worker_index, new_index)
+        self.frame_workers[worker_index].prefetch(new_index, direction)
         if pixmap:
-            if hasattr(worker, '_cached_size'):
-                delattr(worker, '_cached_size')
-            if hasattr(worker, '_cached_pixmap'):
-                delattr(worker, '_cached_pixmap')
-            scaled_pixmap = worker._get_scaled_pixmap(pixmap)
-            cam_attr["imageLabel"].setPixmap(scaled_pixmap)
+            cam_attr["imageLabel"].setPixmap(pixmap)
+            cam_attr["filmstrip"].set_current(new_index)
             cam_attr["infoLabel"].setText(f"Frame: {new_index}\nTime: {timestamps[new_index]} μs")
 
     def _toggle_video(self, checked): 
@@ -1483,20 +2127,20 @@ class FrameViewer(QWidget):
         if checked:
             self.toggle_video_btn.setText("Pause")
             for i, worker in enumerate(self.frame_workers):
-                if self.camera_attributes[i]["images"]:
-                    if not worker.isRunning():
-                        worker.cam_attributes = self.camera_attributes[i]
-                        worker.start()
+                worker.cam_attributes = self.camera_attributes[i]
+            self.playback.play()
         else:
             self.toggle_video_btn.setText("Play")
-            for worker in self.frame_workers:
-                worker.stop()
-
-    def load_camera_data(self, camera_index, images, timestamps):
+            self.playback.pause()
+
+    def load_camera_data(self, camera_index, images, timestamps=None, frame_rate=None):
+        if isinstance(images, str):
+            # A path to a burst file or capture directory is opened in place, nothing is decoded up front
+            images = openCapture(images)
+            timestamps = images.timestamps
+            frame_rate = images.preset.get("FrameRate")
         if 0 <= camera_index < len(self.camera_attributes):
             worker = self.frame_workers[camera_index]
-            if worker.isRunning():
-                worker.stop()
 
             self.camera_attributes[camera_index]["images"].clear()
             self.camera_attributes[camera_index]["timestamps"].clear()
@@ -1504,17 +2148,16 @@ class FrameViewer(QWidget):
             self.camera_attributes[camera_index]["images"] = images
             self.camera_attributes[camera_index]["timestamps"] = timestamps
             self.camera_attributes[camera_index]["currentIndex"] = 0
-
-            if hasattr(worker, '_cached_size'):
-                delattr(worker, '_cached_size')
-            if hasattr(worker, '_cached_pixmap'):
-                delattr(worker, '_cached_pixmap')
+            # Paces frames that have no usable capture timestamps
+            self.camera_attributes[camera_index]["frameRate"] = frame_rate
+            worker.frame_cache.setSource(images)
+            self.playback.wake(camera_index)
+            self.camera_attributes[camera_index]["filmstrip"].load(images, capture_directory(images))
 
             if images and len(images) > 0:
-                pixmap = worker._numpy_to_pixmap(images[0])
+                pixmap = self._render_pixmap(camera_index, 0)
                 if pixmap:
-                    scaled_pixmap = worker._get_scaled_pixmap(pixmap)
-                    self.camera_attributes[camera_index]["imageLabel"].setPixmap(scaled_pixmap)
+                    self.camera_attributes[camera_index]["imageLabel"].setPixmap(pixmap)
                     self.camera_attributes[camera_index]["infoLabel"].setText(
                         f"Frame: 0\nTime: {timestamps[0] if timestamps else 0}"
                     )
@@ -1541,81 +2184,25 @@ class FrameViewer(QWidget):
             super().keyPressEvent(event)
 
     def closeEvent(self, event):
+        self.display_timer.stop()
+        self.playback.shutdown()
         for worker in self.frame_workers:
-            worker.stop()
+            worker.frame_cache.shutdown()
+        for cam_attr in self.camera_attributes:
+            cam_attr["filmstrip"].thumbnail_cache.shutdown()
+        self.export_manager.shutdown()
         event.accept()
     
     def exportVideo(self):
-        def save_video(images: list, fps: int, output_file: str):
-            if not images or len(images) == 0:
-                return False
-
-            try:
-                if images[0].ndim == 2:  
-                    height, width = images[0].shape
-                    is_color = False
-                else:  
-                    height, width, channels = images[0].shape
-                    is_color = True
-
-                fourcc_codes = ['mp4v', 'avc1', 'X264', 'MJPG']
-                video_writer = None
-                
-                for codec in fourcc_codes:
-                    try:
-                        fourcc = cv2.VideoWriter_fourcc(*codec)
-                        video_writer = cv2.VideoWriter(output_file, fourcc, fps, (width, height), isColor=is_color)
-                        if video_writer.isOpened():
-                            print(f"Using codec: {codec}")
-                            break
-                        else:
-                            video_writer = None
-                    except Exception as e:
-                        print(f"Codec {codec} failed: {e}")
-                        video_writer = None
-
-                if video_writer is None:
-                    print("Cannot initialize any video codec.")
-                    return False
-
-                for i, image in enumerate(images):
-                    try:
-                        if image.ndim == 2: 
-                            if image.dtype != np.uint8:
-                                image = np.uint8(image)
-                            frame = image
-                        else: 
-                            if image.shape[2] == 3:
-                                frame = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-                            else:
-                                frame = image[:, :, :3]
-                                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                        
-                        video_writer.write(frame)
-                        
-                        if i % 10 == 0:
-                            print(f"Written {i+1}/{len(images)} frames")
-                            
-                    except Exception as e:
-                        print(f"Error writing frame {i}: {e}")
-                        continue
-
-                video_writer.release()
-                print(f"Video successfully saved to: {output_file}")
-                
-            except Exception as e:
-                print(f"Error in video export: {e}")
-                if 'video_writer' in locals() and video_writer is not None:
-                    video_writer.release()
-
         fps = self.fps_slider.value()
-        exported_count = 0
         
         if self.camera_selected_index == -2:  
             cameras_to_export = range(len(self.camera_attributes))
         else:  
             cameras_to_export = [self.camera_selected_index]
 
+        # Ask for every destination first, then hand all exports to the pool at once
+        exports = []
         for i in cameras_to_export:
             attr = self.camera_attributes[i]
             images = attr["images"]
@@ -1625,41 +2212,129 @@ class FrameViewer(QWidget):
                                   f"No images available for Camera {i+1}")
                 continue
 
-            default_dir = f"output/Camera{i+1}"
-            os.makedirs(default_dir, exist_ok=True)
-            default_filename = f"camera{i+1}_frames{len(images)}_fps{fps}.mp4"
-            default_path = os.path.join(default_dir, default_filename)
+            output = self._ask_export_output(f"Camera {i+1}", f"output/Camera{i+1}", f"camera{i+1}_frames{len(images)}_fps{fps}")
+            if output:
+                exports.append((images, attr["timestamps"], output))
 
-            output_file, selected_filter = QFileDialog.getSaveFileName(
-                self,
-                f"Export Video - Camera {i+1}",
-                default_path,
-                "MP4 files (*.mp4);;All files (*)"
-            )
-            
-            if not output_file:
-                continue  
-
-            if not output_file.lower().endswith('.mp4'):
-                output_file += '.mp4'
-
-
-            
-
-
-            thread = Thread(target=save_video, 
-                          args=(images, fps, output_file),
-                          daemon=True)
-            thread.start()
-            
-            exported_count += 1
-
-        if exported_count == 0:
+        if not exports:
             QMessageBox.information(self, "Export", "No videos were exported.")
+            return
 
+        for images, timestamps, output in exports:
+            self._submit_export(images, timestamps, output)
+        self._show_export_progress()
+
+    def _export_from_disk(self):
+        # Streams a saved capture straight from disk, nothing is loaded into the viewer
+        path, selected_filter = QFileDialog.getOpenFileName(
+            self,
+            "Export Capture",
+            "output",
+            f"Burst files (*{BURST_EXTENSION});;Frame files (*.png *.tiff *.npy);;All files (*)"
+        )
+        if not path:
+            return
+        # Only the directory is needed here, the export job opens the capture and reports if it can't
+        capture_dir = path if os.path.isdir(path) else os.path.dirname(path)
+        name = os.path.basename(os.path.normpath(capture_dir))
+        output = self._ask_export_output(name, capture_dir, f"{name}_fps{self.fps_slider.value()}")
+        if output:
+            self._submit_export(path, None, output)
+            self._show_export_progress()
+
+    def _ask_export_output(self, title, default_dir, default_name):
+        sequence_format = self.export_format_combobox.currentData()
+        os.makedirs(default_dir, exist_ok=True)
+        if sequence_format is not None:
+            parent_dir = QFileDialog.getExistingDirectory(self, f"Export {sequence_format.upper()} Sequence - {title}", default_dir)
+            return os.path.join(parent_dir, f"{default_name}_{sequence_format}") if parent_dir else None
+
+        output_file, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            f"Export Video - {title}",
+            os.path.join(default_dir, f"{default_name}.mp4"),
+            "MP4 files (*.mp4);;All files (*)"
+        )
+        if not output_file:
+            return None
+        if not output_file.lower().endswith('.mp4'):
+            output_file += '.mp4'
+        return output_file
+
+    def _submit_export(self, source, timestamps, output):
+        job = self.export_manager.submit(
+            source,
+            self.fps_slider.value(),
+            output,
+            timestamps,
+            self.export_timestamps_button.isChecked(),
+            self.export_slow_motion_combobox.currentData(),
+            self.export_overlay_button.isChecked(),
+            self.export_format_combobox.currentData(),
+        )
+        self.export_progress_by_job[job.jobId] = (0, job.total)
+
+    def _show_export_progress(self):
+        if self.export_dialog is None:
+            self.export_dialog = QProgressDialog("Exporting video...", "Cancel", 0, 100, self)
+            self.export_dialog.setWindowTitle("Export")
+            self.export_dialog.setMinimumDuration(0)
+            self.export_dialog.canceled.connect(self.export_manager.cancelAll)
+        self._update_export_progress()
+        self.export_dialog.show()
+
+    def _update_export_progress(self):
+        written = sum(done for done, total in self.export_progress_by_job.values())
+        total = sum(total for done, total in self.export_progress_by_job.values())
+        if self.export_dialog is None:
+            return
+        if total:
+            self.export_dialog.setLabelText(f"Exporting {len(self.export_progress_by_job)} export(s): {written}/{total} frames")
+            self.export_dialog.setValue(int(written * 100 / total))
+        else:
+            self.export_dialog.setLabelText(f"Exporting {len(self.export_progress_by_job)} export(s): {written} frames")
+
+    def _on_export_progress(self, job_id, written, total):
+        if job_id in self.export_progress_by_job:
+            self.export_progress_by_job[job_id] = (written, total)
+            self._update_export_progress()
+
+    def _on_export_finished(self, job_id, output_file, success, message):
+        print(message)
+        self.export_progress_by_job.pop(job_id, None)
+        if not success and message != "Export cancelled":
+            QMessageBox.warning(self, "Export Error", f"{output_file}: {message}")
+        if not self.export_progress_by_job and self.export_dialog is not None:
+            self.export_dialog.reset()
+            self.export_dialog.hide()
+
+    def _jump_to_frame(self, camera_index, index):
+        self.frame_workers[camera_index].set_current_index(index)
+        self.playback.wake(camera_index)
+        self.update_display_for_camera(camera_index)
+
+    def _openCapture(self):
+        camera_index = max(self.camera_selected_index, 0)
+        path, selected_filter = QFileDialog.getOpenFileName(
+            self,
+            f"Open Capture - Camera {camera_index+1}",
+            f"output/Camera{camera_index+1}",
+            f"Burst files (*{BURST_EXTENSION});;Frame files (*.png *.tiff *.npy);;All files (*)"
+        )
+        if not path:
+            return
+
+        try:
+            self.load_camera_data(camera_index, path)
+            self.update_display_for_camera(camera_index)
+        except Exception as e:
+            print(f"Error opening capture {path}: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to open capture: {str(e)}")
 
     def _deleteImages(self):
-        def handleDeleting(attr):
+        def handleDeleting(index, attr):
+            self.frame_workers[index].frame_cache.clear()
+            attr["filmstrip"].clear_frames()
             attr["images"].clear()
             attr["timestamps"].clear()
             attr["currentIndex"] = 0 
@@ -1667,11 +2342,10 @@ class FrameViewer(QWidget):
             attr["infoLabel"].setText("Frame : None\nTime : None")
 
         if self.camera_selected_index == -2:
-            for attr in self.camera_attributes:
-                handleDeleting(attr)
+            for index, attr in enumerate(self.camera_attributes):
+                handleDeleting(index, attr)
         else:
-            attr = self.camera_attributes[self.camera_selected_index]
-            handleDeleting(attr)
+            handleDeleting(self.camera_selected_index, self.camera_attributes[self.camera_selected_index])
 
     def update_export_button_state(self):
         has_data = False
@@ -1697,7 +2371,8 @@ class FrameViewer(QWidget):
         elif self.camera_selected_index >= 0:
             self.update_display_for_camera(self.camera_selected_index)
             
-app = QApplication(sys.argv)
-window = MainWindow()
-window.show()
-app.exec()
\ No newline at end of file
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.show()
+    app.exec()
\ No newline at end of file
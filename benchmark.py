@@ -0,0 +1,416 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import tracemalloc
+from threading import Lock
+
+# Simulated devices stand in for the cameras and Qt draws offscreen, so the benchmarks run on a
+# headless box without the SDK. gxipy picks its backend on import, the devices are configured
+# from the command line in main() before CameraControl enumerates them.
+os.environ["GXIPY_SIMULATOR"] = "1"
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+from gxipy.Simulator import SIMULATED_PIXEL_FORMATS
+from src.camera import CameraControl
+from src.saver import SAVE_FORMATS
+from src.profiling import Histogram
+from CameraApp import ImageWorker, TriggerWorker, FrameViewer
+
+BENCHMARKS = ("preview", "burst", "export")
+# Burst frames below this are not saved by the TriggerWorker
+MIN_BURST_FRAMES = 5
+DRAIN_TIMEOUT = 30.0
+DISPLAY_INTERVAL = 1 / 60
+
+
+# Headless benchmarks of the acquisition-to-display path: simulated cameras are opened by
+# CameraControl and driven by the app's own ImageWorker, TriggerWorker and FrameViewer.
+# Every benchmark reports throughput, latency percentiles and the peak of traced memory.
+class Benchmark:
+    def __init__(self, args):
+        self.args = args
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.outputDir = tempfile.mkdtemp(prefix="cameraapp-benchmark-")
+        self.cameraControl = CameraControl()
+        self.cameras = self.cameraControl.cameras
+        # Bursts captured by the burst benchmark, the export benchmark reuses them
+        self.bursts = []
+        for camera in self.cameras:
+            self._configureCamera(camera)
+
+    def _configureCamera(self, camera):
+        # The presets the settings window would apply for a full sensor capture at the simulated rate
+        args = self.args
+        preset = camera.presetManager.getPreset("default").copy()
+        preset.update({
+            "Width" : camera.Width.get_range().get("max"),
+            "Height" : camera.Height.get_range().get("max"),
+            "FrameRate" : float(args.fps),
+            "ExposureTime" : float(args.exposure or max(20.0, 1e6 / args.fps / 2)),
+            "FramesQuantity" : args.frames,
+        })
+        for name in ("default", "preview", "trigger"):
+            camera.presetManager.changePreset(name, preset.copy())
+        camera.applyPreset(preset)
+        camera.defaultSettings()
+        camera.rawStorage = args.raw
+        camera.frameSaver.setFormat(args.save_format)
+
+    def run(self, names):
+        results = {}
+        try:
+            for name in names:
+                if name == "export" and not self.bursts:
+                    self._measure("burst", self.burst)
+                result = self._measure(name, getattr(self, name))
+                if result is not None:
+                    results[name] = result
+        finally:
+            for camera in self.cameras:
+                camera.close()
+            shutil.rmtree(self.outputDir, ignore_errors=True)
+        return results
+
+    def _measure(self, name, benchmark):
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            result = benchmark()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        if result is not None:
+            result["peakMemoryMb"] = peak / 2**20
+        return result
+
+    def _wait(self, done, what):
+        # Queued signals from the worker threads are delivered while waiting, like the app's event loop does
+        deadline = time.perf_counter() + DRAIN_TIMEOUT
+        while not done():
+            if time.perf_counter() > deadline:
+                print(f"{what} did not finish within {DRAIN_TIMEOUT} s")
+                return False
+            self.app.processEvents()
+            time.sleep(0.001)
+        return True
+
+    def _lostFrames(self):
+        return sum(camera.readStreamCounters().get("StreamLostFrameCount", 0) for camera in self.cameras)
+
+    def preview(self):
+        # One ImageWorker per camera; this thread takes the mailboxes at display rate like
+        # MainWindow._refreshDisplays. Latency covers convert, display transform and QImage per frame.
+        args = self.args
+        latency = Histogram()
+        lock = Lock()
+        workers = []
+
+        def timed(processFrame):
+            def process(rawImage, conversionContext):
+                start = time.perf_counter_ns()
+                try:
+                    return processFrame(rawImage, conversionContext)
+                finally:
+                    elapsed = time.perf_counter_ns() - start
+                    with lock:
+                        latency.record(elapsed)
+            return process
+
+        lostBefore = self._lostFrames()
+        for cameraIndex, camera in enumerate(self.cameras):
+            worker = ImageWorker(camera, cameraIndex, args.workers, args.queue_size)
+            worker.targetSize = (args.display_width, args.display_height)
+            worker.processFrame = timed(worker.processFrame)
+            workers.append(worker)
+
+        def delivered():
+            return [worker.pipeline.delivered if worker.pipeline is not None else 0 for worker in workers]
+
+        def refreshDisplays():
+            for worker in workers:
+                worker.mailbox.take()
+            return all(count >= args.frames for count in delivered())
+
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        deadline = time.perf_counter() + DRAIN_TIMEOUT + args.frames / args.fps
+        while not refreshDisplays():
+            if time.perf_counter() > deadline:
+                print("Preview did not deliver every frame in time")
+                break
+            time.sleep(DISPLAY_INTERVAL)
+        elapsed = time.perf_counter() - start
+        statistics = [worker.getStatistics() for worker in workers]
+        for worker in workers:
+            worker.stop()
+
+        frames = sum(delivered())
+        return {
+            "frames" : frames,
+            "dropped" : sum(workerStatistics["dropped"] for workerStatistics in statistics),
+            "displaySkipped" : sum(workerStatistics["display"]["skipped"] for workerStatistics in statistics),
+            "lost" : self._lostFrames() - lostBefore,
+            "framesPerSecond" : frames / elapsed if elapsed > 0 else 0.0,
+            "latency" : latency.getStatistics(),
+        }
+
+    def burst(self):
+        # A software triggered TriggerWorker per camera: pooled batch dequeue, conversion into the
+        # FrameStore while capturing and the save that follows. Latency is Camera.storeFrame per frame,
+        # the save runs from the burst being handed over until the saver reports it done.
+        args = self.args
+        latency = Histogram()
+        lock = Lock()
+        workers = []
+        processed = {}
+        saved = {}
+
+        def timed(storeFrame):
+            def store(rawImage, context=None):
+                start = time.perf_counter_ns()
+                try:
+                    return storeFrame(rawImage, context)
+                finally:
+                    elapsed = time.perf_counter_ns() - start
+                    with lock:
+                        latency.record(elapsed)
+            return store
+
+        def onImagesProcessed(cameraIndex, frameStore, timestamps):
+            processed[cameraIndex] = (time.perf_counter(), frameStore, list(timestamps))
+
+        def onSaveFinished(cameraIndex, path, failed):
+            saved[cameraIndex] = (time.perf_counter(), path, failed)
+
+        for cameraIndex, camera in enumerate(self.cameras):
+            camera.storeFrame = timed(camera.storeFrame)
+            worker = TriggerWorker(camera, cameraIndex, args.workers)
+            worker.dir = os.path.join(self.outputDir, f"Camera{cameraIndex+1}")
+            worker.imagesProcessed.connect(onImagesProcessed)
+            worker.saveFinished.connect(onSaveFinished)
+            workers.append(worker)
+
+        lostBefore = self._lostFrames()
+        start = time.perf_counter()
+        try:
+            started = [worker for worker in workers if worker.startTrigger()]
+
+            def done():
+                if not all(worker.isFinished() for worker in started):
+                    return False
+                # Only bursts long enough are handed to the saver
+                expected = sum(1 for worker in started if len(worker.camera.frameStore) >= MIN_BURST_FRAMES)
+                return len(processed) >= expected and len(saved) >= expected
+
+            self._wait(done, "Burst")
+        finally:
+            for camera in self.cameras:
+                del camera.storeFrame
+        # The last queued signals of the finished workers
+        self.app.processEvents()
+        if not processed:
+            print("No burst was captured")
+            return None
+
+        captureEnd = max(end for end, frameStore, timestamps in processed.values())
+        saveStart = min(end for end, frameStore, timestamps in processed.values())
+        saveEnd = max((end for end, path, failed in saved.values()), default=saveStart)
+        captureTime = captureEnd - start
+        saveTime = saveEnd - saveStart
+
+        self.bursts = [(frameStore, timestamps, saved.get(cameraIndex, (None, None, 0))[1])
+                       for cameraIndex, (end, frameStore, timestamps) in sorted(processed.items())]
+        frames = sum(len(frameStore) for frameStore, timestamps, path in self.bursts)
+        megabytes = sum(frameStore.asArray().nbytes for frameStore, timestamps, path in self.bursts) / 2**20
+        return {
+            "frames" : frames,
+            "lost" : self._lostFrames() - lostBefore,
+            "failed" : args.frames * len(workers) - frames,
+            "framesPerSecond" : frames / captureTime if captureTime > 0 else 0.0,
+            "megabytesPerSecond" : megabytes / captureTime if captureTime > 0 else 0.0,
+            "latency" : latency.getStatistics(),
+            "save" : {
+                "format" : args.save_format,
+                "failed" : sum(failed for end, path, failed in saved.values()),
+                "framesPerSecond" : frames / saveTime if saveTime > 0 else 0.0,
+                "megabytesPerSecond" : megabytes / saveTime if saveTime > 0 else 0.0,
+            },
+        }
+
+    def export(self):
+        # The bursts are loaded into a FrameViewer like MainWindow._omImagesProcessed does, then every
+        # burst is exported as a video and an npy sequence from memory and as a video from its saved capture
+        args = self.args
+        durations = Histogram()
+        results = []
+        submitted = {}
+        viewer = FrameViewer(len(self.cameras))
+        # Failures are reported here, the viewer would open a message box for each
+        viewer.export_finished.disconnect(viewer._on_export_finished)
+
+        def onFinished(jobId, output, success, message):
+            durations.record(time.perf_counter_ns() - submitted[jobId])
+            results.append((success, message))
+
+        viewer.export_finished.connect(onFinished)
+        viewer.fps_slider.setValue(args.export_fps)
+
+        def submit(source, timestamps, output, sequenceFormat):
+            viewer.export_format_combobox.setCurrentIndex(viewer.export_format_combobox.findData(sequenceFormat) if sequenceFormat else 0)
+            viewer._submit_export(source, timestamps, output)
+            submitted[max(viewer.export_progress_by_job)] = time.perf_counter_ns()
+
+        frames = 0
+        start = time.perf_counter()
+        for cameraIndex, (frameStore, timestamps, savedPath) in enumerate(self.bursts):
+            viewer.load_camera_data(cameraIndex, frameStore, timestamps, args.fps)
+            name = os.path.join(self.outputDir, f"Camera{cameraIndex+1}")
+            submit(frameStore, timestamps, f"{name}.mp4", None)
+            submit(frameStore, timestamps, f"{name}_npy", "npy")
+            frames += 2 * len(frameStore)
+            if savedPath:
+                submit(savedPath, None, f"{name}_disk.mp4", None)
+                frames += len(frameStore)
+        self._wait(lambda: len(results) >= len(submitted), "Export")
+        elapsed = time.perf_counter() - start
+        viewer.close()
+
+        for success, message in results:
+            if not success:
+                print(f"Export failed: {message}")
+        return {
+            "frames" : frames,
+            "failed" : sum(1 for success, message in results if not success),
+            "framesPerSecond" : frames / elapsed if elapsed > 0 else 0.0,
+            "jobLatency" : durations.getStatistics(),
+        }
+
+
+def simulatorConfig(args):
+    # GXIPY_SIMULATOR settings, see gxipy/Simulator.py
+    return ",".join(f"{key}={value}" for key, value in (
+        ("cameras", args.cameras),
+        ("width", args.width),
+        ("height", args.height),
+        ("pixel_format", args.format),
+        ("fps", args.fps),
+        ("frame_loss", args.frame_loss),
+        ("seed", args.seed),
+    ))
+
+
+def compareResults(results, baseline, tolerance):
+    # Throughput may drop and latency and memory may grow by tolerance before it counts as a regression
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        checks = [("framesPerSecond", result.get("framesPerSecond"), reference.get("framesPerSecond"), False),
+                  ("peakMemoryMb", result.get("peakMemoryMb"), reference.get("peakMemoryMb"), True)]
+        if "save" in result and "save" in reference:
+            checks.append(("save.framesPerSecond", result["save"]["framesPerSecond"], reference["save"]["framesPerSecond"], False))
+        for key in ("latency", "jobLatency"):
+            if key in result and key in reference:
+                checks.append((f"{key}.p99Us", result[key]["p99Us"], reference[key]["p99Us"], True))
+        for metric, value, referenceValue, higherIsWorse in checks:
+            if value is None or not referenceValue:
+                continue
+            limit = referenceValue * (1 + tolerance) if higherIsWorse else referenceValue * (1 - tolerance)
+            if (value > limit) if higherIsWorse else (value < limit):
+                regressions.append(f"{name} {metric}: {value:.1f} against baseline {referenceValue:.1f}")
+    return regressions
+
+
+def formatResult(name, result):
+    line = f"{name:8s} {result['frames']:6d} frames  {result['framesPerSecond']:8.1f} fps"
+    if "megabytesPerSecond" in result:
+        line += f"  {result['megabytesPerSecond']:8.1f} MB/s"
+    for key in ("latency", "jobLatency"):
+        if key in result:
+            stats = result[key]
+            line += f"  {key} p50={stats['p50Us']/1000:.2f} p99={stats['p99Us']/1000:.2f} max={stats['maxUs']/1000:.2f} ms"
+    for key in ("dropped", "displaySkipped", "lost", "failed"):
+        if result.get(key):
+            line += f"  {key}={result[key]}"
+    line += f"  peak {result['peakMemoryMb']:.1f} MB"
+    if "save" in result:
+        save = result["save"]
+        line += f"\n{'save':8s} {result['frames']:6d} frames  {save['framesPerSecond']:8.1f} fps  {save['megabytesPerSecond']:8.1f} MB/s  {save['format']}"
+        if save["failed"]:
+            line += f"  failed={save['failed']}"
+    return line
+
+
+def parseArguments(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the capture pipeline against simulated cameras")
+    parser.add_argument("benchmarks", nargs="*", help=f"benchmarks to run out of {', '.join(BENCHMARKS)}, all of them by default")
+    parser.add_argument("--cameras", type=int, default=1)
+    parser.add_argument("--width", type=int, default=1440)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--format", choices=SIMULATED_PIXEL_FORMATS, default="BAYER_RG8")
+    parser.add_argument("--fps", type=float, default=100.0, help="frame rate of each camera")
+    parser.add_argument("--exposure", type=float, default=None, help="exposure in µs, half the frame period by default")
+    parser.add_argument("--frame-loss", type=float, default=0.0, help="probability of a frame being lost")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=300, help="frames per camera and benchmark")
+    parser.add_argument("--workers", type=int, default=2, help="conversion threads per camera")
+    parser.add_argument("--queue-size", type=int, default=4)
+    parser.add_argument("--display-width", type=int, default=960)
+    parser.add_argument("--display-height", type=int, default=720)
+    parser.add_argument("--raw", action="store_true", help="keep bursts as raw Bayer data")
+    parser.add_argument("--save-format", choices=SAVE_FORMATS, default="container")
+    parser.add_argument("--export-fps", type=int, default=25)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative change against the baseline")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark {', '.join(unknown)}, expected one of {', '.join(BENCHMARKS)}")
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.frames < MIN_BURST_FRAMES:
+        parser.error(f"--frames must be at least {MIN_BURST_FRAMES}, shorter bursts are not saved")
+    return args
+
+
+def main(argv=None):
+    args = parseArguments(argv)
+    names = [name for name in BENCHMARKS if not args.benchmarks or name in args.benchmarks]
+    os.environ["GXIPY_SIMULATOR"] = simulatorConfig(args)
+    print(f"{args.cameras} simulated camera(s), {args.width}x{args.height} {args.format}, "
+          f"{args.fps:g} fps, {args.frames} frames")
+
+    results = Benchmark(args).run(names)
+    for name, result in results.items():
+        print(formatResult(name, result))
+    # ru_maxrss is in KiB on Linux
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Peak resident memory: {maxRss:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"config" : vars(args), "results" : results, "maxRssMb" : maxRss}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compareResults(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,7 @@ from gxipy.Feature import *
 from gxipy.Exception import *
 from gxipy.ImageProc import *
 import ctypes
+import threading
 import types
 
 class DataStream:
@@ -41,6 +42,15 @@ class DataStream:
         self.__register_buf_param_map = {}
         self.__register_buf_param_content_map = {}
 
+        self.__pool_lock = threading.Lock()
+        self.__pool_size = 0
+        self.__pool_generation = 0
+        self.__pool_outstanding = set()
+        self.__pool_high_water_mark = 0
+        self.__pool_starvation_count = 0
+        self.__pool_acquired_count = 0
+        self.__pool_released_count = 0
+
     def get_feature_control(self):
         """
         :brief      Get device stream feature control object
@@ -117,33 +127,45 @@ class DataStream:
         ptr_frame_buffer = ctypes.POINTER(GxFrameBuffer)()
         status = gx_dq_buf(self.__dev_handle, ctypes.byref(ptr_frame_buffer), timeout)
         if status == GxStatusList.SUCCESS:
-            frame_buffer = ptr_frame_buffer.contents
-            self.__frame_buf_map[frame_buffer.buf_id] = ptr_frame_buffer
-            frame_data = GxFrameData()
-            frame_data.status = frame_buffer.status
-            frame_data.image_buf = frame_buffer.image_buf
-            frame_data.width = frame_buffer.width
-            frame_data.height = frame_buffer.height
-            frame_data.pixel_format = frame_buffer.pixel_format
-            frame_data.image_size = frame_buffer.image_size
-            frame_data.frame_id = frame_buffer.frame_id
-            frame_data.timestamp = frame_buffer.timestamp
-            frame_data.user_param = frame_buffer.user_param
-            frame_data.buf_id = frame_buffer.buf_id
-
-            image = RawImage(frame_data)
-            try:
-                image.user_param = self.__register_buf_param_content_map[frame_data.user_param]
-            except KeyError:
-                image.user_param = None
-
-            return image
+            return self.__create_image_from_frame_buffer(ptr_frame_buffer, False)
         elif status == GxStatusList.TIMEOUT:
             return None
         else:
             StatusProcessor.process(status, 'DataStream', 'dq_buf')
             return None
 
+    def __create_image_from_frame_buffer(self, ptr_frame_buffer, pooled):
+        """
+        :brief      Record a dequeued driver buffer and wrap it in an image object
+        :param      ptr_frame_buffer:   Pointer to the GxFrameBuffer returned by the driver
+        :param      pooled:             True: PooledRawImage viewing the buffer, False: RawImage copying it
+        :return:    image object
+        """
+        frame_buffer = ptr_frame_buffer.contents
+        self.__frame_buf_map[frame_buffer.buf_id] = ptr_frame_buffer
+        frame_data = GxFrameData()
+        frame_data.status = frame_buffer.status
+        frame_data.image_buf = frame_buffer.image_buf
+        frame_data.width = frame_buffer.width
+        frame_data.height = frame_buffer.height
+        frame_data.pixel_format = frame_buffer.pixel_format
+        frame_data.image_size = frame_buffer.image_size
+        frame_data.frame_id = frame_buffer.frame_id
+        frame_data.timestamp = frame_buffer.timestamp
+        frame_data.user_param = frame_buffer.user_param
+        frame_data.buf_id = frame_buffer.buf_id
+
+        if pooled:
+            image = PooledRawImage(frame_data, self)
+        else:
+            image = RawImage(frame_data)
+        try:
+            image.user_param = self.__register_buf_param_content_map[frame_data.user_param]
+        except KeyError:
+            image.user_param = None
+
+        return image
+
     def q_buf(self, image):
         if not isinstance(image, RawImage):
             raise ParameterTypeError("DataStream.q_buf: "
@@ -167,6 +189,228 @@ class DataStream:
         StatusProcessor.process(status, 'DataStream', 'q_buf')
         self.__frame_buf_map.pop(image.frame_data.buf_id)
 
+    def enable_buffer_pool(self, pool_size):
+        """
+        :brief      Switch the stream to pooled acquisition: the driver keeps a fixed ring of pool_size
+                    buffers and acquire_frame() hands them out without copying.
+                    Must be called while acquisition is stopped.
+        :param      pool_size:  the number of driver buffers in the ring, range:[1, 0xFFFFFFFF]
+        :return:    none
+        """
+        if not isinstance(pool_size, INT_TYPE):
+            raise ParameterTypeError("DataStream.enable_buffer_pool: "
+                                     "Expected pool_size type is int, not %s" % type(pool_size))
+
+        if self.acquisition_flag is True:
+            raise InvalidCall("DataStream.enable_buffer_pool: Can't change the buffer pool during acquisition")
+
+        self.set_acquisition_buffer_number(pool_size)
+        with self.__pool_lock:
+            self.__pool_size = pool_size
+            self.__pool_generation += 1
+            self.__pool_outstanding.clear()
+            self.__pool_high_water_mark = 0
+            self.__pool_starvation_count = 0
+            self.__pool_acquired_count = 0
+            self.__pool_released_count = 0
+
+    def disable_buffer_pool(self):
+        """
+        :brief      Leave pooled acquisition mode, frames still held by consumers are returned to the driver
+        :return:    none
+        """
+        self.release_all_frames()
+        with self.__pool_lock:
+            self.__pool_size = 0
+
+    def is_buffer_pool_enabled(self):
+        """
+        :brief      Check whether pooled acquisition mode is enabled
+        :return:    True/False
+        """
+        return self.__pool_size > 0
+
+    def acquire_frame(self, timeout=1000):
+        """
+        :brief      Dequeue a frame from the buffer pool
+                    The returned PooledRawImage is a view over the driver buffer, call its release()
+                    (or use it as a context manager) to give the buffer back to the driver.
+        :param      timeout:    Acquisition timeout, range:[0, 0xFFFFFFFF]
+        :return:    PooledRawImage object, None on timeout or when every pool buffer is held by consumers
+        """
+        if self.__pool_size == 0:
+            raise InvalidCall("DataStream.acquire_frame: The buffer pool is not enabled")
+
+        with self.__pool_lock:
+            if len(self.__pool_outstanding) >= self.__pool_size:
+                self.__pool_starvation_count += 1
+                return None
+
+        image = self.__dq_pooled_frame(timeout)
+        if image is None:
+            return None
+
+        self.__track_acquired_frames([image])
+        return image
+
+    def dequeue_batch(self, max_frames, timeout=1000):
+        """
+        :brief      Dequeue every frame that is ready, up to max_frames, with a single driver call
+                    Frames are PooledRawImage views over the driver buffers and count against the
+                    buffer pool until they are released.
+        :param      max_frames: the maximum number of frames to return, range:[1, 0xFFFFFFFF]
+        :param      timeout:    Acquisition timeout for the first frame, range:[0, 0xFFFFFFFF]
+        :return:    list of PooledRawImage objects, empty on timeout
+        """
+        if not isinstance(max_frames, INT_TYPE):
+            raise ParameterTypeError("DataStream.dequeue_batch: "
+                                     "Expected max_frames type is int, not %s" % type(max_frames))
+
+        if max_frames < 1:
+            return []
+
+        if not self.__check_pooled_dequeue(timeout, 'dequeue_batch'):
+            return []
+
+        with self.__pool_lock:
+            available = self.__pool_size - len(self.__pool_outstanding)
+            if available <= 0:
+                self.__pool_starvation_count += 1
+                return []
+
+        buff_num = min(max_frames, available)
+        frame_buffer_array = (ctypes.POINTER(GxFrameBuffer) * buff_num)()
+        status, frame_count = gx_dq_all_bufs(self.__dev_handle, frame_buffer_array, buff_num, timeout)
+        if status == GxStatusList.SUCCESS:
+            images = [self.__create_image_from_frame_buffer(frame_buffer_array[index], True)
+                      for index in range(frame_count)]
+            self.__track_acquired_frames(images)
+            return images
+        elif status == GxStatusList.TIMEOUT:
+            return []
+        else:
+            StatusProcessor.process(status, 'DataStream', 'dequeue_batch')
+            return []
+
+    def release_frame(self, image):
+        """
+        :brief      Give the buffer of a pooled frame back to the driver, releasing twice is a no-op
+        :param      image:  PooledRawImage returned by acquire_frame
+        :return:    none
+        """
+        if not isinstance(image, PooledRawImage):
+            raise ParameterTypeError("DataStream.release_frame: "
+                                     "Expected image type is PooledRawImage, not %s" % type(image))
+
+        with self.__pool_lock:
+            buf_id = image.frame_data.buf_id
+            # A frame handed out before the pool was reset may share its buf_id with a newer frame
+            if image.pool_generation != self.__pool_generation or buf_id not in self.__pool_outstanding:
+                return
+            self.__pool_outstanding.discard(buf_id)
+            self.__pool_released_count += 1
+
+        if self.acquisition_flag is False:
+            self.__frame_buf_map.pop(buf_id, None)
+            return
+        self.q_buf(image)
+
+    def release_all_frames(self):
+        """
+        :brief      Forget every frame still held by consumers and return their buffers to the driver
+        :return:    none
+        """
+        with self.__pool_lock:
+            buf_ids = list(self.__pool_outstanding)
+            self.__pool_outstanding.clear()
+            self.__pool_generation += 1
+            self.__pool_released_count += len(buf_ids)
+
+        for buf_id in buf_ids:
+            ptr_frame_buffer = self.__frame_buf_map.pop(buf_id, None)
+            if ptr_frame_buffer is None or self.acquisition_flag is False:
+                continue
+            status = gx_q_buf(self.__dev_handle, ptr_frame_buffer)
+            StatusProcessor.printing(status, 'DataStream', 'release_all_frames')
+
+    def get_pool_statistics(self):
+        """
+        :brief      Get buffer pool counters
+        :return:    dict with pool_size, outstanding, high_water_mark, starvation_count,
+                    acquired_count and released_count
+        """
+        with self.__pool_lock:
+            return {
+                "pool_size": self.__pool_size,
+                "outstanding": len(self.__pool_outstanding),
+                "high_water_mark": self.__pool_high_water_mark,
+                "starvation_count": self.__pool_starvation_count,
+                "acquired_count": self.__pool_acquired_count,
+                "released_count": self.__pool_released_count,
+            }
+
+    def __check_pooled_dequeue(self, timeout, function_name):
+        """
+        :brief      Validate a pooled dequeue request
+        :param      timeout:        Acquisition timeout, range:[0, 0xFFFFFFFF]
+        :param      function_name:  public method name used in messages
+        :return:    True if the driver can be asked for frames
+        """
+        if self.__pool_size == 0:
+            raise InvalidCall("DataStream.%s: The buffer pool is not enabled" % function_name)
+
+        if not isinstance(timeout, INT_TYPE):
+            raise ParameterTypeError("DataStream.%s: "
+                                     "Expected timeout type is int, not %s" % (function_name, type(timeout)))
+
+        if (timeout < 0) or (timeout > UNSIGNED_INT_MAX):
+            print("DataStream.%s: "
+                  "timeout out of bounds, minimum=0, maximum=%s"
+                  % (function_name, hex(UNSIGNED_INT_MAX).__str__()))
+            return False
+
+        if self.__py_capture_callback != None:
+            raise InvalidCall("Can't call %s after register capture callback" % function_name)
+
+        if self.acquisition_flag is False:
+            print("DataStream.%s: Current data steam don't  start acquisition" % function_name)
+            return False
+
+        return True
+
+    def __dq_pooled_frame(self, timeout):
+        """
+        :brief      dq_buf variant that wraps the driver buffer instead of copying it
+        :param      timeout:    Acquisition timeout, range:[0, 0xFFFFFFFF]
+        :return:    PooledRawImage object or None
+        """
+        if not self.__check_pooled_dequeue(timeout, 'acquire_frame'):
+            return None
+
+        ptr_frame_buffer = ctypes.POINTER(GxFrameBuffer)()
+        status = gx_dq_buf(self.__dev_handle, ctypes.byref(ptr_frame_buffer), timeout)
+        if status == GxStatusList.SUCCESS:
+            return self.__create_image_from_frame_buffer(ptr_frame_buffer, True)
+        elif status == GxStatusList.TIMEOUT:
+            return None
+        else:
+            StatusProcessor.process(status, 'DataStream', 'acquire_frame')
+            return None
+
+    def __track_acquired_frames(self, images):
+        """
+        :brief      Account dequeued pool frames as held by consumers
+        :param      images:     list of PooledRawImage
+        :return:    none
+        """
+        with self.__pool_lock:
+            for image in images:
+                image.pool_generation = self.__pool_generation
+                self.__pool_outstanding.add(image.frame_data.buf_id)
+            self.__pool_acquired_count += len(images)
+            if len(self.__pool_outstanding) > self.__pool_high_water_mark:
+                self.__pool_high_water_mark = len(self.__pool_outstanding)
+
     def flush_queue(self):
         status = gx_flush_queue(self.__dev_handle)
         StatusProcessor.process(status, 'DataStream', 'flush_queue')
@@ -273,6 +517,49 @@ class DataStream:
         image = RawImage(frame_data)
         self.__py_capture_callback(image)
 
+class PooledRawImage(RawImage):
+    def __init__(self, frame_data, data_stream):
+        """
+        :brief  RawImage over a driver buffer owned by the DataStream buffer pool
+                Numpy arrays obtained from the image are views of the driver buffer and
+                must not be used after release().
+        :param frame_data:      GxFrameData of the dequeued buffer
+        :param data_stream:     DataStream the buffer belongs to
+        """
+        RawImage.__init__(self, frame_data, zero_copy=True)
+        self.__data_stream = data_stream
+        self.pool_generation = 0
+        self.released = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+    def release(self):
+        """
+        :brief      Return the buffer to the driver
+        :return:    none
+        """
+        if self.released:
+            return
+        self.released = True
+        self.__data_stream.release_frame(self)
+
+    def detach(self):
+        """
+        :brief      Copy the frame into a standalone RawImage that stays valid after release()
+        :return:    RawImage object
+        """
+        frame_data = GxFrameData()
+        ctypes.memmove(ctypes.addressof(frame_data), ctypes.addressof(self.frame_data), ctypes.sizeof(GxFrameData))
+        image = RawImage(frame_data)
+        image.user_param = self.user_param
+        return image
+
+
 class U3VDataStream(DataStream):
     def __init__(self, dev_handle, stream_handle):
         self.__handle = dev_handle
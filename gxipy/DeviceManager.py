@@ -4,7 +4,6 @@
 
 
 import numpy
-from numpy.compat import long
 
 from gxipy.Device import Device
 from gxipy.gxwrapper import *
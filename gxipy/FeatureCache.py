@@ -0,0 +1,484 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import threading
+from gxipy.Feature_s import *
+
+# Writing the key feature changes the range or access mode of the listed features
+RANGE_DEPENDENCIES = {
+    "Width":                            ("OffsetX", "AcquisitionFrameRate", "ExposureTime", "DeviceLinkThroughputLimit"),
+    "Height":                           ("OffsetY", "AcquisitionFrameRate", "ExposureTime", "DeviceLinkThroughputLimit"),
+    "OffsetX":                          ("Width",),
+    "OffsetY":                          ("Height", "AcquisitionFrameRate", "ExposureTime"),
+    "PixelFormat":                      ("Width", "Height", "OffsetX", "OffsetY", "AcquisitionFrameRate",
+                                         "ExposureTime", "DeviceLinkThroughputLimit"),
+    "ExposureTimeMode":                 ("ExposureTime", "AcquisitionFrameRate"),
+    "ExposureTime":                     ("AcquisitionFrameRate",),
+    "AcquisitionFrameRate":             ("ExposureTime",),
+    "AcquisitionFrameRateMode":         ("AcquisitionFrameRate", "ExposureTime"),
+    "DeviceLinkThroughputLimit":        ("AcquisitionFrameRate", "ExposureTime"),
+    "DeviceLinkThroughputLimitMode":    ("DeviceLinkThroughputLimit", "AcquisitionFrameRate", "ExposureTime"),
+    "TriggerMode":                      ("AcquisitionFrameRate", "TriggerSoftware"),
+    "TriggerSelector":                  ("TriggerMode", "TriggerSource", "TriggerActivation", "TriggerDelay"),
+    "LineSelector":                     ("LineMode", "LineSource", "LineInverter"),
+    "LineMode":                         ("LineSource", "LineInverter"),
+}
+
+# Writing the key feature may also move the current value of the listed features,
+# either because they are addressed through a selector or because they are clamped to a new range
+VALUE_DEPENDENCIES = {
+    "PixelFormat":                      ("DeviceLinkThroughputLimit",),
+    "ExposureTimeMode":                 ("ExposureTime",),
+    "ExposureTime":                     ("AcquisitionFrameRate",),
+    "TriggerSelector":                  ("TriggerMode", "TriggerSource", "TriggerActivation", "TriggerDelay"),
+    "LineSelector":                     ("LineMode", "LineSource", "LineInverter"),
+}
+
+# Values the device updates on its own, they are always read from the device
+VOLATILE_FEATURES = (
+    "CurrentAcquisitionFrameRate",
+    "DeviceTemperature",
+    "TimestampLatchValue",
+    "LineStatus",
+    "LineStatusAll",
+)
+
+# Features the device locks while acquisition runs. Device.stream_on/stream_off do not go through
+# the cache, so their access mode is always read from the device.
+STREAM_LOCKED_FEATURES = (
+    "Width",
+    "Height",
+    "PixelFormat",
+    "ExposureTimeMode",
+    "BinningHorizontal",
+    "BinningVertical",
+    "DecimationHorizontal",
+    "DecimationVertical",
+)
+
+# Commands after which nothing cached can be trusted any more
+RESET_COMMANDS = ("DeviceReset", "UserSetLoad")
+
+
+class FeatureCache:
+    def __init__(self):
+        """
+        :brief  Memoized access modes and ranges plus a write-through cache of feature values.
+                Writes through the cached features invalidate whatever depends on the written feature,
+                see RANGE_DEPENDENCIES and VALUE_DEPENDENCIES. Float values are cached as written,
+                call invalidate() when the exact value the device settled on is needed.
+                The lock only guards the tables, SDK calls are made outside of it. A value read from
+                the device is only remembered if nothing was written or invalidated meanwhile.
+        """
+        self.__lock = threading.RLock()
+        self.__generation = 0
+        self.__access_modes = {}
+        self.__ranges = {}
+        self.__values = {}
+        self.__statistics = {}
+        self.reset_statistics()
+
+    def __count(self, key, amount=1):
+        self.__statistics[key] += amount
+
+    def access_mode(self, feature_name, loader):
+        """
+        :brief      Node access mode, read from the device only on a miss
+        :param feature_name:    Feature node name
+        :param loader:          Callable reading the access mode from the device
+        :return:    Node access mode
+        """
+        with self.__lock:
+            if feature_name in self.__access_modes:
+                self.__count("access_mode_hits")
+                return self.__access_modes[feature_name]
+            self.__count("access_mode_calls")
+            generation = self.__generation
+
+        node_access = loader()
+        with self.__lock:
+            if feature_name not in STREAM_LOCKED_FEATURES and generation == self.__generation:
+                self.__access_modes[feature_name] = node_access
+        return node_access
+
+    def range(self, feature_name, loader, value_key=None):
+        """
+        :brief      Feature range, read from the device only on a miss
+        :param feature_name:    Feature node name
+        :param loader:          Callable reading the range from the device
+        :param value_key:       Key of the current value inside the range, kept in sync with the value cache
+        :return:    Range as returned by the loader
+        """
+        with self.__lock:
+            self.__count("range_hits" if feature_name in self.__ranges else "range_calls")
+            if feature_name in VOLATILE_FEATURES:
+                feature_range = None
+            else:
+                feature_range = self.__ranges.get(feature_name)
+            generation = self.__generation
+
+        if feature_range is None:
+            feature_range = loader()
+            if feature_name in VOLATILE_FEATURES:
+                return feature_range
+
+        with self.__lock:
+            if feature_name not in self.__ranges and generation == self.__generation:
+                self.__ranges[feature_name] = feature_range
+                # The range carries the current value, remembering it saves the next get()
+                if value_key is not None:
+                    self.__values[feature_name] = feature_range[value_key]
+
+            if value_key is not None and feature_name in self.__values:
+                feature_range = dict(feature_range)
+                feature_range[value_key] = self.__values[feature_name]
+            return feature_range
+
+    def peek_range(self, feature_name):
+        """
+        :brief      Memoized range without touching the device
+        :return:    Range or None
+        """
+        with self.__lock:
+            return self.__ranges.get(feature_name)
+
+    def value(self, feature_name, loader, is_complete=None):
+        """
+        :brief      Feature value, read from the device only on a miss
+        :param feature_name:    Feature node name
+        :param loader:          Callable reading the value from the device
+        :param is_complete:     Callable telling whether a cached value can be returned as it is
+        :return:    Feature value
+        """
+        with self.__lock:
+            if feature_name not in VOLATILE_FEATURES and feature_name in self.__values:
+                cached = self.__values[feature_name]
+                if is_complete is None or is_complete(cached):
+                    self.__count("value_hits")
+                    return cached
+
+            self.__count("get_calls")
+            generation = self.__generation
+
+        value = loader()
+        with self.__lock:
+            if feature_name not in VOLATILE_FEATURES and generation == self.__generation:
+                self.__values[feature_name] = value
+        return value
+
+    def write(self, feature_name, value, writer, matches=None, stored=None):
+        """
+        :brief      Write a value through the cache, the SDK call is skipped when the cached value already matches
+        :param feature_name:    Feature node name
+        :param value:           Value to write
+        :param writer:          Callable writing value to the device
+        :param matches:         Callable comparing the cached value with value, defaults to equal value and type
+        :param stored:          Value kept in the cache after a successful write, defaults to value
+        :return:    True if the device was written
+        """
+        with self.__lock:
+            if feature_name not in VOLATILE_FEATURES and feature_name in self.__values:
+                cached = self.__values[feature_name]
+                if matches is not None:
+                    same = matches(cached)
+                else:
+                    same = type(cached) is type(value) and cached == value
+                if same:
+                    self.__count("skipped_writes")
+                    return False
+
+            self.__count("set_calls")
+            # Reads that started before the write must not store what they read
+            self.__generation += 1
+            self.__values.pop(feature_name, None)
+
+        try:
+            writer()
+        except Exception:
+            # The device may or may not have taken the value
+            with self.__lock:
+                self.__generation += 1
+                self.__values.pop(feature_name, None)
+            raise
+
+        with self.__lock:
+            self.__generation += 1
+            if feature_name not in VOLATILE_FEATURES:
+                self.__values[feature_name] = value if stored is None else stored
+            self.__invalidate_dependents(feature_name)
+        return True
+
+    def __invalidate_dependents(self, feature_name):
+        for dependent in RANGE_DEPENDENCIES.get(feature_name, ()):
+            self.__ranges.pop(dependent, None)
+            self.__access_modes.pop(dependent, None)
+            self.__count("invalidations")
+        for dependent in VALUE_DEPENDENCIES.get(feature_name, ()):
+            self.__values.pop(dependent, None)
+
+    def command_sent(self, feature_name):
+        """
+        :brief      Forget what a command may have changed on the device
+        :param feature_name:    Command feature node name
+        :return:    None
+        """
+        with self.__lock:
+            self.__count("command_calls")
+        if feature_name in RESET_COMMANDS:
+            self.invalidate()
+        elif feature_name in ("AcquisitionStart", "AcquisitionStop"):
+            self.invalidate_access_modes()
+
+    def invalidate(self, feature_name=None):
+        """
+        :brief      Drop everything cached about one feature, or about all features
+        :param feature_name:    Feature node name, None for all features
+        :return:    None
+        """
+        with self.__lock:
+            self.__generation += 1
+            if feature_name is None:
+                self.__access_modes.clear()
+                self.__ranges.clear()
+                self.__values.clear()
+                return
+            self.__access_modes.pop(feature_name, None)
+            self.__ranges.pop(feature_name, None)
+            self.__values.pop(feature_name, None)
+
+    def invalidate_access_modes(self):
+        """
+        :brief      Drop all access modes, e.g. after the stream started or stopped and locked features changed
+        :return:    None
+        """
+        with self.__lock:
+            self.__generation += 1
+            self.__access_modes.clear()
+
+    def get_statistics(self):
+        """
+        :brief      Cache counters, every *_calls counter is one round trip through the SDK
+        :return:    Statistics dictionary
+        """
+        with self.__lock:
+            statistics = dict(self.__statistics)
+        statistics["sdk_calls"] = sum(count for key, count in statistics.items() if key.endswith("_calls"))
+        return statistics
+
+    def reset_statistics(self):
+        """
+        :brief      Set all counters back to zero
+        :return:    None
+        """
+        with self.__lock:
+            self.__statistics = dict.fromkeys((
+                "access_mode_calls", "access_mode_hits",
+                "range_calls", "range_hits",
+                "get_calls", "value_hits",
+                "set_calls", "skipped_writes",
+                "command_calls", "invalidations",
+            ), 0)
+
+
+class CachedIntFeature_s(IntFeature_s):
+    def __init__(self, handle, feature_name, cache):
+        """
+        :brief  Int feature served from a FeatureCache
+        :param handle:          Feature control handle
+        :param feature_name:    Feature node name
+        :param cache:           FeatureCache shared by the feature control
+        """
+        IntFeature_s.__init__(self, handle, feature_name)
+        self.__feature_name = feature_name
+        self.__cache = cache
+
+    def get_range(self):
+        """
+        :brief      Getting integer range
+        :return:    integer range dictionary
+        """
+        return self.__cache.range(self.__feature_name, lambda: IntFeature_s.get_range(self), "value")
+
+    def get(self):
+        """
+        :brief      Getting integer value
+        :return:    integer value
+        """
+        return self.__cache.value(self.__feature_name, lambda: IntFeature_s.get(self))
+
+    def set(self, int_value):
+        """
+        :brief      Setting integer value, skipped when the device already holds it
+        :param      int_value:  Set value
+        :return:    None
+        """
+        self.__cache.write(self.__feature_name, int_value, lambda: IntFeature_s.set(self, int_value))
+
+
+class CachedFloatFeature_s(FloatFeature_s):
+    def __init__(self, handle, feature_name, cache):
+        """
+        :brief  Float feature served from a FeatureCache
+        :param handle:          Feature control handle
+        :param feature_name:    Feature node name
+        :param cache:           FeatureCache shared by the feature control
+        """
+        FloatFeature_s.__init__(self, handle, feature_name)
+        self.__feature_name = feature_name
+        self.__cache = cache
+
+    def get_range(self):
+        """
+        :brief      Getting float range
+        :return:    float range dictionary
+        """
+        return self.__cache.range(self.__feature_name, lambda: FloatFeature_s.get_range(self), "cur_value")
+
+    def get(self):
+        """
+        :brief      Getting float value
+        :return:    float value
+        """
+        return self.__cache.value(self.__feature_name, lambda: FloatFeature_s.get(self))
+
+    def set(self, float_value):
+        """
+        :brief      Setting float value, skipped when the device already holds it
+        :param      float_value
+        :return:    None
+        """
+        self.__cache.write(self.__feature_name, float_value, lambda: FloatFeature_s.set(self, float_value))
+
+
+class CachedEnumFeature_s(EnumFeature_s):
+    def __init__(self, handle, feature_name, cache):
+        """
+        :brief  Enum feature served from a FeatureCache
+        :param handle:          Feature control handle
+        :param feature_name:    Feature node name
+        :param cache:           FeatureCache shared by the feature control
+        """
+        EnumFeature_s.__init__(self, handle, feature_name)
+        self.__feature_name = feature_name
+        self.__cache = cache
+
+    def get_range(self):
+        """
+        :brief      Getting range of Enum feature
+        :return:    enum_dict:    enum range dictionary
+        """
+        return self.__cache.range(self.__feature_name, lambda: EnumFeature_s.get_range(self))
+
+    def get(self):
+        """
+        :brief      Getting value of Enum feature
+        :return:    enum_value:     enum value
+                    enum_str:       string for enum description
+        """
+        return self.__cache.value(self.__feature_name, lambda: EnumFeature_s.get(self),
+                                  lambda cached: None not in cached)
+
+    def __resolve(self, enum_value):
+        # Both halves of (value, symbolic) are known once the range has been read
+        enum_range = self.__cache.peek_range(self.__feature_name) or []
+        for entry in enum_range:
+            if enum_value in (entry["value"], entry["symbolic"]):
+                return entry["value"], entry["symbolic"]
+        if isinstance(enum_value, str):
+            return None, enum_value
+        return enum_value, None
+
+    def set(self, enum_value):
+        """
+        :brief      Setting enum value, skipped when the device already holds it
+        :param      enum_value
+        :return:    None
+        """
+        if isinstance(enum_value, str):
+            matches = lambda cached: cached[1] == enum_value
+        elif isinstance(enum_value, int):
+            matches = lambda cached: cached[0] == enum_value
+        else:
+            raise ParameterTypeError("CachedEnumFeature_s.set: "
+                                     "Expected enum_value type is int or string, not %s" % type(enum_value))
+
+        self.__cache.write(self.__feature_name, enum_value, lambda: EnumFeature_s.set(self, enum_value),
+                           matches, self.__resolve(enum_value))
+
+
+class CachedBoolFeature_s(BoolFeature_s):
+    def __init__(self, handle, feature_name, cache):
+        """
+        :brief  Bool feature served from a FeatureCache
+        :param handle:          Feature control handle
+        :param feature_name:    Feature node name
+        :param cache:           FeatureCache shared by the feature control
+        """
+        BoolFeature_s.__init__(self, handle, feature_name)
+        self.__feature_name = feature_name
+        self.__cache = cache
+
+    def get(self):
+        """
+        :brief      Getting bool value
+        :return:    bool value[bool]
+        """
+        return self.__cache.value(self.__feature_name, lambda: BoolFeature_s.get(self))
+
+    def set(self, bool_value):
+        """
+        :brief      Setting bool value, skipped when the device already holds it
+        :param      bool_value[bool]
+        :return:    None
+        """
+        self.__cache.write(self.__feature_name, bool_value, lambda: BoolFeature_s.set(self, bool_value))
+
+
+class CachedStringFeature_s(StringFeature_s):
+    def __init__(self, handle, feature_name, cache):
+        """
+        :brief  String feature served from a FeatureCache
+        :param handle:          Feature control handle
+        :param feature_name:    Feature node name
+        :param cache:           FeatureCache shared by the feature control
+        """
+        StringFeature_s.__init__(self, handle, feature_name)
+        self.__feature_name = feature_name
+        self.__cache = cache
+
+    def get(self):
+        """
+        :brief      Getting string value
+        :return:    strings
+        """
+        return self.__cache.value(self.__feature_name, lambda: StringFeature_s.get(self))
+
+    def set(self, input_string):
+        """
+        :brief      Setting string value, skipped when the device already holds it
+        :param      input_string[string]
+        :return:    None
+        """
+        self.__cache.write(self.__feature_name, input_string, lambda: StringFeature_s.set(self, input_string))
+
+
+class CachedCommandFeature_s(CommandFeature_s):
+    def __init__(self, handle, feature_name, cache):
+        """
+        :brief  Command feature that tells the FeatureCache what it may have changed
+        :param handle:          Feature control handle
+        :param feature_name:    Feature node name
+        :param cache:           FeatureCache shared by the feature control
+        """
+        CommandFeature_s.__init__(self, handle, feature_name)
+        self.__feature_name = feature_name
+        self.__cache = cache
+
+    def send_command(self):
+        """
+        :brief      Sending command
+        :return:    None
+        """
+        CommandFeature_s.send_command(self)
+        self.__cache.command_sent(self.__feature_name)
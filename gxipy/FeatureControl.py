@@ -7,6 +7,7 @@ from gxipy.gxwrapper import *
 from gxipy.dxwrapper import *
 from gxipy.gxidef import *
 from gxipy.Feature_s import *
+from gxipy.FeatureCache import *
 from gxipy.StatusProcessor import *
 import types
 
@@ -17,6 +18,46 @@ class FeatureControl:
         :param handle:
         """
         self.__handle = handle
+        self.__cache = None
+
+    def enable_feature_cache(self):
+        """
+        :brief      Serve access modes, ranges and values of the features created from now on through a FeatureCache
+        :return:    FeatureCache
+        """
+        if self.__cache is None:
+            self.__cache = FeatureCache()
+        return self.__cache
+
+    def disable_feature_cache(self):
+        """
+        :brief      Features created from now on talk to the device directly again
+        :return:    None
+        """
+        self.__cache = None
+
+    def get_feature_cache(self):
+        """
+        :brief      Get the FeatureCache of this feature control
+        :return:    FeatureCache or None when caching is disabled
+        """
+        return self.__cache
+
+    def __get_node_access_mode(self, feature_name, caller):
+        """
+        :brief      Read the node access mode, through the cache when it is enabled
+        :param feature_name:    Feature node name
+        :param caller:          Method name reported on failure
+        :return:    Node access mode
+        """
+        def read_node_access_mode():
+            status, node_access = gx_get_node_access_mode( self.__handle ,feature_name)
+            StatusProcessor.process(status, 'FeatureControl', caller)
+            return node_access
+
+        if self.__cache is None:
+            return read_node_access_mode()
+        return self.__cache.access_mode(feature_name, read_node_access_mode)
 
     def is_implemented(self,feature_name):
         """
@@ -28,8 +69,7 @@ class FeatureControl:
             raise ParameterTypeError("FeatureControl.is_implemented: "
                                      "Expected feature_name type is int, not %s" % type(feature_name))
 
-        status, node_access = gx_get_node_access_mode( self.__handle ,feature_name)
-        StatusProcessor.process(status, 'FeatureControl', 'is_implemented')
+        node_access = self.__get_node_access_mode(feature_name, 'is_implemented')
         if ((node_access == GxNodeAccessMode.MODE_NI) or (node_access == GxNodeAccessMode.MODE_UNDEF)):
             return  False
         else:
@@ -44,8 +84,7 @@ class FeatureControl:
             raise ParameterTypeError("FeatureControl.get_int_feature: "
                                      "Expected feature_name type is str, not %s" % type(feature_name))
 
-        status, node_access = gx_get_node_access_mode( self.__handle ,feature_name)
-        StatusProcessor.process(status, 'FeatureControl', 'is_readable')
+        node_access = self.__get_node_access_mode(feature_name, 'is_readable')
         if ((node_access == GxNodeAccessMode.MODE_RO) or (node_access == GxNodeAccessMode.MODE_RW)):
             return True
         else:
@@ -60,8 +99,7 @@ class FeatureControl:
             raise ParameterTypeError("FeatureControl.get_int_feature: "
                                      "Expected feature_name type is str, not %s" % type(feature_name))
 
-        status, node_access = gx_get_node_access_mode( self.__handle ,feature_name)
-        StatusProcessor.process(status, 'FeatureControl', 'is_readable')
+        node_access = self.__get_node_access_mode(feature_name, 'is_readable')
         if ((node_access == GxNodeAccessMode.MODE_WO) or (node_access == GxNodeAccessMode.MODE_RW)):
             return True
         else:
@@ -81,6 +119,9 @@ class FeatureControl:
              raise  UnexpectedError( "FeatureControl.get_int_feature: "
                                      "The feature '%s' is not implemented" %feature_name)
 
+        if self.__cache is not None:
+            return CachedIntFeature_s( self.__handle, feature_name, self.__cache)
+
         int_feature = IntFeature_s( self.__handle, feature_name)
         return int_feature
 
@@ -98,6 +139,9 @@ class FeatureControl:
              raise  UnexpectedError( "FeatureControl.get_enum_feature: "
                                      "The feature '%s' is not implemented" %feature_name)
 
+        if self.__cache is not None:
+            return CachedEnumFeature_s( self.__handle, feature_name, self.__cache)
+
         enum_feature = EnumFeature_s( self.__handle, feature_name)
         return enum_feature
 
@@ -115,6 +159,9 @@ class FeatureControl:
              raise  UnexpectedError( "FeatureControl.get_float_feature: "
                                      "The feature '%s' is not implemented" %feature_name)
 
+        if self.__cache is not None:
+            return CachedFloatFeature_s( self.__handle, feature_name, self.__cache)
+
         float_feature = FloatFeature_s( self.__handle, feature_name)
         return float_feature
 
@@ -132,6 +179,9 @@ class FeatureControl:
              raise  UnexpectedError( "FeatureControl.get_bool_feature: "
                                      "The feature '%s' is not implemented" %feature_name)
 
+        if self.__cache is not None:
+            return CachedBoolFeature_s( self.__handle, feature_name, self.__cache)
+
         bool_feature = BoolFeature_s( self.__handle, feature_name)
         return bool_feature
 
@@ -149,6 +199,9 @@ class FeatureControl:
              raise  UnexpectedError( "FeatureControl.get_string_feature: "
                                      "The feature '%s' is not implemented" %feature_name)
 
+        if self.__cache is not None:
+            return CachedStringFeature_s( self.__handle, feature_name, self.__cache)
+
         string_feature = StringFeature_s( self.__handle, feature_name)
         return string_feature
 
@@ -166,6 +219,9 @@ class FeatureControl:
              raise  UnexpectedError( "FeatureControl.get_command_feature: "
                                      "The feature '%s' is not implemented" %feature_name)
 
+        if self.__cache is not None:
+            return CachedCommandFeature_s( self.__handle, feature_name, self.__cache)
+
         command_feature = CommandFeature_s( self.__handle, feature_name)
         return command_feature
 
@@ -206,10 +206,18 @@ class RGBImage:
         return self.frame_data.image_size
 
 class RawImage:
-    def __init__(self, frame_data):
+    def __init__(self, frame_data, zero_copy=False):
+        """
+        :brief  Constructor for instance initialization
+        :param frame_data:  GxFrameData of the image
+        :param zero_copy:   True: wrap frame_data.image_buf in place instead of copying it,
+                            the caller must keep the buffer alive while the image is used
+        """
         self.frame_data = frame_data
 
-        if self.frame_data.image_buf is not None:
+        if self.frame_data.image_buf is not None and zero_copy:
+            self.__image_array = (c_ubyte * self.frame_data.image_size).from_address(self.frame_data.image_buf)
+        elif self.frame_data.image_buf is not None:
             self.__image_array = string_at(self.frame_data.image_buf, self.frame_data.image_size)
         else:
             self.__image_array = (c_ubyte * self.frame_data.image_size)()
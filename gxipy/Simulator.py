@@ -0,0 +1,1052 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import collections
+import ctypes
+import os
+import threading
+import time
+import numpy
+from gxipy.gxwrapper import *
+from gxipy.gxidef import *
+from gxipy.ImageProc import *
+from gxipy.DataStream import DataStream
+from gxipy.FeatureControl import FeatureControl
+from gxipy.Feature_s import EnumFeature_s
+from gxipy.StatusProcessor import StatusProcessor
+from gxipy.Exception import *
+from gxipy.simwrapper import SimulatedDriverError, gx_open_simulated_handle, gx_close_simulated_handle
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+# GXIPY_SIMULATOR is "1" for the defaults or a list of overrides, e.g.
+# GXIPY_SIMULATOR="cameras=4,width=2048,height=1536,pixel_format=BAYER_RG12,fps=300,frame_loss=0.01"
+SIMULATOR_DEFAULTS = {
+    "cameras":              1,              # number of devices found by update_device_list
+    "model":                "",             # model name, derived from the pixel format when empty
+    "width":                1440,           # sensor width
+    "height":               1080,           # sensor height
+    "pixel_format":         "BAYER_RG8",    # GxPixelFormatEntry name
+    "fps":                  100.0,          # highest frame rate of the sensor
+    "frame_loss":           0.0,            # probability of a frame being lost on the link
+    "buffers":              10,             # acquisition buffers until set_acquisition_buffer_number
+    "feature_latency_ms":   0.0,            # time every feature access takes, like a control transfer
+    "seed":                 0,              # seed of the frame loss and of the device clock offsets
+}
+
+SIMULATED_PIXEL_FORMATS = ("MONO8", "MONO10", "MONO12",
+                           "BAYER_GR8", "BAYER_RG8", "BAYER_GB8", "BAYER_BG8",
+                           "BAYER_GR10", "BAYER_RG10", "BAYER_GB10", "BAYER_BG10",
+                           "BAYER_GR12", "BAYER_RG12", "BAYER_GB12", "BAYER_BG12")
+
+SIMULATED_BASE_FRAMES = 8
+SIMULATED_BURST_FRAME_COUNT_MAX = 0xFFFF
+SIMULATED_THROUGHPUT_LIMIT_MAX = 400000000
+
+
+def parse_simulator_config(config_string):
+    """
+    :brief      Parse the GXIPY_SIMULATOR value
+    :param      config_string:  "1" or comma separated key=value pairs, see SIMULATOR_DEFAULTS
+    :return:    configuration dictionary
+    """
+    config = dict(SIMULATOR_DEFAULTS)
+    config_string = config_string.strip()
+    if config_string.lower() in ("", "1", "true", "on", "yes"):
+        return config
+
+    for item in config_string.split(","):
+        key, separator, value = item.partition("=")
+        key = key.strip()
+        if not separator or key not in SIMULATOR_DEFAULTS:
+            raise InvalidParameter("GXIPY_SIMULATOR: unknown setting '%s', expected one of %s"
+                                   % (item, ", ".join(SIMULATOR_DEFAULTS)))
+        config[key] = type(SIMULATOR_DEFAULTS[key])(value.strip())
+
+    if config["pixel_format"] not in SIMULATED_PIXEL_FORMATS:
+        raise InvalidParameter("GXIPY_SIMULATOR: unsupported pixel_format %s, expected one of %s"
+                               % (config["pixel_format"], ", ".join(SIMULATED_PIXEL_FORMATS)))
+    return config
+
+
+def get_simulator_config():
+    """
+    :brief      Configuration from the GXIPY_SIMULATOR environment variable
+    :return:    configuration dictionary
+    """
+    return parse_simulator_config(os.environ.get("GXIPY_SIMULATOR", "1"))
+
+
+def _bayer_pattern(pixel_format):
+    """
+    :brief      Colour filter pattern of a Bayer format, e.g. "RG", None for mono formats
+    """
+    for pattern in ("GR", "RG", "GB", "BG"):
+        for bits in (8, 10, 12):
+            if getattr(GxPixelFormatEntry, "BAYER_%s%d" % (pattern, bits)) == pixel_format:
+                return pattern
+    return None
+
+
+def _pixel_format_symbolic(name):
+    """
+    :brief      GenICam symbolic of a GxPixelFormatEntry name, BAYER_RG8 -> BayerRG8
+    """
+    if name.startswith("BAYER_"):
+        return "Bayer" + name[6:]
+    return name.capitalize()
+
+
+def _synthetic_frames(width, height, pixel_format, count=SIMULATED_BASE_FRAMES):
+    """
+    :brief      Raw frames of a gradient with a bar moving across it, mosaiced for Bayer formats
+    :return:    list of 1D uint8 arrays holding the frame bytes
+    """
+    bits = 8 if pixel_format & PIXEL_BIT_MASK == GX_PIXEL_8BIT else \
+        10 if pixel_format in (GxPixelFormatEntry.MONO10, GxPixelFormatEntry.BAYER_GR10, GxPixelFormatEntry.BAYER_RG10,
+                               GxPixelFormatEntry.BAYER_GB10, GxPixelFormatEntry.BAYER_BG10) else 12
+    dtype = numpy.uint8 if bits == 8 else numpy.uint16
+    maximum = (1 << bits) - 1
+    x = numpy.linspace(0, 1, width, dtype=numpy.float32)[None, :]
+    y = numpy.linspace(0, 1, height, dtype=numpy.float32)[:, None]
+    pattern = _bayer_pattern(pixel_format)
+
+    frames = []
+    for index in range(count):
+        bar = (numpy.abs(x - float(index) / count) < 0.05).astype(numpy.float32)
+        if pattern is None:
+            frame = numpy.maximum((x + y) / 2, bar)
+        else:
+            channels = {"R": x + 0 * y, "G": y + 0 * x, "B": numpy.maximum(1 - x, bar) + 0 * y}
+            order = {"RG": "RGGB", "GR": "GRBG", "GB": "GBRG", "BG": "BGGR"}[pattern]
+            frame = numpy.empty((height, width), dtype=numpy.float32)
+            for position, color in enumerate(order):
+                row, column = divmod(position, 2)
+                frame[row::2, column::2] = channels[color][row::2, column::2]
+        frame = numpy.ascontiguousarray((frame * maximum).astype(dtype))
+        frames.append(frame.view(numpy.uint8).reshape(-1))
+    return frames
+
+
+class SimulatedNodeMap:
+    def __init__(self, nodes, latency=0.0, on_command=None):
+        """
+        :brief  Feature nodes of a simulated device or stream, read and written through the gx_* calls of simwrapper
+                Every node is a dictionary with a "type" (int, float, enum, bool, string, command) and its
+                "value", plus "min"/"max"/"inc" for numbers, "entries" [(value, symbolic)] for enums,
+                "access" "RO" for read-only nodes, "getter" for values computed on every read and
+                "locked" for nodes that are read-only while the stream is running.
+        :param nodes:           Node dictionary, keyed by feature name
+        :param latency:         Seconds every access takes
+        :param on_command:      Callable(feature_name) executing command nodes
+        """
+        self.__nodes = nodes
+        self.__defaults = dict((name, node.get("value")) for name, node in nodes.items())
+        self.__latency = latency
+        self.__on_command = on_command
+        self.__lock = threading.RLock()
+        self.__limits = {}
+        self.streaming = False
+
+    def __round_trip(self):
+        if self.__latency > 0:
+            time.sleep(self.__latency)
+
+    def __node(self, feature_name, feature_type):
+        node = self.__nodes.get(feature_name)
+        if node is None:
+            raise SimulatedDriverError(GxStatusList.NOT_IMPLEMENTED,
+                                       "The feature '%s' is not implemented" % feature_name)
+        if node["type"] != feature_type:
+            raise SimulatedDriverError(GxStatusList.ERROR_TYPE, "The feature '%s' is %s, not %s"
+                                       % (feature_name, node["type"], feature_type))
+        return node
+
+    def set_limits(self, feature_name, limits):
+        """
+        :brief      Compute the range of a node on every read
+        :param feature_name:    Feature node name
+        :param limits:          Callable returning (min, max)
+        """
+        self.__limits[feature_name] = limits
+
+    def value(self, feature_name):
+        """
+        :brief      Current value of a node without the access latency, for the device itself
+        """
+        with self.__lock:
+            node = self.__nodes[feature_name]
+            return node["getter"]() if "getter" in node else node["value"]
+
+    def symbolic(self, feature_name):
+        """
+        :brief      Current symbolic of an enum node without the access latency, for the device itself
+        """
+        with self.__lock:
+            node = self.__nodes[feature_name]
+            return dict(node["entries"])[node["value"]]
+
+    def access_mode(self, feature_name):
+        """
+        :brief      Node access mode, see GxNodeAccessMode
+        """
+        self.__round_trip()
+        with self.__lock:
+            node = self.__nodes.get(feature_name)
+            if node is None:
+                return GxNodeAccessMode.MODE_NI
+            if node["type"] == "command":
+                return GxNodeAccessMode.MODE_WO
+            if node.get("access") == "RO" or (node.get("locked") and self.streaming):
+                return GxNodeAccessMode.MODE_RO
+            return GxNodeAccessMode.MODE_RW
+
+    def get_range(self, feature_name, feature_type):
+        """
+        :brief      Value and range of an int or float node
+        :return:    dictionary with value, min, max, inc and unit
+        """
+        self.__round_trip()
+        with self.__lock:
+            node = self.__node(feature_name, feature_type)
+            value = node["getter"]() if "getter" in node else node["value"]
+            minimum, maximum = self.__limits[feature_name]() if feature_name in self.__limits else (node["min"], node["max"])
+            return {"value": value, "min": minimum, "max": maximum,
+                    "inc": node.get("inc", 1 if feature_type == "int" else 0.0), "unit": node.get("unit", "")}
+
+    def get_enum_range(self, feature_name):
+        """
+        :brief      Value and entries of an enum node
+        :return:    (value, [(value, symbolic)])
+        """
+        self.__round_trip()
+        with self.__lock:
+            node = self.__node(feature_name, "enum")
+            return node["value"], list(node["entries"])
+
+    def get(self, feature_name, feature_type):
+        """
+        :brief      Value of a node
+        """
+        self.__round_trip()
+        with self.__lock:
+            node = self.__node(feature_name, feature_type)
+            return node["getter"]() if "getter" in node else node["value"]
+
+    def set(self, feature_name, feature_type, value):
+        """
+        :brief      Write a node, enums by value or by symbolic
+        """
+        self.__round_trip()
+        with self.__lock:
+            node = self.__node(feature_name, feature_type)
+            if node.get("access") == "RO" or (node.get("locked") and self.streaming):
+                raise SimulatedDriverError(GxStatusList.INVALID_ACCESS,
+                                           "The feature '%s' is not writable now" % feature_name)
+
+            if feature_type == "enum":
+                for entry_value, symbolic in node["entries"]:
+                    if value == entry_value or (isinstance(value, str) and value.lower() == symbolic.lower()):
+                        value = entry_value
+                        break
+                else:
+                    raise SimulatedDriverError(GxStatusList.OUT_OF_RANGE,
+                                               "'%s' is not an entry of %s" % (value, feature_name))
+            elif feature_type in ("int", "float"):
+                minimum, maximum = self.__limits[feature_name]() if feature_name in self.__limits else (node["min"], node["max"])
+                if value < minimum or value > maximum:
+                    raise SimulatedDriverError(GxStatusList.OUT_OF_RANGE, "%s out of range [%s, %s]: %s"
+                                               % (feature_name, minimum, maximum, value))
+                if feature_type == "int" and (value - minimum) % node.get("inc", 1):
+                    raise SimulatedDriverError(GxStatusList.OUT_OF_RANGE,
+                                               "%s must be a multiple of %s" % (feature_name, node["inc"]))
+
+            node["value"] = value
+            self.__clamp()
+
+    def __clamp(self):
+        # Writing one node can pull the value of another back into its new range, as devices do
+        for feature_name, limits in self.__limits.items():
+            node = self.__nodes[feature_name]
+            minimum, maximum = limits()
+            node["value"] = min(max(node["value"], minimum), maximum)
+
+    def send_command(self, feature_name):
+        """
+        :brief      Execute a command node
+        """
+        self.__round_trip()
+        self.__node(feature_name, "command")
+        if self.__on_command is not None:
+            self.__on_command(feature_name)
+
+    def store(self, feature_name, value):
+        """
+        :brief      Set a node from inside the device, e.g. a latched timestamp
+        """
+        with self.__lock:
+            self.__nodes[feature_name]["value"] = value
+
+    def reset(self):
+        """
+        :brief      Put every node back to its power-on value
+        """
+        with self.__lock:
+            for feature_name, value in self.__defaults.items():
+                self.__nodes[feature_name]["value"] = value
+
+
+class SimulatedAcquisition:
+    def __init__(self, device, config, seed):
+        """
+        :brief  Acquisition engine behind the stream handle of a simulated device
+                A thread fills a ring of driver buffers at the frame rate of the device.
+                A frame is lost when no buffer is free or, with probability frame_loss, on the link;
+                its frame id is skipped either way. The buffer calls of simwrapper hand the frames
+                out to the DataStream of the device.
+        :param device:      SimulatedDevice
+        :param config:      Simulator configuration dictionary
+        :param seed:        Seed of the frame loss
+        """
+        self.__device = device
+        self.__frame_loss = config["frame_loss"]
+        self.__random = numpy.random.default_rng(seed)
+        self.__buffer_number = config["buffers"]
+        self.__capture_callback = None
+
+        self.__condition = threading.Condition()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+        self.__triggers = collections.deque()
+        self.__memory = []
+        self.__retired_memory = []
+        self.__frame_buffers = []
+        self.__free = collections.deque()
+        self.__ready = collections.deque()
+        self.__dequeued = set()
+        self.__base_frames = []
+        self.__base_key = None
+        self.__next_frame_id = 0
+
+        self.__delivered = 0
+        self.__lost = 0
+
+        self.node_map = SimulatedNodeMap({
+            "StreamAnnouncedBufferCount":   {"type": "int", "access": "RO", "min": 0, "max": UNSIGNED_INT_MAX,
+                                             "value": 0, "getter": lambda: len(self.__frame_buffers)},
+            "StreamDeliveredFrameCount":    {"type": "int", "access": "RO", "min": 0, "max": UNSIGNED_LONG_LONG_MAX,
+                                             "value": 0, "getter": lambda: self.__delivered},
+            "StreamLostFrameCount":         {"type": "int", "access": "RO", "min": 0, "max": UNSIGNED_LONG_LONG_MAX,
+                                             "value": 0, "getter": lambda: self.__lost},
+            "StreamIncompleteFrameCount":   {"type": "int", "access": "RO", "min": 0, "max": UNSIGNED_LONG_LONG_MAX,
+                                             "value": 0},
+            "StreamBufferHandlingMode":     {"type": "enum", "value": 1, "entries": [(1, "OldestFirst")]},
+        })
+
+    def get_payload_size(self):
+        return self.__device.get_payload_size()
+
+    def set_buffer_number(self, buffer_number):
+        """
+        :brief      Size of the buffer ring allocated by the next start
+        """
+        if self.__thread is not None:
+            raise SimulatedDriverError(GxStatusList.INVALID_CALL, "Can't change the buffers during acquisition")
+        self.__buffer_number = buffer_number
+
+    def set_capture_callback(self, capture_callback):
+        """
+        :brief      CAP_CALL receiving every frame instead of the output queue, None to unregister
+        """
+        self.__capture_callback = capture_callback
+
+    def start(self):
+        """
+        :brief      Allocate the buffer ring and start the acquisition thread, called by the device
+        :return:    none
+        """
+        if self.__thread is not None:
+            return
+
+        width, height, pixel_format = self.__device.get_image_format()
+        key = (width, height, pixel_format)
+        if key != self.__base_key:
+            self.__base_frames = _synthetic_frames(width, height, pixel_format)
+            self.__base_key = key
+
+        payload_size = self.__device.get_payload_size()
+        with self.__condition:
+            if len(self.__memory) != self.__buffer_number or self.__memory[0].size != payload_size:
+                # Consumers may still read frames dequeued before the restart while they release them
+                self.__retired_memory = self.__memory
+                self.__memory = [numpy.empty(payload_size, dtype=numpy.uint8) for _ in range(self.__buffer_number)]
+                self.__frame_buffers = []
+                for buf_id, memory in enumerate(self.__memory):
+                    frame_buffer = GxFrameBuffer()
+                    frame_buffer.buf_id = buf_id
+                    frame_buffer.image_buf = memory.ctypes.data
+                    self.__frame_buffers.append(frame_buffer)
+            self.__free = collections.deque(range(len(self.__frame_buffers)))
+            self.__ready.clear()
+            self.__dequeued.clear()
+            self.__triggers.clear()
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run, name="SimulatedAcquisition", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        :brief      Stop the acquisition thread and drop every frame not handed out yet, called by the device
+        :return:    none
+        """
+        self.__stop_event.set()
+        with self.__condition:
+            self.__condition.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        with self.__condition:
+            self.__ready.clear()
+            self.__triggers.clear()
+
+    def trigger(self, start_time, frame_count):
+        """
+        :brief      Queue a triggered burst, called by the device
+        :param      start_time:     perf_counter_ns of the first frame
+        :param      frame_count:    frames in the burst
+        :return:    none
+        """
+        with self.__condition:
+            self.__triggers.append([start_time, frame_count])
+            self.__condition.notify_all()
+
+    def __run(self):
+        next_time = time.perf_counter_ns()
+        while not self.__stop_event.is_set():
+            period = int(1e9 / self.__device.get_frame_rate())
+            now = time.perf_counter_ns()
+            if self.__device.is_trigger_mode():
+                with self.__condition:
+                    if not self.__triggers:
+                        self.__condition.wait(0.05)
+                        continue
+                    burst = self.__triggers[0]
+                    next_time = max(next_time, burst[0])
+                    burst[1] -= 1
+                    if burst[1] <= 0:
+                        self.__triggers.popleft()
+            elif next_time < now - period * len(self.__frame_buffers):
+                # Idle or far behind, the device does not make up for frames it never exposed
+                next_time = now
+
+            delay = next_time - now
+            if delay > 0 and self.__stop_event.wait(delay / 1e9):
+                break
+            self.__expose(next_time)
+            next_time += period
+
+    def __expose(self, expose_time):
+        frame_id = self.__next_frame_id
+        self.__next_frame_id += 1
+        if self.__frame_loss > 0 and self.__random.random() < self.__frame_loss:
+            self.__lost += 1
+            return
+
+        with self.__condition:
+            if not self.__free:
+                self.__lost += 1
+                return
+            buf_id = self.__free.popleft()
+            memory = self.__memory[buf_id]
+
+        base_frame = self.__base_frames[frame_id % len(self.__base_frames)]
+        numpy.copyto(memory[:base_frame.size], base_frame)
+        width, height, pixel_format = self.__base_key
+
+        frame_buffer = self.__frame_buffers[buf_id]
+        frame_buffer.status = GxFrameStatusList.SUCCESS
+        frame_buffer.width = width
+        frame_buffer.height = height
+        frame_buffer.pixel_format = pixel_format
+        frame_buffer.image_size = memory.size
+        frame_buffer.frame_id = frame_id
+        frame_buffer.timestamp = self.__device.get_device_time(expose_time)
+
+        capture_callback = self.__capture_callback
+        if capture_callback is not None:
+            # The driver calls back with the buffer and requeues it once the callback returns
+            capture_data = GxFrameCallbackParam()
+            for name in ("status", "image_buf", "image_size", "width", "height", "pixel_format",
+                         "frame_id", "timestamp"):
+                setattr(capture_data, name, getattr(frame_buffer, name))
+            capture_callback(ctypes.pointer(capture_data))
+            with self.__condition:
+                self.__free.append(buf_id)
+                self.__delivered += 1
+            return
+
+        with self.__condition:
+            self.__ready.append(buf_id)
+            self.__delivered += 1
+            self.__condition.notify_all()
+
+    def dq(self, timeout, max_frames):
+        """
+        :brief      Wait up to timeout ms for the first frame, then take whatever else is ready
+        :return:    list of GxFrameBuffer, they stay with the caller until q
+        """
+        deadline = time.perf_counter() + timeout / 1000.0
+        with self.__condition:
+            while not self.__ready:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or self.__thread is None:
+                    return []
+                self.__condition.wait(remaining)
+            frame_buffers = []
+            while self.__ready and len(frame_buffers) < max_frames:
+                buf_id = self.__ready.popleft()
+                self.__dequeued.add(buf_id)
+                frame_buffers.append(self.__frame_buffers[buf_id])
+            return frame_buffers
+
+    def q(self, buf_id):
+        """
+        :brief      Give a dequeued buffer back to the ring
+        """
+        with self.__condition:
+            # A buffer dequeued before a restart is back in the ring already
+            if buf_id in self.__dequeued:
+                self.__dequeued.discard(buf_id)
+                self.__free.append(buf_id)
+
+    def flush(self):
+        """
+        :brief      Drop every frame not handed out yet
+        """
+        with self.__condition:
+            while self.__ready:
+                self.__free.append(self.__ready.popleft())
+
+
+class SimulatedDevice:
+    def __init__(self, device_info, config, index):
+        """
+        :brief  Simulated camera with the features the application uses
+                Its clock runs at a random offset from the host perf_counter_ns, so timestamps
+                of several devices only line up through TimestampLatch like on real hardware.
+        :param device_info:     Entry of the device info list
+        :param config:          Simulator configuration dictionary
+        :param index:           Device index, starting from 1
+        """
+        self.__device_info = device_info
+        self.__config = config
+        random = numpy.random.default_rng(config["seed"] + index)
+        self.__clock_offset = int(random.integers(0, 10 ** 12))
+        self.__max_frame_rate = config["fps"]
+
+        width, height = config["width"], config["height"]
+        pixel_format = getattr(GxPixelFormatEntry, config["pixel_format"])
+        self.__colored = _bayer_pattern(pixel_format) is not None
+        self.__node_map = SimulatedNodeMap(self.__create_nodes(width, height, pixel_format),
+                                           config["feature_latency_ms"] / 1000.0, self.__on_command)
+        self.__node_map.set_limits("Width", lambda: (16, width - self.__node_map.value("OffsetX")))
+        self.__node_map.set_limits("Height", lambda: (2, height - self.__node_map.value("OffsetY")))
+        self.__node_map.set_limits("OffsetX", lambda: (0, width - self.__node_map.value("Width")))
+        self.__node_map.set_limits("OffsetY", lambda: (0, height - self.__node_map.value("Height")))
+        self.__node_map.set_limits("ExposureTime", self.__exposure_limits)
+        self.__node_map.set_limits("AcquisitionFrameRate", lambda: (0.1, self.__max_frame_rate))
+
+        self.__acquisition = SimulatedAcquisition(self, config, config["seed"] + index)
+        self.__dev_handle = gx_open_simulated_handle(self.__node_map)
+        # The stream handle serves the buffer calls and the stream features, by name and by feature ID
+        self.__stream_handle = gx_open_simulated_handle(self.__acquisition.node_map, self.__acquisition)
+        self.data_stream = [DataStream(self.__stream_handle, self.__stream_handle)]
+        if self.__colored:
+            self.BalanceWhiteAuto = EnumFeature_s(self.__dev_handle, "BalanceWhiteAuto")
+
+    def __create_nodes(self, width, height, pixel_format):
+        switch = [(GxSwitchEntry.OFF, "Off"), (GxSwitchEntry.ON, "On")]
+        nodes = {
+            "DeviceModelName":      {"type": "string", "access": "RO", "value": self.__device_info["model_name"]},
+            "DeviceSerialNumber":   {"type": "string", "access": "RO", "value": self.__device_info["sn"]},
+            "SensorWidth":          {"type": "int", "access": "RO", "min": width, "max": width, "value": width},
+            "SensorHeight":         {"type": "int", "access": "RO", "min": height, "max": height, "value": height},
+            "Width":                {"type": "int", "locked": True, "inc": 2, "value": width},
+            "Height":               {"type": "int", "locked": True, "inc": 2, "value": height},
+            "OffsetX":              {"type": "int", "inc": 2, "value": 0},
+            "OffsetY":              {"type": "int", "inc": 2, "value": 0},
+            "PixelFormat":          {"type": "enum", "locked": True, "value": pixel_format,
+                                     "entries": [(pixel_format, _pixel_format_symbolic(self.__config["pixel_format"]))]},
+            "ExposureTime":         {"type": "float", "unit": "us", "value": 10000.0},
+            "ExposureTimeMode":     {"type": "enum", "locked": True, "value": GxExposureTimeModeEntry.STANDARD,
+                                     "entries": [(GxExposureTimeModeEntry.ULTRASHORT, "UltraShort"),
+                                                 (GxExposureTimeModeEntry.STANDARD, "Standard")]},
+            "Gain":                 {"type": "float", "unit": "dB", "min": 0.0, "max": 24.0, "value": 0.0},
+            "AcquisitionMode":      {"type": "enum", "value": GxAcquisitionModeEntry.CONTINUOUS,
+                                     "entries": [(GxAcquisitionModeEntry.CONTINUOUS, "Continuous")]},
+            "AcquisitionFrameRate": {"type": "float", "unit": "fps", "value": self.__max_frame_rate},
+            "AcquisitionFrameRateMode": {"type": "enum", "value": GxSwitchEntry.OFF, "entries": switch},
+            "CurrentAcquisitionFrameRate": {"type": "float", "access": "RO", "unit": "fps", "min": 0.0,
+                                            "max": self.__max_frame_rate, "value": 0.0, "getter": self.get_frame_rate},
+            "AcquisitionBurstFrameCount": {"type": "int", "min": 1, "max": SIMULATED_BURST_FRAME_COUNT_MAX, "value": 1},
+            "TriggerMode":          {"type": "enum", "value": GxSwitchEntry.OFF, "entries": switch},
+            "TriggerSelector":      {"type": "enum", "value": GxTriggerSelectorEntry.FRAME_START,
+                                     "entries": [(GxTriggerSelectorEntry.FRAME_START, "FrameStart"),
+                                                 (GxTriggerSelectorEntry.FRAME_BURST_START, "FrameBurstStart")]},
+            "TriggerSource":        {"type": "enum", "value": GxTriggerSourceEntry.SOFTWARE,
+                                     "entries": [(GxTriggerSourceEntry.SOFTWARE, "Software"),
+                                                 (GxTriggerSourceEntry.LINE0, "Line0"),
+                                                 (GxTriggerSourceEntry.LINE2, "Line2"),
+                                                 (GxTriggerSourceEntry.LINE3, "Line3")]},
+            "TriggerActivation":    {"type": "enum", "value": GxTriggerActivationEntry.RISINGEDGE,
+                                     "entries": [(GxTriggerActivationEntry.FALLINGEDGE, "FallingEdge"),
+                                                 (GxTriggerActivationEntry.RISINGEDGE, "RisingEdge")]},
+            "TriggerDelay":         {"type": "float", "unit": "us", "min": 0.0, "max": 3000000.0, "value": 0.0},
+            "TriggerSoftware":      {"type": "command"},
+            "LineSelector":         {"type": "enum", "value": GxLineSelectorEntry.LINE0,
+                                     "entries": [(GxLineSelectorEntry.LINE0, "Line0"), (GxLineSelectorEntry.LINE1, "Line1"),
+                                                 (GxLineSelectorEntry.LINE2, "Line2"), (GxLineSelectorEntry.LINE3, "Line3")]},
+            "LineMode":             {"type": "enum", "value": GxLineModeEntry.INPUT,
+                                     "entries": [(GxLineModeEntry.INPUT, "Input"), (GxLineModeEntry.OUTPUT, "Output")]},
+            "LineSource":           {"type": "enum", "value": GxLineSourceEntry.OFF,
+                                     "entries": [(GxLineSourceEntry.OFF, "Off"), (GxLineSourceEntry.STROBE, "Strobe"),
+                                                 (GxLineSourceEntry.EXPOSURE_ACTIVE, "ExposureActive")]},
+            "DeviceLinkThroughputLimitMode": {"type": "enum", "value": GxSwitchEntry.ON, "entries": switch},
+            "DeviceLinkThroughputLimit": {"type": "int", "min": 8000000, "max": SIMULATED_THROUGHPUT_LIMIT_MAX,
+                                          "inc": 8, "value": SIMULATED_THROUGHPUT_LIMIT_MAX},
+            "DeviceReset":          {"type": "command"},
+            "AcquisitionStart":     {"type": "command"},
+            "AcquisitionStop":      {"type": "command"},
+            "TimestampLatch":       {"type": "command"},
+            "TimestampLatchValue":  {"type": "int", "access": "RO", "min": 0, "max": UNSIGNED_LONG_LONG_MAX, "value": 0},
+        }
+        if _bayer_pattern(pixel_format) is not None:
+            nodes["BalanceWhiteAuto"] = {"type": "enum", "value": GxAutoEntry.OFF,
+                                         "entries": [(GxAutoEntry.OFF, "Off"), (GxAutoEntry.CONTINUOUS, "Continuous"),
+                                                     (GxAutoEntry.ONCE, "Once")]}
+        return nodes
+
+    def __exposure_limits(self):
+        if self.__node_map.value("ExposureTimeMode") == GxExposureTimeModeEntry.ULTRASHORT:
+            return 1.0, 20.0
+        return 20.0, 1000000.0
+
+    def __on_command(self, feature_name):
+        if feature_name == "TriggerSoftware":
+            if self.is_trigger_mode() and self.__node_map.symbolic("TriggerSource") == "Software":
+                start_time = time.perf_counter_ns() + int(self.__node_map.value("TriggerDelay") * 1000)
+                burst = self.__node_map.value("TriggerSelector") == GxTriggerSelectorEntry.FRAME_BURST_START
+                self.__acquisition.trigger(start_time, self.__node_map.value("AcquisitionBurstFrameCount") if burst else 1)
+        elif feature_name == "TimestampLatch":
+            self.__node_map.store("TimestampLatchValue", self.get_device_time(time.perf_counter_ns()))
+        elif feature_name == "AcquisitionStart":
+            self.__node_map.streaming = True
+            self.__acquisition.start()
+        elif feature_name == "AcquisitionStop":
+            self.__acquisition.stop()
+            self.__node_map.streaming = False
+        elif feature_name == "DeviceReset":
+            self.__acquisition.stop()
+            self.__node_map.streaming = False
+            self.__node_map.reset()
+
+    def get_device_time(self, host_time):
+        """
+        :brief      Device clock in ns at a host perf_counter_ns
+        """
+        return host_time + self.__clock_offset
+
+    def get_frame_rate(self):
+        """
+        :brief      Frame rate the sensor runs at with the current exposure and frame rate settings
+        """
+        frame_rate = self.__max_frame_rate
+        if self.__node_map.value("AcquisitionFrameRateMode") == GxSwitchEntry.ON:
+            frame_rate = min(frame_rate, self.__node_map.value("AcquisitionFrameRate"))
+        return min(frame_rate, 1e6 / self.__node_map.value("ExposureTime"))
+
+    def is_trigger_mode(self):
+        return self.__node_map.value("TriggerMode") == GxSwitchEntry.ON
+
+    def get_image_format(self):
+        """
+        :brief      (width, height, pixel_format) of the frames
+        """
+        return self.__node_map.value("Width"), self.__node_map.value("Height"), self.__node_map.value("PixelFormat")
+
+    def get_payload_size(self):
+        width, height, pixel_format = self.get_image_format()
+        return width * height * (1 if pixel_format & PIXEL_BIT_MASK == GX_PIXEL_8BIT else 2)
+
+    def get_stream_number(self):
+        """
+        :brief      Get the number of stream channels supported by the current device.
+        :return:    the number of stream channels
+        """
+        return len(self.data_stream)
+
+    def get_stream(self, stream_index):
+        """
+        :brief      Get stream object
+        :param stream_index:    stream index
+        :return: stream object
+        """
+        if not isinstance(stream_index, INT_TYPE):
+            raise ParameterTypeError("Device.get_stream: "
+                                     "Expected stream_index type is int, not %s" % type(stream_index))
+
+        if stream_index < 1 or len(self.data_stream) < stream_index:
+            raise NotFoundDevice("Device.get_stream: invalid index")
+        return self.data_stream[stream_index - 1]
+
+    def get_remote_device_feature_control(self):
+        """
+        :brief      Get remote device layer feature control object
+        :return:    Remote device layer feature control object
+        """
+        return FeatureControl(self.__dev_handle)
+
+    def stream_on(self, stream_index=0):
+        """
+        :brief      send start command, camera start transmission image data
+        :return:    none
+        """
+        payload_size = self.data_stream[0].get_payload_size()
+        self.data_stream[0].set_payload_size(payload_size)
+        status = gx_feature_send_command(self.__dev_handle, "AcquisitionStart")
+        StatusProcessor.process(status, 'Device', 'stream_on')
+        self.data_stream[0].set_acquisition_flag(True)
+
+    def stream_off(self, stream_index=0):
+        """
+        :brief      send stop command, camera stop transmission image data
+        :return:    none
+        """
+        status = gx_feature_send_command(self.__dev_handle, "AcquisitionStop")
+        StatusProcessor.process(status, 'Device', 'stream_off')
+        self.data_stream[0].set_acquisition_flag(False)
+
+    def close_device(self):
+        """
+        :brief      close device, close device handle
+        :return:    None
+        """
+        self.__acquisition.stop()
+        self.data_stream[0].set_acquisition_flag(False)
+        gx_close_simulated_handle(self.__stream_handle)
+        gx_close_simulated_handle(self.__dev_handle)
+
+
+class SimulatedDeviceManager(object):
+    def __init__(self):
+        """
+        :brief  DeviceManager enumerating the simulated devices configured by GXIPY_SIMULATOR
+        """
+        self.__config = get_simulator_config()
+        self.__device_num = 0
+        self.__device_info_list = []
+
+    def __create_device_info_list(self):
+        config = self.__config
+        pixel_format = getattr(GxPixelFormatEntry, config["pixel_format"])
+        model = config["model"] or "MER2-SIM-%dx%d%s" % (config["width"], config["height"],
+                                                          "C" if _bayer_pattern(pixel_format) else "M")
+        device_info_list = []
+        for i in range(config["cameras"]):
+            device_info_list.append({
+                'index': i + 1,
+                'vendor_name': "Simulated",
+                'model_name': model,
+                'sn': "SIM%05d" % (i + 1),
+                'display_name': "%s(SIM%05d)" % (model, i + 1),
+                'device_id': "SIM%05d" % (i + 1),
+                'user_id': "",
+                'access_status': GxAccessStatus.READWRITE,
+                'device_class': GxDeviceClassList.U3V,
+                'mac': "", 'ip': "", 'subnet_mask': "", 'gateway': "",
+                'nic_mac': "", 'nic_ip': "", 'nic_subnet_mask': "", 'nic_gateWay': "", 'nic_description': "",
+            })
+        return device_info_list
+
+    def update_device_list(self, timeout=200):
+        """
+        :brief      enumerate the simulated devices
+        :param      timeout:    Enumeration timeout, ignored
+        :return:    dev_num:    device number
+                    device_info_list: all device info list
+        """
+        self.__device_info_list = self.__create_device_info_list()
+        self.__device_num = len(self.__device_info_list)
+        return self.__device_num, self.__device_info_list
+
+    def update_all_device_list(self, timeout=200):
+        """
+        :brief      enumerate the simulated devices
+        :param      timeout:    Enumeration timeout, ignored
+        :return:    dev_num:    device number
+                    device_info_list: all device info list
+        """
+        return self.update_device_list(timeout)
+
+    def get_device_number(self):
+        """
+        :brief      Get device number
+        :return:    device number
+        """
+        return self.__device_num
+
+    def get_device_info(self):
+        """
+        :brief      Get all device info
+        :return:    info_dict:      device info list
+        """
+        return self.__device_info_list
+
+    def open_device_by_index(self, index, access_mode=GxAccessMode.CONTROL):
+        """
+        :brief      open device by index
+        :param      index:          device index must start from 1
+        :param      access_mode:    the access of open device
+        :return:    SimulatedDevice object
+        """
+        if not isinstance(index, INT_TYPE):
+            raise ParameterTypeError("DeviceManager.open_device_by_index: "
+                                     "Expected index type is int, not %s" % type(index))
+
+        if index < 1 or index > self.__device_num:
+            raise NotFoundDevice("DeviceManager.open_device_by_index: invalid index")
+
+        return SimulatedDevice(self.__device_info_list[index - 1], self.__config, index)
+
+    def open_device_by_sn(self, sn, access_mode=GxAccessMode.CONTROL):
+        """
+        :brief      open device by serial number(SN)
+        :param      sn:             device serial number, type: str
+        :param      access_mode:    the mode of open device
+        :return:    SimulatedDevice object
+        """
+        for device_info in self.__device_info_list:
+            if device_info['sn'] == sn:
+                return self.open_device_by_index(device_info['index'], access_mode)
+        raise NotFoundDevice("DeviceManager.open_device_by_sn: Does not found the device")
+
+    def create_image_format_convert(self):
+        """
+        :brief      create new convert pointer
+        :return:    SimulatedImageFormatConvert
+        """
+        return SimulatedImageFormatConvert()
+
+
+class SimulatedImageFormatConvert:
+    def __init__(self):
+        """
+        :brief  ImageFormatConvert in NumPy: Bayer demosaicing (OpenCV when it is installed, else
+                2x2 neighbourhood) and reduction of 10/12 bit data to 8 bit by the valid bits
+        """
+        self.alpha_value = 255
+        self.image_pixel_format_des = GxPixelFormatEntry.UNDEFINED
+        self.interpolation_type = DxBayerConvertType.NEIGHBOUR
+        self.valid_bits = DxValidBit.BIT0_7
+
+    def set_dest_format(self, dest_pixel_format):
+        """
+        :brief      set desired pixel format
+        :param:    dest_pixel_format(desired pixel format)
+        """
+        if not (isinstance(dest_pixel_format, INT_TYPE)):
+            raise ParameterTypeError("dest_pixel_format must to be GxPixelFormatEntry's element.")
+
+        if dest_pixel_format not in (GxPixelFormatEntry.MONO8, GxPixelFormatEntry.RGB8, GxPixelFormatEntry.BGR8):
+            raise UnexpectedError("dx_image_format_convert_set_output_pixel_format failure, Error code:%s"
+                                  % hex(DxStatus.STATUS_NOT_SUPPORTED).__str__())
+        self.image_pixel_format_des = dest_pixel_format
+
+    def get_dest_format(self):
+        """
+        :brief     get desired pixel format
+        """
+        return self.image_pixel_format_des
+
+    def set_interpolation_type(self, cvt_type):
+        """
+        :brief  set the conversion algorithm
+        :param  cvt_type：conversion algorithm       [in] deault: DxBayerConvertType.NEIGHBOUR
+        """
+        if not isinstance(cvt_type, INT_TYPE):
+            raise ParameterTypeError("cc_type param must be int in DxRGBChannelOrder")
+        self.interpolation_type = cvt_type
+
+    def get_interpolation_type(self):
+        """
+        :brief   get the conversion algorithm
+        """
+        return self.interpolation_type
+
+    def set_alpha_value(self, alpha_value):
+        """
+        :brief  Sets the Alpha value for images with Alpha channels
+        :param  alpha_value: alpha value,range 0~255 deault 255
+        """
+        if not isinstance(alpha_value, INT_TYPE):
+            raise ParameterTypeError("alpha_value param must be int type.")
+
+        if alpha_value < 0 or alpha_value > 255:
+            raise InvalidParameter("DX_PARAMETER_OUT_OF_BOUND")
+        self.alpha_value = alpha_value
+
+    def get_alpha_value(self):
+        """
+        :brief  Gets the Alpha value for images with Alpha channels
+        """
+        return self.alpha_value
+
+    def set_valid_bits(self, valid_bits):
+        """
+        :brief Set valid Bits
+        :param  valid_bits, refer to DxValidBit
+        """
+        if not isinstance(valid_bits, INT_TYPE):
+            raise ParameterTypeError("valid_bits param must be int in DxValidBit element.")
+        self.valid_bits = valid_bits
+
+    def get_valid_bits(self):
+        """
+        :brief  Get valid Bits
+        """
+        return self.valid_bits
+
+    def get_buffer_size_for_conversion_ex(self, width, height, pixel_format):
+        """
+        :brief  Calculating Buffer size for conversion
+        :param  pixel_format    [in]   Pixel Format
+        :param  width           [in]   Image Width
+        :param  height          [in]   Image Height
+        :return image buffer size
+        """
+        if not isinstance(width, INT_TYPE):
+            raise ParameterTypeError("width param must be int type.")
+
+        if not isinstance(height, INT_TYPE):
+            raise ParameterTypeError("height param must be int type.")
+
+        if pixel_format in (GxPixelFormatEntry.RGB8, GxPixelFormatEntry.BGR8):
+            return width * height * 3
+        if pixel_format & PIXEL_BIT_MASK == GX_PIXEL_8BIT:
+            return width * height
+        return width * height * 2
+
+    def get_buffer_size_for_conversion(self, raw_image):
+        """
+        :brief  Calculating Buffer size for conversion
+        :param  raw_image       [in]   Image in
+        :return image buffer size
+        """
+        if not isinstance(raw_image, RawImage):
+            raise ParameterTypeError("raw_image param must be RawImage type")
+
+        return self.get_buffer_size_for_conversion_ex(raw_image.get_width(), raw_image.get_height(),
+                                                      self.image_pixel_format_des)
+
+    def __convert_array(self, source, pixel_format, output, flip):
+        if source.dtype != numpy.uint8:
+            # The valid bits name the lowest bit kept, e.g. BIT4_11 keeps bits 4 to 11 of 12 bit data
+            source = numpy.minimum(source >> self.valid_bits, 255).astype(numpy.uint8)
+
+        pattern = _bayer_pattern(pixel_format)
+        if self.image_pixel_format_des == GxPixelFormatEntry.MONO8:
+            result = source
+        elif pattern is None:
+            result = numpy.repeat(source[:, :, None], 3, axis=2)
+        elif cv2 is not None:
+            to_bgr = self.image_pixel_format_des == GxPixelFormatEntry.BGR8
+            code = getattr(cv2, "COLOR_Bayer%s%s2%s" % (pattern, {"RG": "GB", "GR": "BG", "GB": "RG", "BG": "GR"}[pattern],
+                                                        "BGR" if to_bgr else "RGB"))
+            result = cv2.cvtColor(source, code)
+        else:
+            result = self.__demosaic(source, pattern)
+            if self.image_pixel_format_des == GxPixelFormatEntry.BGR8:
+                result = result[:, :, ::-1]
+
+        if flip:
+            result = result[::-1]
+        numpy.copyto(output.reshape(result.shape), result)
+
+    def __demosaic(self, source, pattern):
+        # Every 2x2 cell gets the red, mean green and blue of the cell
+        height, width = source.shape
+        cells = source[:height // 2 * 2, :width // 2 * 2].reshape(height // 2, 2, width // 2, 2)
+        order = {"RG": "RGGB", "GR": "GRBG", "GB": "GBRG", "BG": "BGGR"}[pattern]
+        planes = {"R": [], "G": [], "B": []}
+        for position, color in enumerate(order):
+            row, column = divmod(position, 2)
+            planes[color].append(cells[:, row, :, column].astype(numpy.uint16))
+        rgb = numpy.stack([planes["R"][0], (planes["G"][0] + planes["G"][1]) // 2, planes["B"][0]], axis=-1)
+        rgb = rgb.astype(numpy.uint8).repeat(2, axis=0).repeat(2, axis=1)
+        result = numpy.zeros((height, width, 3), dtype=numpy.uint8)
+        result[:rgb.shape[0], :rgb.shape[1]] = rgb
+        return result
+
+    def convert_ex(self, input_address, input_width, input_height, src_fixel_format, output_address, output_length, flip):
+        """
+        :brief  Image Format Convert Process
+        :param  input_address       [in]     Image in address
+        :param  input_width         [in]     Image width
+        :param  input_height        [in]     Image height
+        :param  src_fixel_format    [in]     Pixel format of the image in
+        :param  output_address      [in&out] Image out address
+        :param  output_length       [in]     Output Image buffer size
+        :param  flip                [in]     Image flip or not, true:flip false:not flip
+        """
+        if input_address is None or output_address is None:
+            raise ParameterTypeError("input_address or output_address is NULL pointer")
+
+        input_length = self.get_buffer_size_for_conversion_ex(input_width, input_height, src_fixel_format)
+        dtype = numpy.uint8 if src_fixel_format & PIXEL_BIT_MASK == GX_PIXEL_8BIT else numpy.uint16
+        source = numpy.frombuffer((ctypes.c_ubyte * input_length).from_address(input_address), dtype=dtype)
+        self.__convert(source.reshape(input_height, input_width), src_fixel_format, output_address, output_length, flip)
+
+    def convert(self, raw_image, output_address, output_length, flip):
+        """
+        :brief  Image Format Convert Process
+                Bayer and mono frames of 8, 10 and 12 bit to MONO8, RGB8 or BGR8
+        :param  raw_image       [in]     Image in
+        :param  output_address  [in&out] Image out address
+        :param  output_length   [in]     Output Image buffer size
+        :param  flip            [in]     Image flip or not, true:flip false:not flip
+        """
+        if not isinstance(raw_image, RawImage):
+            raise ParameterTypeError("raw_image param must be RawImage type")
+
+        if output_address is None:
+            raise ParameterTypeError("output_address is NULL pointer")
+
+        if not isinstance(output_length, INT_TYPE):
+            raise ParameterTypeError("output_length param must be int type.")
+
+        if not (isinstance(flip, bool)):
+            raise ParameterTypeError("flip must to be  bool type.")
+
+        source = raw_image.get_numpy_array()
+        if source is None:
+            raise UnexpectedError("image_format_convert failure, Error code:%s" % hex(DxStatus.PARAMETER_INVALID).__str__())
+        self.__convert(source, raw_image.get_pixel_format(), output_address, output_length, flip)
+
+    def __convert(self, source, pixel_format, output_address, output_length, flip):
+        height, width = source.shape
+        needed = self.get_buffer_size_for_conversion_ex(width, height, self.image_pixel_format_des)
+        if output_length < needed or self.image_pixel_format_des == GxPixelFormatEntry.UNDEFINED:
+            raise UnexpectedError("image_format_convert failure, Error code:%s"
+                                  % hex(DxStatus.PARAMETER_OUT_OF_BOUND).__str__())
+        output = numpy.frombuffer((ctypes.c_ubyte * needed).from_address(output_address), dtype=numpy.uint8)
+        self.__convert_array(source, pixel_format, output, flip)
@@ -7,7 +7,10 @@ from ctypes import *
 import sys
 import os
 
-if sys.platform == 'linux2' or sys.platform == 'linux':
+if os.environ.get("GXIPY_SIMULATOR", "") not in ("", "0"):
+    # Simulated devices convert images in Python, see gxipy/Simulator.py
+    dll = None
+elif sys.platform == 'linux2' or sys.platform == 'linux':
     if os.path.exists('/usr/lib/libdximageproc.so') : 
         filepath = '/usr/lib/libdximageproc.so'
     else:
@@ -10,3 +10,7 @@ from gxipy.DeviceManager import *
 from gxipy.StatusProcessor import *
 from gxipy.ImageProc import *
 import types
+
+if GXIPY_SIMULATOR:
+    from gxipy.Simulator import SimulatedDeviceManager as DeviceManager
+    from gxipy.Simulator import SimulatedImageFormatConvert as ImageFormatConvert
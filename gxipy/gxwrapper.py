@@ -9,7 +9,13 @@ import os
 
 NODE_FEATURE_RESERVED_16 = 16
 
-if sys.platform == 'linux2' or sys.platform == 'linux':
+# GXIPY_SIMULATOR=1 (or a configuration, see gxipy/Simulator.py) replaces the devices
+# with simulated ones, the library is not loaded and may be missing
+GXIPY_SIMULATOR = os.environ.get("GXIPY_SIMULATOR", "") not in ("", "0")
+
+if GXIPY_SIMULATOR:
+    dll = None
+elif sys.platform == 'linux2' or sys.platform == 'linux':
     try:
         dll = CDLL('/usr/lib/libgxiapi.so')
     except OSError:
@@ -2534,6 +2540,37 @@ if hasattr(dll, "GXQBuf"):
         status = dll.GXQBuf(handle_c, p_frame_buffer)
         return status
 
+if hasattr(dll, "GXDQAllBufs"):
+    def gx_dq_all_bufs(handle, pp_frame_buffer_array, buff_num, time_out = 200):
+        """
+        :brief      Get every image that is ready in the output queue with a single call.
+                    Each returned buffer must be given back with gx_q_buf or gx_queue_all_bufs.
+        :param      handle:                 The handle of the device
+                                            Type: Long, Greater than 0
+        :param      pp_frame_buffer_array:  [out]Array receiving the frame buffer pointers
+                                            Type: (POINTER(GxFrameBuffer) * buff_num)
+        :param      buff_num:               The size of pp_frame_buffer_array
+                                            Type: int, minnum: 1
+        :param      time_out:               The timeout time of capture image.(unit: ms)
+                                            Type: int, minnum: 0
+        :return:    status:                 State return value, See detail in GxStatusList
+                    frame_count:            The number of images that are actually returned
+        """
+        handle_c = c_void_p()
+        handle_c.value = handle
+
+        time_out_c = c_uint()
+        time_out_c.value = time_out
+
+        frame_count_c = c_uint()
+
+        dll.GXDQAllBufs.argtypes = [c_void_p, ctypes.POINTER(ctypes.POINTER(GxFrameBuffer)), c_uint,
+                                    ctypes.POINTER(c_uint), c_uint]
+        dll.GXDQAllBufs.restype = c_int
+
+        status = dll.GXDQAllBufs(handle_c, pp_frame_buffer_array, buff_num, byref(frame_count_c), time_out_c)
+        return status, frame_count_c.value
+
 if hasattr(dll, 'GXFlushQueue'):
     def gx_flush_queue(handle):
         """
@@ -3137,3 +3174,8 @@ def range_check(value, min_value, max_value, inc_value=0):
     elif (inc_value != 0) and (value != int(value / inc_value) * inc_value):
         return False
     return True
+
+
+# The simulated devices answer the gx_* calls in place of the library
+if GXIPY_SIMULATOR:
+    from gxipy.simwrapper import *
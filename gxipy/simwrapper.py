@@ -0,0 +1,408 @@
+#!/usr/bin/python
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+# -*- coding:utf-8 -*-
+
+# The gx_* calls of gxwrapper for GXIPY_SIMULATOR, gxwrapper imports them in place of the library
+# functions so Device, DataStream, FeatureControl and the Feature classes run unchanged on top.
+# A handle stands for the node map of a simulated device or stream and, for streams, the
+# acquisition engine serving the buffer calls, see gxipy/Simulator.py.
+
+import ctypes
+import threading
+from gxipy.gxwrapper import GxStatusList, GxNodeAccessMode, GxFeatureID, GxIntFeatrue, GxEnumFeatrue, \
+    GxFloatFeature, GxStringFeature, string_encoding
+
+SIMULATED_STRING_MAX_LENGTH = 255
+
+# Names of the feature IDs the simulated stream answers through the obsolete Feature classes
+SIMULATED_FEATURE_NAMES = {
+    GxFeatureID.INT_ANNOUNCED_BUFFER_COUNT:         "StreamAnnouncedBufferCount",
+    GxFeatureID.INT_DELIVERED_FRAME_COUNT:          "StreamDeliveredFrameCount",
+    GxFeatureID.INT_LOST_FRAME_COUNT:               "StreamLostFrameCount",
+    GxFeatureID.INT_INCOMPLETE_FRAME_COUNT:         "StreamIncompleteFrameCount",
+    GxFeatureID.INT_DELIVERED_PACKET_COUNT:         "StreamDeliveredPacketCount",
+    GxFeatureID.ENUM_STREAM_BUFFER_HANDLING_MODE:   "StreamBufferHandlingMode",
+}
+
+_handle_lock = threading.Lock()
+_next_handle = [1]
+_node_maps = {}
+_acquisitions = {}
+_last_error = threading.local()
+
+
+class SimulatedDriverError(Exception):
+    def __init__(self, status, message):
+        """
+        :brief  Raised inside the simulated device, the gx_* call returns status and keeps message for gx_get_last_error
+        :param status:      GxStatusList value
+        :param message:     error description
+        """
+        Exception.__init__(self, message)
+        self.status = status
+        self.message = message
+
+
+def gx_open_simulated_handle(node_map, acquisition=None):
+    """
+    :brief      Hand out a handle for a simulated device or stream
+    :param      node_map:       SimulatedNodeMap serving the feature calls
+    :param      acquisition:    SimulatedAcquisition serving the buffer calls, None for devices
+    :return:    handle
+    """
+    with _handle_lock:
+        handle = _next_handle[0]
+        _next_handle[0] += 1
+        _node_maps[handle] = node_map
+        if acquisition is not None:
+            _acquisitions[handle] = acquisition
+    return handle
+
+
+def gx_close_simulated_handle(handle):
+    """
+    :brief      Invalidate a handle from gx_open_simulated_handle
+    :param      handle:     handle
+    :return:    None
+    """
+    with _handle_lock:
+        _node_maps.pop(handle, None)
+        _acquisitions.pop(handle, None)
+
+
+def _call(targets, handle, function):
+    # Runs function(target) on the object behind handle, failures become a status
+    target = targets.get(handle)
+    if target is None:
+        _last_error.value = (GxStatusList.INVALID_HANDLE, "Invalid handle %s" % handle)
+        return GxStatusList.INVALID_HANDLE, None
+    try:
+        return GxStatusList.SUCCESS, function(target)
+    except SimulatedDriverError as error:
+        _last_error.value = (error.status, error.message)
+        return error.status, None
+
+
+def gx_get_last_error(size=1024):
+    """
+    :brief      To get the latest error descriptions information of the program
+    :param      size:           string buff length(size=1024)
+    :return:    status:         State return value, See detail in GxStatusList
+                err_code:       Return the last error code
+                err_content:    the latest error descriptions information of the program
+    """
+    err_code, err_content = getattr(_last_error, "value", (GxStatusList.SUCCESS, ""))
+    return GxStatusList.SUCCESS, err_code, err_content[:size - 1]
+
+
+def gx_get_node_access_mode(handle, feature_name):
+    """
+    :brief      To get the access information of the feature node
+    :return:    status:         State return value
+                feature node access mode
+    """
+    status, access_mode = _call(_node_maps, handle, lambda node_map: node_map.access_mode(feature_name))
+    return status, GxNodeAccessMode.MODE_UNDEF if access_mode is None else access_mode
+
+
+def gx_get_int_feature(handle, feature_name):
+    """
+    :brief      Get int type feature value
+    :return:    status:     State return value
+                int feature info
+    """
+    int_feature_c = GxIntFeatrue()
+    status, int_range = _call(_node_maps, handle, lambda node_map: node_map.get_range(feature_name, "int"))
+    if status == GxStatusList.SUCCESS:
+        int_feature_c.value = int_range["value"]
+        int_feature_c.min = int_range["min"]
+        int_feature_c.max = int_range["max"]
+        int_feature_c.inc = int_range["inc"]
+    return status, int_feature_c
+
+
+def gx_set_int_feature_value(handle, feature_name, feature_value):
+    """
+    :brief      Set int type feature value
+    :return:    status:     State return value
+    """
+    return _call(_node_maps, handle, lambda node_map: node_map.set(feature_name, "int", feature_value))[0]
+
+
+def gx_get_enum_feature(handle, feature_name):
+    """
+    :brief      Get enum type feature info
+    :return:    status:     State return value
+                enum info
+    """
+    enum_feature_c = GxEnumFeatrue()
+    status, enum_range = _call(_node_maps, handle, lambda node_map: node_map.get_enum_range(feature_name))
+    if status != GxStatusList.SUCCESS:
+        return status, enum_feature_c
+
+    current_value, entries = enum_range
+    enum_feature_c.supported_number = len(entries)
+    for index, (value, symbolic) in enumerate(entries):
+        enum_feature_c.supported_value[index].cur_value = value
+        enum_feature_c.supported_value[index].cur_symbolic = string_encoding(symbolic)
+        if value == current_value:
+            enum_feature_c.cur_value.cur_value = value
+            enum_feature_c.cur_value.cur_symbolic = string_encoding(symbolic)
+    return status, enum_feature_c
+
+
+def gx_set_enum_feature_value(handle, feature_name, featue_value):
+    """
+    :brief      Set enum type feature value
+    :return:    status:     State return value
+    """
+    return _call(_node_maps, handle, lambda node_map: node_map.set(feature_name, "enum", featue_value))[0]
+
+
+def gx_set_enum_feature_value_string(handle, feature_name, feature_value):
+    """
+    :brief      Set enum type feature value by its symbolic
+    :return:    status:     State return value
+    """
+    return _call(_node_maps, handle, lambda node_map: node_map.set(feature_name, "enum", feature_value))[0]
+
+
+def gx_get_float_feature(handle, feature_name):
+    """
+    :brief      Get float type feature value
+    :return:    status:     State return value
+                float value
+    """
+    float_feature_c = GxFloatFeature()
+    status, float_range = _call(_node_maps, handle, lambda node_map: node_map.get_range(feature_name, "float"))
+    if status == GxStatusList.SUCCESS:
+        float_feature_c.cur_value = float_range["value"]
+        float_feature_c.min = float_range["min"]
+        float_feature_c.max = float_range["max"]
+        float_feature_c.inc = float_range["inc"]
+        float_feature_c.inc_is_valid = float_range["inc"] != 0
+        float_feature_c.unit = string_encoding(float_range["unit"])
+    return status, float_feature_c
+
+
+def gx_set_float_feature_value(handle, feature_name, featue_value):
+    """
+    :brief      Set float type feature value
+    :return:    status:     State return value
+    """
+    return _call(_node_maps, handle, lambda node_map: node_map.set(feature_name, "float", featue_value))[0]
+
+
+def gx_get_bool_feature(handle, feature_name):
+    """
+    :brief      Get bool type feature value
+    :return:    status:     State return value
+                bool value
+    """
+    status, value = _call(_node_maps, handle, lambda node_map: node_map.get(feature_name, "bool"))
+    return status, bool(value)
+
+
+def gx_set_bool_feature_value(handle, feature_name, featue_value):
+    """
+    :brief      Set bool type feature value
+    :return:    status:     State return value
+    """
+    return _call(_node_maps, handle, lambda node_map: node_map.set(feature_name, "bool", featue_value))[0]
+
+
+def gx_get_string_feature(handle, feature_name):
+    """
+    :brief      Get string type feature info
+    :return:    status:     State return value
+                string info
+    """
+    string_feature_c = GxStringFeature()
+    status, value = _call(_node_maps, handle, lambda node_map: node_map.get(feature_name, "string"))
+    if status == GxStatusList.SUCCESS:
+        string_feature_c.cur_value = string_encoding(value)[:SIMULATED_STRING_MAX_LENGTH]
+        string_feature_c.max_length = SIMULATED_STRING_MAX_LENGTH
+    return status, string_feature_c
+
+
+def gx_set_string_feature_value(handle, feature_name, featue_value):
+    """
+    :brief      Set string type feature value
+    :return:    status:     State return value
+    """
+    if len(string_encoding(featue_value)) > SIMULATED_STRING_MAX_LENGTH:
+        _last_error.value = (GxStatusList.OUT_OF_RANGE, "%s is longer than %d bytes"
+                             % (feature_name, SIMULATED_STRING_MAX_LENGTH))
+        return GxStatusList.OUT_OF_RANGE
+    return _call(_node_maps, handle, lambda node_map: node_map.set(feature_name, "string", featue_value))[0]
+
+
+def gx_feature_send_command(handle, feature_name):
+    """
+    :brief      Send feature command
+    :return:    status:     State return value
+    """
+    return _call(_node_maps, handle, lambda node_map: node_map.send_command(feature_name))[0]
+
+
+def _feature_name(feature_id):
+    feature_name = SIMULATED_FEATURE_NAMES.get(feature_id)
+    if feature_name is None:
+        raise SimulatedDriverError(GxStatusList.NOT_IMPLEMENTED, "Feature %s is not implemented" % hex(feature_id))
+    return feature_name
+
+
+def gx_get_feature_name(handle, feature_id):
+    """
+    :brief      Get the string description for the feature code
+    :return:    status:         State return value, See detail in GxStatusList
+                name:           The string description for the feature code
+    """
+    return _call(_node_maps, handle, lambda node_map: _feature_name(feature_id))
+
+
+def gx_is_implemented(handle, feature_id):
+    """
+    :brief      Inquire the current camera whether support a special feature.
+    :return:    status:         State return value, See detail in GxStatusList
+                is_implemented: To return the result whether is support this feature
+    """
+    status, access_mode = _call(_node_maps, handle, lambda node_map: node_map.access_mode(
+        SIMULATED_FEATURE_NAMES.get(feature_id, "")))
+    return status, access_mode not in (None, GxNodeAccessMode.MODE_NI, GxNodeAccessMode.MODE_UNDEF)
+
+
+def gx_is_readable(handle, feature_id):
+    """
+    :brief      Inquire if a feature code is currently readable
+    :return:    status:             State return value, See detail in GxStatusList
+                is_readable:        To return the result whether the feature code ID is readable
+    """
+    status, access_mode = _call(_node_maps, handle, lambda node_map: node_map.access_mode(_feature_name(feature_id)))
+    return status, access_mode in (GxNodeAccessMode.MODE_RO, GxNodeAccessMode.MODE_RW)
+
+
+def gx_is_writable(handle, feature_id):
+    """
+    :brief      Inquire if a feature code is currently writable
+    :return:    status:             State return value, See detail in GxStatusList
+                is_writeable:       To return the result whether the feature code ID is writable(Bool)
+    """
+    status, access_mode = _call(_node_maps, handle, lambda node_map: node_map.access_mode(_feature_name(feature_id)))
+    return status, access_mode in (GxNodeAccessMode.MODE_WO, GxNodeAccessMode.MODE_RW)
+
+
+def gx_get_int(handle, feature_id):
+    """
+    :brief      Get the current value of the int type feature
+    :return:    status:         State return value, See detail in GxStatusList
+                int_value:      Get the current value of the int type
+    """
+    return _call(_node_maps, handle, lambda node_map: node_map.get(_feature_name(feature_id), "int"))
+
+
+def gx_get_payload_size(handle):
+    """
+    :brief      Get the payload size of the stream
+    :return:    status:         State return value, See detail in GxStatusList
+                payload_size:   Payload size
+    """
+    return _call(_acquisitions, handle, lambda acquisition: acquisition.get_payload_size())
+
+
+def gx_set_acquisition_buffer_number(handle, buffer_num):
+    """
+    :brief      Set the number of acquisition buffers
+    :return:    status:         State return value, See detail in GxStatusList
+    """
+    return _call(_acquisitions, handle, lambda acquisition: acquisition.set_buffer_number(buffer_num))[0]
+
+
+def gx_get_image(handle, frame_data, time_out=200):
+    """
+    :brief      Copy the next frame into frame_data.image_buf and give its buffer back to the ring
+    :param      frame_data:     [out]GxFrameData with image_buf pointing at image_size bytes
+    :return:    status:         State return value, See detail in GxStatusList
+    """
+    def get_image(acquisition):
+        frame_buffers = acquisition.dq(time_out, 1)
+        if not frame_buffers:
+            raise SimulatedDriverError(GxStatusList.TIMEOUT, "GXGetImage timed out")
+        frame_buffer = frame_buffers[0]
+        for name in ("status", "width", "height", "pixel_format", "frame_id", "timestamp", "buf_id"):
+            setattr(frame_data, name, getattr(frame_buffer, name))
+        image_size = min(frame_data.image_size, frame_buffer.image_size)
+        ctypes.memmove(frame_data.image_buf, frame_buffer.image_buf, image_size)
+        frame_data.image_size = image_size
+        acquisition.q(frame_buffer.buf_id)
+
+    return _call(_acquisitions, handle, get_image)[0]
+
+
+def gx_dq_buf(handle, pp_frame_buffer, time_out=200):
+    """
+    :brief      Dequeue the next frame, its buffer stays with the caller until gx_q_buf
+    :param      pp_frame_buffer:[out]ctypes.byref of a POINTER(GxFrameBuffer)
+    :return:    status:         State return value, See detail in GxStatusList
+    """
+    def dq_buf(acquisition):
+        frame_buffers = acquisition.dq(time_out, 1)
+        if not frame_buffers:
+            raise SimulatedDriverError(GxStatusList.TIMEOUT, "GXDQBuf timed out")
+        pp_frame_buffer._obj.contents = frame_buffers[0]
+
+    return _call(_acquisitions, handle, dq_buf)[0]
+
+
+def gx_q_buf(handle, p_frame_buffer):
+    """
+    :brief      Give a dequeued buffer back to the ring
+    :param      p_frame_buffer: POINTER(GxFrameBuffer) from gx_dq_buf or gx_dq_all_bufs
+    :return:    status:         State return value, See detail in GxStatusList
+    """
+    return _call(_acquisitions, handle, lambda acquisition: acquisition.q(p_frame_buffer.contents.buf_id))[0]
+
+
+def gx_dq_all_bufs(handle, pp_frame_buffer_array, buff_num, time_out=200):
+    """
+    :brief      Get every image that is ready in the output queue with a single call.
+    :param      pp_frame_buffer_array:  [out]Array receiving the frame buffer pointers
+    :param      buff_num:               The size of pp_frame_buffer_array
+    :return:    status:                 State return value, See detail in GxStatusList
+                frame_count:            The number of images that are actually returned
+    """
+    def dq_all_bufs(acquisition):
+        frame_buffers = acquisition.dq(time_out, buff_num)
+        if not frame_buffers:
+            raise SimulatedDriverError(GxStatusList.TIMEOUT, "GXDQAllBufs timed out")
+        for index, frame_buffer in enumerate(frame_buffers):
+            pp_frame_buffer_array[index] = ctypes.pointer(frame_buffer)
+        return len(frame_buffers)
+
+    status, frame_count = _call(_acquisitions, handle, dq_all_bufs)
+    return status, frame_count or 0
+
+
+def gx_flush_queue(handle):
+    """
+    :brief      Empty the cache image in the image output queue.
+    :return:    status:     State return value, See detail in GxStatusList
+    """
+    return _call(_acquisitions, handle, lambda acquisition: acquisition.flush())[0]
+
+
+def gx_register_capture_callback(handle, cap_call):
+    """
+    :brief      Register the capture callback function
+    :param      cap_call:       The callback function that the user will register(@ CAP_CALL)
+    :return:    status:         State return value, See detail in GxStatusList
+    """
+    return _call(_acquisitions, handle, lambda acquisition: acquisition.set_capture_callback(cap_call))[0]
+
+
+def gx_unregister_capture_callback(handle):
+    """
+    :brief      Unregister the capture callback function
+    :return:    status:         State return value, See detail in GxStatusList
+    """
+    return _call(_acquisitions, handle, lambda acquisition: acquisition.set_capture_callback(None))[0]
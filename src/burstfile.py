@@ -0,0 +1,168 @@
+import os
+import re
+import json
+import struct
+import numpy as np
+import cv2
+from src.framestore import DemosaicCache, isBayerFormat
+
+BURST_MAGIC = b"CAMBURST"
+BURST_VERSION = 1
+BURST_EXTENSION = ".burst"
+TRIGGER_PRESET_FILE = "Trigger_preset.json"
+HEADER_ALIGNMENT = 4096
+
+# Layout: magic, <version, header length> as little endian uint32, JSON header,
+# padding up to HEADER_ALIGNMENT, then every frame back to back in C order.
+_PREFIX = struct.Struct("<II")
+
+
+def writeBurst(path, frames, timestamps, frameIds=None, pixelFormat=None, preset=None, droppedFrameIds=None):
+    frames = np.ascontiguousarray(frames)
+    if frames.ndim not in (3, 4):
+        raise ValueError(f"Expected a (frames, height, width[, channels]) array, got shape {frames.shape}")
+
+    count, height, width = frames.shape[:3]
+    channels = frames.shape[3] if frames.ndim == 4 else 1
+    header = {
+        "frameCount" : count,
+        "width" : width,
+        "height" : height,
+        "channels" : channels,
+        "dtype" : frames.dtype.str,
+        "pixelFormat" : pixelFormat or ("RGB8" if channels == 3 else "MONO8"),
+        "timestamps" : [float(timestamp) for timestamp in timestamps[:count]],
+        "frameIds" : [int(frameId) for frameId in (frameIds or [])[:count]],
+        "preset" : preset or {},
+        # Frames captured but left out because they could not be converted
+        "droppedFrameIds" : [int(frameId) for frameId in (droppedFrameIds or [])],
+    }
+    headerBytes = json.dumps(header).encode("utf-8")
+    headerEnd = len(BURST_MAGIC) + _PREFIX.size + len(headerBytes)
+    padding = -headerEnd % HEADER_ALIGNMENT
+
+    with open(path, "wb") as file:
+        file.write(BURST_MAGIC)
+        file.write(_PREFIX.pack(BURST_VERSION, len(headerBytes)))
+        file.write(headerBytes)
+        file.write(b"\0" * padding)
+        file.write(memoryview(frames).cast("B"))
+    return path
+
+
+def readBurstHeader(path):
+    with open(path, "rb") as file:
+        if file.read(len(BURST_MAGIC)) != BURST_MAGIC:
+            raise ValueError(f"{path} is not a burst file")
+        version, headerLength = _PREFIX.unpack(file.read(_PREFIX.size))
+        if version != BURST_VERSION:
+            raise ValueError(f"Unsupported burst version {version} in {path}")
+        header = json.loads(file.read(headerLength).decode("utf-8"))
+    headerEnd = len(BURST_MAGIC) + _PREFIX.size + headerLength
+    header["dataOffset"] = headerEnd + (-headerEnd % HEADER_ALIGNMENT)
+    return header
+
+
+# View of a burst file. Frames are pages of a numpy.memmap, nothing is decoded
+# or read until a frame is actually touched.
+class BurstFile:
+    def __init__(self, path):
+        self.path = path
+        self.header = readBurstHeader(path)
+        self.timestamps = self.header["timestamps"]
+        self.frameIds = self.header["frameIds"]
+        self.preset = self.header["preset"]
+        self.droppedFrameIds = self.header.get("droppedFrameIds", [])
+        self.pixelFormat = self.header["pixelFormat"]
+        self.cache = DemosaicCache(self.pixelFormat) if isBayerFormat(self.pixelFormat) else None
+
+        shape = (self.header["frameCount"], self.header["height"], self.header["width"])
+        if self.header["channels"] > 1:
+            shape += (self.header["channels"],)
+        # Copy-on-write keeps the buffers writable for QImage without ever touching the file
+        self.frames = np.memmap(path, dtype=np.dtype(self.header["dtype"]), mode="c",
+                                offset=self.header["dataOffset"], shape=shape)
+
+    def asArray(self):
+        return self.frames
+
+    def clear(self):
+        self.frames = np.empty((0,), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if self.cache is None:
+            return self.frames[index]
+        if index < 0:
+            index += len(self)
+        return self.cache.get(index, self.frames[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+# Capture directories written before the burst container existed hold one file per frame
+# named Frame<n>__T<timestamp> µs.<ext>. Frames are decoded on access.
+_FRAME_FILE = re.compile(r"^Frame(\d+)__T(.+) µs\.(png|tiff|npy)$")
+
+
+class FrameDirectory:
+    def __init__(self, path):
+        self.path = path
+        entries = []
+        for name in os.listdir(path):
+            match = _FRAME_FILE.match(name)
+            if match:
+                entries.append((int(match.group(1)), float(match.group(2)), name))
+        entries.sort()
+        self.files = [os.path.join(path, name) for _, _, name in entries]
+        self.timestamps = [timestamp for _, timestamp, _ in entries]
+        # The trigger preset is saved next to the frames, the burst container keeps it in its header
+        self.preset = {}
+        presetPath = os.path.join(path, TRIGGER_PRESET_FILE)
+        if os.path.exists(presetPath):
+            with open(presetPath, encoding="utf-8") as file:
+                self.preset = json.load(file)
+
+    def clear(self):
+        self.files = []
+        self.timestamps = []
+
+    def __len__(self):
+        return len(self.files)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        path = self.files[index]
+        if path.endswith(".npy"):
+            return np.load(path)
+        image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"Could not decode {path}")
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return image
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+def openCapture(path):
+    # Accepts a burst file, a capture directory, or any frame file inside a capture directory
+    if os.path.isfile(path) and path.endswith(BURST_EXTENSION):
+        return BurstFile(path)
+    directory = path if os.path.isdir(path) else os.path.dirname(path)
+    burstPath = os.path.join(directory, "Burst" + BURST_EXTENSION)
+    if os.path.exists(burstPath):
+        return BurstFile(burstPath)
+    capture = FrameDirectory(directory)
+    if not len(capture):
+        raise ValueError(f"No captured frames found in {directory}")
+    return capture
@@ -1,7 +1,22 @@
 import gxipy as gx
 from PIL import Image
+from src.framestore import FrameStore, RawFrameStore, isBayerFormat
+from src.saver import FrameSaver
+from src.synccapture import ACTION_TRIGGER_SOURCE
+from src.telemetry import STREAM_COUNTERS
 from threading import Event
+from concurrent.futures import ThreadPoolExecutor
 import json
+import time
+
+# Preset entries written to device features of the same name
+DEVICE_SETTINGS = ("Width" , "Height" , "OffsetX" , "OffsetY" , "ExposureTime" , "FrameRate" , "Gain" , "TriggerDelay")
+# Features the device accepts only while acquisition is stopped
+STREAM_LOCKED_FEATURES = ("Width" , "Height" , "ExposureTimeMode")
+# Exposures below this many microseconds need the UltraShort exposure mode
+ULTRA_SHORT_EXPOSURE = 20
+# Per camera startup phases timed by CameraControl
+STARTUP_PHASES = ("open" , "featureInit" , "presetApply")
 
 
 class PresetManager:
@@ -38,34 +53,108 @@ class PresetManager:
 
 
 
+def getPixelFormatName(pixelFormat):
+    for name, value in vars(gx.GxPixelFormatEntry).items():
+        if value == pixelFormat and not name.startswith("_"):
+            return name
+    return None
+
+
+class ConversionContext:
+    def __init__(self, imageConvert, getValidBits, poolSize=3):
+        # Not thread safe: every converting thread needs its own context and imageConvert
+        self.imageConvert = imageConvert
+        self.getValidBits = getValidBits
+        self.poolSize = poolSize
+        self.key = None
+        self.bufferSize = 0
+        self.buffers = []
+        self.nextBuffer = 0
+        self.cacheHits = 0
+        self.cacheMisses = 0
+
+    def configure(self, key, rawImage):
+        width, height, sourceFormat, destFormat = key
+        self.imageConvert.set_dest_format(destFormat)
+        self.imageConvert.set_valid_bits(self.getValidBits(sourceFormat))
+        self.bufferSize = self.imageConvert.get_buffer_size_for_conversion(rawImage)
+        self.buffers = [gx.numpy.empty(self.bufferSize, dtype=gx.numpy.ubyte) for _ in range(self.poolSize)]
+        self.nextBuffer = 0
+        self.key = key
+
+    def convert(self, rawImage, destFormat):
+        frameData = rawImage.frame_data
+        key = (frameData.width, frameData.height, frameData.pixel_format, destFormat)
+        if key == self.key:
+            self.cacheHits += 1
+        else:
+            self.cacheMisses += 1
+            self.configure(key, rawImage)
+
+        # Buffers are recycled round robin, callers that keep the result must copy it
+        outputBuffer = self.buffers[self.nextBuffer]
+        self.nextBuffer = (self.nextBuffer + 1) % self.poolSize
+        self.imageConvert.convert(rawImage, outputBuffer.ctypes.data, self.bufferSize, False)
+        return outputBuffer, self.bufferSize
+
+    def getStatistics(self):
+        return {
+            "hits" : self.cacheHits,
+            "misses" : self.cacheMisses,
+            "bufferSize" : self.bufferSize,
+            "poolSize" : self.poolSize,
+        }
+
+
+# Devices are opened and initialized concurrently, every camera spends most of its startup
+# waiting for feature round trips. A camera that fails is closed and reported in failures,
+# the others start regardless.
 class CameraControl:
-    def __init__(self):
+    def __init__(self , workers=None):
         self.devices:list[str] = []
         self.cams= []
         self.cameras:list[Camera] = []
+        self.failures = []
+        self.startupTimes = {}
 
+        startupStart = time.perf_counter()
         self.deviceManager = gx.DeviceManager()
         dev_num, dev_info_list = self.deviceManager.update_device_list()
-
-
+        self.startupTimes["enumerate"] = time.perf_counter() - startupStart
 
         if dev_num == 0:
             print("No available devices")
             raise Exception("No available devices")
-        else:
-            for i in range(dev_num):
-                self.devices.append(dev_info_list[i].get("model_name"))
-                cam = self.deviceManager.open_device_by_index(i+1)
-                self.cams.append(cam)
-
-                
-        for i in range(len(self.cams)):
-            cam = self.cams[i]
-            
-            device = self.devices[i]
-            print(f"Device {i+1}: {device}")  
-            model = device
-            
+
+        models = [dev_info_list[i].get("model_name") for i in range(dev_num)]
+        with ThreadPoolExecutor(max_workers=workers or dev_num , thread_name_prefix="CameraStartup") as executor:
+            futures = [executor.submit(self._startCamera , i , model) for i , model in enumerate(models)]
+            results = [future.result() for future in futures]
+
+        for i , (model , cam , camera , error) in enumerate(results):
+            if error is not None:
+                print(f"Device {i+1}: {model} failed to start: {error}")
+                self.failures.append((i , model , error))
+                continue
+            print(f"Device {i+1}: {model}")
+            self.devices.append(model)
+            self.cams.append(cam)
+            self.cameras.append(camera)
+
+        self.startupTimes["total"] = time.perf_counter() - startupStart
+        self.printStartupReport()
+
+        if not self.cameras:
+            raise Exception("No camera could be started")
+
+    def _startCamera(self , index , model):
+        cam = None
+        camera = None
+        try:
+            openStart = time.perf_counter()
+            cam = self.deviceManager.open_device_by_index(index+1)
+            openTime = time.perf_counter() - openStart
+
             type = (
                 "MER3" if "MER3" in model else
                 "MER2" if "MER2" in model else
@@ -73,9 +162,25 @@ class CameraControl:
                 model.upper())
             image_convert = self.deviceManager.create_image_format_convert()
             camera = Camera(cam , type , image_convert , model)
-            self.cameras.append(camera)
-
-        
+            camera.startupTimes["open"] = openTime
+            if camera.initError is not None:
+                raise camera.initError
+            return model , cam , camera , None
+        except Exception as e:
+            if camera is not None:
+                camera.frameSaver.shutdown()
+            if cam is not None:
+                try:
+                    cam.close_device()
+                except Exception as closeError:
+                    print(f"Error closing {model}: {closeError}")
+            return model , None , None , e
+
+    def printStartupReport(self):
+        print(f"Startup: enumerate {self.startupTimes['enumerate']*1000:.0f} ms, total {self.startupTimes['total']*1000:.0f} ms")
+        for i , camera in enumerate(self.cameras):
+            phases = ", ".join(f"{phase} {camera.startupTimes[phase]*1000:.0f} ms" for phase in STARTUP_PHASES if phase in camera.startupTimes)
+            print(f"  Camera {i+1} ({camera.model}): {phases}")
 
 
 class Camera:
@@ -96,16 +201,20 @@ class Camera:
         self.FramesCaptured = 0
         self.FramesQuantity = 10
         self.timeout = 12.0
+        self.framePoolSize = 64
 
         self.crosshairEnabled = False
         self.flipHorEnabled = False
         self.flipVerEnabled = False
         self.imageAngle =0 
 
-        self.images:list[Image.Image] =[]
-        self.rawImages:list = []
+        self.frameStore = FrameStore()
+        self.rawStorage = False
+        self.frameSaver = FrameSaver()
         self.timestamps:list[float] = []
-        self.numpyImages:list = []
+        self.startupTimes = {}
+        self.initError = None
+        self.missingStreamCounters = set()
 
         self.settings = ["Width" , "Height" , "OffsetX" , "OffsetY" ,"FrameRate", "ExposureTime" , "Gain" , "TriggerDelay" , "FramesQuantity"]
 
@@ -119,10 +228,14 @@ class Camera:
 
     def _initDevice(self , cam , type , image_convert):
         try: 
+            initStart = time.perf_counter()
             self.cam = cam
             self.type = type
             self.image_convert = image_convert
+            self.conversionContext = ConversionContext(image_convert , self.get_best_valid_bits)
             self.FeatureControl = self.cam.get_remote_device_feature_control()
+            # Ranges, access modes and written values are remembered so unchanged settings cost no round trip
+            self.featureCache = self.FeatureControl.enable_feature_cache()
             self.Width = self.FeatureControl.get_int_feature("Width")
             self.Height = self.FeatureControl.get_int_feature("Height")
             self.ExposureTime = self.FeatureControl.get_float_feature("ExposureTime")
@@ -148,11 +261,21 @@ class Camera:
             self.DeviceLinkThroughputLimitMode.set("OFF")
             self.DeviceReset = self.FeatureControl.get_command_feature("DeviceReset")
 
+            # Nodes used by synchronized capture, None on models without them
+            self.isGev = isinstance(cam , gx.GEVDevice)
+            self.TimestampLatch = self._getOptionalFeature(self.FeatureControl.get_command_feature , "TimestampLatch")
+            self.TimestampLatchValue = self._getOptionalFeature(self.FeatureControl.get_int_feature , "TimestampLatchValue")
+            self.PtpEnable = self._getOptionalFeature(self.FeatureControl.get_bool_feature , "PtpEnable")
+            self.ActionDeviceKey = self._getOptionalFeature(self.FeatureControl.get_int_feature , "ActionDeviceKey")
+            self.ActionGroupKey = self._getOptionalFeature(self.FeatureControl.get_int_feature , "ActionGroupKey")
+            self.ActionGroupMask = self._getOptionalFeature(self.FeatureControl.get_int_feature , "ActionGroupMask")
+
             if self.type != "MER":
                 self.AcquisitionBurstFrameCount = self.FeatureControl.get_int_feature("AcquisitionBurstFrameCount")
                 self.ExposureTimeMode = self.FeatureControl.get_enum_feature("ExposureTimeMode")
 
-            self.pixelFormats = self.FeatureControl.get_enum_feature("PixelFormat").get_range()
+            self.PixelFormat = self.FeatureControl.get_enum_feature("PixelFormat")
+            self.pixelFormats = self.PixelFormat.get_range()
 
             for pixelFormat in self.pixelFormats:
                 if gx.Utility.is_gray(pixelFormat['value']):
@@ -190,30 +313,74 @@ class Camera:
 
             self.presetManager.changePreset("trigger" , trigger_preset)
 
+            presetStart = time.perf_counter()
+            self.startupTimes["featureInit"] = presetStart - initStart
             self.applyPreset(default_preset)
             self.defaultSettings()
+            self.startupTimes["presetApply"] = time.perf_counter() - presetStart
         except Exception as e:
+            self.initError = e
             print(f"{str(e)}")
     
     def getRawImage(self) :
         return self.cam.data_stream[0].get_image()
 
-    def convertRawImage(self , rawImage):
+    def acquireFrame(self , timeout=1000):
+        return self.cam.data_stream[0].acquire_frame(timeout)
+
+    def enableFramePool(self):
+        self.cam.data_stream[0].enable_buffer_pool(self.framePoolSize)
+
+    def disableFramePool(self):
+        self.cam.data_stream[0].disable_buffer_pool()
+
+    def getRawImages(self , maxFrames , timeout=1000):
+        # Views of the pool buffers, each one must be released once it has been stored
+        return self.cam.data_stream[0].dequeue_batch(maxFrames , timeout)
+
+    def createConversionContext(self):
+        return ConversionContext(gx.ImageFormatConvert() , self.get_best_valid_bits)
+
+    def convertRawImage(self , rawImage , copy=False , context=None):
         height = rawImage.frame_data.height
         width = rawImage.frame_data.width
         if not self.colored:
-            mono_image_array, mono_image_buffer_length = self.convert_to_special_pixel_format(rawImage, gx.GxPixelFormatEntry.MONO8)
+            mono_image_array, mono_image_buffer_length = self.convert_to_special_pixel_format(rawImage, gx.GxPixelFormatEntry.MONO8, context)
             if mono_image_array is None:
                 return
-            numpy_image = gx.numpy.frombuffer( mono_image_array, dtype=gx.numpy.ubyte, count=mono_image_buffer_length).reshape(height, width)
+            numpy_image = mono_image_array[:mono_image_buffer_length].reshape(height, width)
             
         else:
-            rgb_image_array, rgb_image_buffer_length = self.convert_to_special_pixel_format(rawImage, gx.GxPixelFormatEntry.RGB8)
+            rgb_image_array, rgb_image_buffer_length = self.convert_to_special_pixel_format(rawImage, gx.GxPixelFormatEntry.RGB8, context)
             if rgb_image_array is None:
                 return None
-            numpy_image = gx.numpy.frombuffer(rgb_image_array, dtype=gx.numpy.ubyte, count=rgb_image_buffer_length).reshape(height, width, 3)
+            numpy_image = rgb_image_array[:rgb_image_buffer_length].reshape(height, width, 3)
+        if copy:
+            return numpy_image.copy()
         return numpy_image
 
+    def supportsRawStorage(self):
+        # Packed 10/12 bit Bayer data has no numpy layout to demosaic from, it is converted while capturing
+        if not self.colored:
+            return False
+        return isBayerFormat(getPixelFormatName(self.PixelFormat.get()[0]))
+
+    def createFrameStore(self):
+        # Bayer frames can be kept undemosaiced and converted only when they are looked at
+        if self.rawStorage and self.supportsRawStorage():
+            return RawFrameStore(self.FramesQuantity)
+        if self.rawStorage:
+            print(f"{self.model}: raw storage needs an unpacked Bayer format, the burst is converted instead")
+        return FrameStore(self.FramesQuantity)
+
+    def storeFrame(self , rawImage , context=None):
+        frameStore = self.frameStore
+        if isinstance(frameStore , RawFrameStore):
+            if frameStore.pixelFormat is None:
+                frameStore.setPixelFormat(getPixelFormatName(rawImage.get_pixel_format()))
+            return rawImage.get_numpy_array()
+        return self.convertRawImage(rawImage , context=context)
+
     def getImage(self , numpyImage) :
         if not self.colored:
             return Image.fromarray(numpyImage, "L")
@@ -240,60 +407,96 @@ class Camera:
 
 
 
-    def applyPreset(self, preset):
-        self.OffsetX.set(0)
-        self.OffsetY.set(0)
+    def isStreaming(self):
+        return self.cam.data_stream[0].acquisition_flag
 
-        self.Width.set(preset["Width"])
-        self.Height.set(preset["Height"])
+    def readSetting(self , name):
+        value = getattr(self , name).get()
+        # Enum features report (value, symbolic)
+        return value[1] if isinstance(value , tuple) else value
 
-        if self.type != "MER":
-            if preset["ExposureTime"] < 20:
-                self.ExposureTimeMode.set("UltraShort")
-            else:
-                self.ExposureTimeMode.set("Standard")
+    def planSettings(self , settings):
+        # Features that differ from the device, in an order the device accepts
+        targets = {name : settings[name] for name in DEVICE_SETTINGS if name in settings}
+        if "ExposureTime" in targets and self.type != "MER":
+            targets["ExposureTimeMode"] = "UltraShort" if targets["ExposureTime"] < ULTRA_SHORT_EXPOSURE else "Standard"
+        current = {name : self.readSetting(name) for name in targets}
 
-        self.ExposureTime.set(preset['ExposureTime'])
-        self.FrameRate.set(preset['FrameRate'])
-        self.Gain.set(preset['Gain'])
-        self.TriggerDelay.set(preset['TriggerDelay'])
+        order = ["ExposureTimeMode"]
+        for offset , size in (("OffsetX" , "Width") , ("OffsetY" , "Height")):
+            # A smaller offset makes room for a larger size, a smaller size makes room for a larger offset
+            if offset in targets and targets[offset] > current[offset]:
+                order += [size , offset]
+            else:
+                order += [offset , size]
+        order += ["ExposureTime" , "FrameRate" , "Gain" , "TriggerDelay"]
+
+        return [(name , current[name] , targets[name]) for name in order if name in targets and current[name] != targets[name]]
+
+    def applySettings(self , settings):
+        # Only changed features are written and the stream is stopped only for features locked while it runs.
+        # If a write fails, the features written so far are put back and the error is raised again.
+        changes = self.planSettings(settings)
+        restart = self.isStreaming() and any(name in STREAM_LOCKED_FEATURES for name , _ , _ in changes)
+        pooled = restart and self.cam.data_stream[0].is_buffer_pool_enabled()
+        written = []
+        if restart:
+            # Pooled buffers are returned before the driver frees them; the pool is re-armed while stopped so
+            # buf_ids of frames handed out before the restart can't be mistaken for new ones
+            if pooled:
+                self.cam.data_stream[0].release_all_frames()
+            self.cam.stream_off()
+        try:
+            for name , previous , value in changes:
+                getattr(self , name).set(value)
+                written.append((name , previous))
+        except Exception:
+            self._rollbackSettings(written)
+            raise
+        finally:
+            if restart:
+                if pooled:
+                    self.enableFramePool()
+                self.cam.stream_on()
+        return [name for name , _ , _ in changes]
+
+    def _rollbackSettings(self , written):
+        # Reverse order undoes offset/size moves in an order the device accepts as well
+        for name , previous in reversed(written):
+            try:
+                getattr(self , name).set(previous)
+            except Exception as e:
+                print(f"Error restoring {name} to {previous}: {e}")
 
+    def applyPreset(self, preset):
+        sdkCalls = self.featureCache.get_statistics()["sdk_calls"]
+        self.applySettings(preset)
         self.FramesQuantity = preset["FramesQuantity"]
-        self.OffsetX.set(preset["OffsetX"])
-        self.OffsetY.set(preset['OffsetY'])
+        # Device round trips this preset cost, writes of unchanged values are skipped by the cache
+        return self.featureCache.get_statistics()["sdk_calls"] - sdkCalls
+
+    def getFeatureCacheStatistics(self):
+        return self.featureCache.get_statistics()
         
     def previewMode(self):
-        if hasattr(self , "ExposureTimeMode"):
-            self.cam.stream_off()
-            self.ExposureTimeMode.set("Standard")
-            self.cam.stream_on()
-        self.ExposureTime.set(float(40000))
+        self.applySettings({"ExposureTime" : self.presetManager.getPreset("preview").get("ExposureTime" , float(40000))})
 
     def triggerMode(self):
-        exposureTime = self.presetManager.getPreset("default").get("ExposureTime")
-        if exposureTime < 20 and hasattr(self , "ExposureTimeMode"):
-            self.cam.stream_off()
-            self.ExposureTimeMode.set("UltraShort")
-            self.cam.stream_on()
-        self.ExposureTime.set(exposureTime)  
+        self.applySettings({"ExposureTime" : self.presetManager.getPreset("default").get("ExposureTime")})
 
-    def  saveImages(self , dir_path ):
-        for i, (img, timestamp) in enumerate(zip(self.images, self.timestamps)):
-            img.save(f"{dir_path}/Frame{i+1}__T{timestamp} µs.png")
+    def  saveImages(self , dir_path , onProgress=None , onFinished=None):
+        # Returns immediately, frames are written by the saver pool in the selected format
+        pixelFormat = getattr(self.frameStore , "pixelFormat" , None) or ("RGB8" if self.colored else "MONO8")
+        metadata = {"preset" : self.presetManager.getPreset("trigger") , "pixelFormat" : pixelFormat ,
+                    "droppedFrameIds" : list(getattr(self.frameStore , "droppedFrameIds" , []))}
+        return self.frameSaver.save(dir_path , self.frameStore , self.timestamps , self.colored , onProgress , onFinished , metadata)
 
 
 
-    def convert_to_special_pixel_format(self, rawImage , pixelFormat):
-        self.image_convert.set_dest_format(pixelFormat)
-        valid_bits = self.get_best_valid_bits(rawImage.frame_data.pixel_format)
-        self.image_convert.set_valid_bits(valid_bits)
-        buffer_out_size = self.image_convert.get_buffer_size_for_conversion(rawImage)
-        output_image_array = (gx.c_byte * buffer_out_size)()
-        output_image = gx.addressof(output_image_array)
-        self.image_convert.convert(rawImage, output_image, buffer_out_size, False)
-        if output_image is None:
-            return
-        return output_image_array, buffer_out_size
+    def convert_to_special_pixel_format(self, rawImage , pixelFormat , context=None):
+        if context is None:
+            context = self.conversionContext
+        return context.convert(rawImage , pixelFormat)
 
     def __str__(self):
         return (
@@ -333,7 +536,53 @@ class Camera:
     def switch_white_balance(self):
         self.cam.BalanceWhiteAuto.set(gx.GxAutoEntry.ONCE)
 
+    def readStreamCounters(self):
+        # Cumulative SDK stream counters, a counter the stream can't read is not asked for again
+        stream = self.cam.data_stream[0]
+        counters = {}
+        for name in STREAM_COUNTERS:
+            feature = getattr(stream , name , None)
+            if feature is None or name in self.missingStreamCounters:
+                continue
+            try:
+                counters[name] = feature.get()
+            except Exception:
+                self.missingStreamCounters.add(name)
+        return counters
+
+    def getPoolStatistics(self):
+        return self.cam.data_stream[0].get_pool_statistics()
+
+    def _getOptionalFeature(self , getter , name):
+        try:
+            return getter(name)
+        except Exception:
+            return None
+
+    def supportsActionTrigger(self):
+        if not self.isGev or None in (self.ActionDeviceKey , self.ActionGroupKey , self.ActionGroupMask):
+            return False
+        return any(entry["symbolic"] == ACTION_TRIGGER_SOURCE for entry in self.TriggerSource.get_range())
+
+    def isPtpSynchronized(self):
+        return self.PtpEnable is not None and self.PtpEnable.get()
+
+    def configureActionCommand(self , deviceKey , groupKey , groupMask):
+        self.ActionDeviceKey.set(deviceKey)
+        self.ActionGroupKey.set(groupKey)
+        self.ActionGroupMask.set(groupMask)
+
+    def latchDeviceTime(self):
+        # Device clock in ns and the host perf_counter_ns it was latched at, None if the model can't latch
+        if self.TimestampLatch is None or self.TimestampLatchValue is None:
+            return None
+        before = time.perf_counter_ns()
+        self.TimestampLatch.send_command()
+        after = time.perf_counter_ns()
+        return self.TimestampLatchValue.get() , (before + after) // 2
+
     def close(self):
+        self.frameSaver.shutdown()
         if self.cam:
             print("{} is off".format(self.model))
             self.TriggerMode.set("OFF")
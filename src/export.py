@@ -0,0 +1,358 @@
+import os
+import shutil
+import numpy as np
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Full
+from threading import Event, Lock, Thread
+from src.burstfile import openCapture
+
+VIDEO_CODECS = ("mp4v", "avc1", "X264", "MJPG")
+SEQUENCE_FORMATS = ("png", "tiff", "npy")
+EXPORT_BATCH_SIZE = 32
+
+_codecCache = {}
+_codecLock = Lock()
+
+
+def openVideoWriter(outputFile, width, height, fps, isColor):
+    # The first codec that opens for a container type is remembered, later exports skip the trial
+    extension = os.path.splitext(outputFile)[1].lower()
+    key = (extension, isColor)
+    with _codecLock:
+        cached = _codecCache.get(key)
+    codecs = (cached,) + tuple(codec for codec in VIDEO_CODECS if codec != cached) if cached else VIDEO_CODECS
+
+    for codec in codecs:
+        try:
+            writer = cv2.VideoWriter(outputFile, cv2.VideoWriter_fourcc(*codec), fps, (width, height), isColor=isColor)
+        except Exception as e:
+            print(f"Codec {codec} failed: {e}")
+            continue
+        if writer.isOpened():
+            with _codecLock:
+                _codecCache[key] = codec
+            return writer, codec
+        writer.release()
+    return None, None
+
+
+def toVideoFrames(batch):
+    # One vectorised pass per batch: RGB to BGR by reversing the channel axis
+    if batch.ndim == 4:
+        return np.ascontiguousarray(batch[..., ::-1])
+    return np.ascontiguousarray(batch, dtype=np.uint8)
+
+
+def readFrames(images, indices):
+    # Reads each distinct source frame once, repeated indices share it
+    unique, inverse = np.unique(indices, return_inverse=True)
+    if hasattr(images, "asArray") and getattr(images, "pixelFormat", None) in (None, "RGB8", "MONO8"):
+        array = images.asArray()
+        if len(array) > unique[-1]:
+            frames = array[unique]
+            return frames if len(unique) == len(indices) else frames[inverse]
+    frames = np.stack([images[int(index)] for index in unique])
+    return frames if len(unique) == len(indices) else frames[inverse]
+
+
+def buildFramePlan(count, timestamps=None, fps=25, slowMotion=1.0):
+    # Source frame index for every output frame. With timestamps the output runs at a constant
+    # fps on the captured time axis stretched by slowMotion: frames are repeated to fill gaps
+    # and skipped when they come faster than the output rate.
+    if timestamps is None or len(timestamps) < count or count < 2:
+        return np.arange(count)
+    times = np.asarray(timestamps[:count], dtype=np.float64)
+    duration = (times[-1] - times[0]) * slowMotion / 1e6
+    outputTimes = times[0] + np.arange(int(duration * fps) + 1) / fps / slowMotion * 1e6
+    return np.clip(np.searchsorted(times, outputTimes, side="right") - 1, 0, count - 1)
+
+
+# Burns text into whole batches at once. Glyphs are rendered once into boolean masks,
+# per frame only the masks are concatenated and all frames of a batch are painted in one
+# indexed assignment.
+class OverlayRenderer:
+    CHARACTERS = "0123456789.:-+ FrameTus"
+
+    def __init__(self, frameHeight, color=255):
+        self.scale = max(0.4, frameHeight / 480)
+        self.thickness = max(1, int(round(self.scale)))
+        (width, height), baseline = cv2.getTextSize("0", cv2.FONT_HERSHEY_SIMPLEX, self.scale, self.thickness)
+        self.cellWidth = width + 1
+        self.cellHeight = height + baseline + 2
+        self.margin = self.cellHeight // 2
+        self.color = color
+        self.glyphs = {}
+        for character in self.CHARACTERS:
+            cell = np.zeros((self.cellHeight, self.cellWidth), dtype=np.uint8)
+            cv2.putText(cell, character, (0, height + 1), cv2.FONT_HERSHEY_SIMPLEX, self.scale, 255, self.thickness)
+            self.glyphs[character] = cell > 0
+
+    def textMask(self, text):
+        return np.hstack([self.glyphs.get(character, self.glyphs[" "]) for character in text])
+
+    def apply(self, frames, texts):
+        masks = [self.textMask(text) for text in texts]
+        width = min(max(mask.shape[1] for mask in masks), frames.shape[2] - self.margin)
+        height = min(self.cellHeight, frames.shape[1] - self.margin)
+        if width <= 0 or height <= 0:
+            return frames
+        stacked = np.zeros((len(masks), height, width), dtype=bool)
+        for i, mask in enumerate(masks):
+            stacked[i, :, :mask.shape[1]] = mask[:height, :width]
+
+        frames = np.array(frames, copy=True)
+        region = frames[:, self.margin:self.margin + height, self.margin:self.margin + width]
+        region //= 2
+        region[stacked] = self.color
+        return frames
+
+
+def overlayText(index, timestamp):
+    return f"Frame {index}  T {timestamp:.1f} us"
+
+
+def planBatches(images, plan, batchSize):
+    for start in range(0, len(plan), batchSize):
+        indices = plan[start:start + batchSize]
+        yield indices, readFrames(images, indices)
+
+
+def iteratorBatches(frames, batchSize):
+    # Sources without a length are numbered in arrival order
+    batch = []
+    index = 0
+    for frame in frames:
+        batch.append(frame)
+        if len(batch) == batchSize:
+            yield np.arange(index, index + len(batch)), np.stack(batch)
+            index += len(batch)
+            batch = []
+    if batch:
+        yield np.arange(index, index + len(batch)), np.stack(batch)
+
+
+def prefetchBatches(batches, depth, stopEvent):
+    # Reads and decodes batches on a helper thread, at most depth batches ahead of the writer
+    queue = Queue(maxsize=max(1, depth))
+    done = object()
+
+    def produce():
+        try:
+            for batch in batches:
+                while not stopEvent.is_set():
+                    try:
+                        queue.put(batch, timeout=0.1)
+                        break
+                    except Full:
+                        continue
+                if stopEvent.is_set():
+                    return
+            item = done
+        except Exception as e:
+            item = e
+        while not stopEvent.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return
+            except Full:
+                continue
+
+    reader = Thread(target=produce, name="ExportPrefetch", daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = queue.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopEvent.set()
+        reader.join()
+
+
+def writeImageFile(path, frame):
+    # imencode + tofile instead of imwrite so non-ASCII paths (the µ in frame names) work everywhere
+    extension = os.path.splitext(path)[1]
+    if extension == ".npy":
+        np.save(path, frame)
+        return
+    success, encoded = cv2.imencode(extension, frame)
+    if not success:
+        raise ValueError(f"Could not encode {path}")
+    encoded.tofile(path)
+
+
+class ExportJob:
+    def __init__(self, jobId, source, fps, output, timestamps=None, useTimestamps=False, slowMotion=1.0, overlay=False, sequenceFormat=None):
+        self.jobId = jobId
+        # A frame sequence, an iterator over frames, or the path of a saved capture opened on the worker
+        self.source = source
+        self.fps = fps
+        self.output = output
+        self.timestamps = timestamps
+        self.useTimestamps = useTimestamps
+        self.slowMotion = slowMotion
+        self.overlay = overlay
+        self.sequenceFormat = sequenceFormat
+        self.plan = None
+        self.total = len(source) if hasattr(source, "__len__") and not isinstance(source, str) else 0
+        self.written = 0
+        self.codec = None
+        # Sequence exports: whether the output directory was created by this job, and the files written to it
+        self.createdOutput = False
+        self.sequenceFiles = []
+        self.cancelEvent = Event()
+
+    def cancel(self):
+        self.cancelEvent.set()
+
+    def isCancelled(self):
+        return self.cancelEvent.is_set()
+
+
+# Runs exports on a bounded pool so several cameras share the cores instead of each getting
+# an unbounded thread. Every export streams: frames are read in batches on a prefetch thread
+# at most prefetchDepth batches ahead, so a capture never has to fit in memory.
+# Progress and completion are reported through callbacks:
+# onProgress(jobId, written, total) and onFinished(jobId, output, success, message).
+# total is 0 while the length of an iterator source is unknown.
+class ExportManager:
+    def __init__(self, workers=None, onProgress=None, onFinished=None, batchSize=EXPORT_BATCH_SIZE, prefetchDepth=2):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="VideoExport")
+        self.onProgress = onProgress
+        self.onFinished = onFinished
+        self.batchSize = batchSize
+        self.prefetchDepth = prefetchDepth
+        self.jobs: dict[int, ExportJob] = {}
+        self.nextJobId = 0
+        self.lock = Lock()
+
+    def submit(self, source, fps, output, timestamps=None, useTimestamps=False, slowMotion=1.0, overlay=False, sequenceFormat=None):
+        if sequenceFormat is not None and sequenceFormat not in SEQUENCE_FORMATS:
+            raise ValueError(f"Unsupported sequence format {sequenceFormat}, expected one of {SEQUENCE_FORMATS}")
+        with self.lock:
+            job = ExportJob(self.nextJobId, source, fps, output, timestamps, useTimestamps, slowMotion, overlay, sequenceFormat)
+            self.nextJobId += 1
+            self.jobs[job.jobId] = job
+        self.executor.submit(self._run, job)
+        return job
+
+    def cancel(self, jobId):
+        with self.lock:
+            job = self.jobs.get(jobId)
+        if job is not None:
+            job.cancel()
+
+    def cancelAll(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            job.cancel()
+
+    def activeJobs(self):
+        with self.lock:
+            return list(self.jobs.values())
+
+    def _run(self, job: ExportJob):
+        try:
+            success, message = self._export(job)
+        except Exception as e:
+            success, message = False, f"Error in export: {e}"
+        with self.lock:
+            self.jobs.pop(job.jobId, None)
+        if not success:
+            self._removePartialOutput(job)
+        if self.onFinished:
+            self.onFinished(job.jobId, job.output, success, message)
+
+    def _export(self, job: ExportJob):
+        source = job.source
+        if isinstance(source, str):
+            source = openCapture(source)
+            if job.timestamps is None:
+                job.timestamps = source.timestamps
+
+        if hasattr(source, "__len__"):
+            job.plan = buildFramePlan(len(source), job.timestamps if job.useTimestamps else None, job.fps, job.slowMotion)
+            job.total = len(job.plan)
+            if not job.total:
+                return False, "No frames to export"
+            batches = planBatches(source, job.plan, self.batchSize)
+            count = len(source)
+        else:
+            batches = iteratorBatches(source, self.batchSize)
+            count = None
+        timestamps = job.timestamps if job.timestamps is not None and (count is None or len(job.timestamps) >= count) else None
+
+        writer = None
+        overlay = None
+        try:
+            for indices, frames in prefetchBatches(batches, self.prefetchDepth, Event()):
+                if job.isCancelled():
+                    return False, "Export cancelled"
+                if overlay is None and job.overlay:
+                    overlay = OverlayRenderer(frames.shape[1])
+                if overlay is not None:
+                    frames = overlay.apply(frames, [overlayText(int(index), self._timestamp(timestamps, index)) for index in indices])
+
+                if job.sequenceFormat is not None:
+                    self._writeSequence(job, indices, frames, timestamps)
+                else:
+                    if writer is None:
+                        height, width = frames.shape[1:3]
+                        writer, job.codec = openVideoWriter(job.output, width, height, job.fps, frames.ndim == 4)
+                        if writer is None:
+                            return False, "Cannot initialize any video codec."
+                    for frame in toVideoFrames(frames):
+                        writer.write(frame)
+
+                job.written += len(frames)
+                if self.onProgress:
+                    self.onProgress(job.jobId, job.written, job.total)
+        finally:
+            if writer is not None:
+                writer.release()
+
+        if not job.written:
+            return False, "No frames to export"
+        if job.sequenceFormat is not None:
+            return True, f"{job.written} frames saved to {job.output}"
+        return True, f"Video saved to {job.output} ({job.codec})"
+
+    def _removePartialOutput(self, job: ExportJob):
+        try:
+            if job.sequenceFormat is not None:
+                # A directory the user picked may hold other files, only what this job wrote is removed then
+                if job.createdOutput:
+                    shutil.rmtree(job.output, ignore_errors=True)
+                else:
+                    for path in job.sequenceFiles:
+                        if os.path.isfile(path):
+                            os.remove(path)
+            elif job.isCancelled() and os.path.isfile(job.output):
+                os.remove(job.output)
+        except OSError as e:
+            print(f"Error removing partial export {job.output}: {e}")
+
+    def _timestamp(self, timestamps, index):
+        return timestamps[index] if timestamps is not None and index < len(timestamps) else 0.0
+
+    def _writeSequence(self, job: ExportJob, indices, frames, timestamps):
+        if not os.path.isdir(job.output):
+            os.makedirs(job.output)
+            job.createdOutput = True
+        if job.sequenceFormat != "npy":
+            frames = toVideoFrames(frames)
+        for offset, (index, frame) in enumerate(zip(indices, frames)):
+            number = job.written + offset + 1
+            path = os.path.join(job.output, f"Frame{number}__T{self._timestamp(timestamps, index)} µs.{job.sequenceFormat}")
+            job.sequenceFiles.append(path)
+            writeImageFile(path, frame)
+
+    def shutdown(self):
+        self.cancelAll()
+        self.executor.shutdown(wait=True)
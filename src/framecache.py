@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from src.transforms import fitImage
+
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+
+
+# Display sized copies of burst frames keyed by (index, width, height). Least recently
+# used frames are evicted once the byte budget is exceeded. Frames ahead of the playback
+# direction are scaled on a background thread so stepping hits the cache.
+class ScaledFrameCache:
+    def __init__(self, budgetBytes=DEFAULT_BUDGET_BYTES, prefetchCount=8, workers=1):
+        self.budgetBytes = budgetBytes
+        self.prefetchCount = prefetchCount
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="FramePrefetch")
+
+        self.images = None
+        self.generation = 0
+        self.frames = OrderedDict()
+        self.pending = set()
+        self.usedBytes = 0
+        self.frameBytes = 0
+        self.lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.evicted = 0
+
+    def setSource(self, images):
+        with self.lock:
+            self.images = images
+            self.generation += 1
+            self.frames.clear()
+            self.pending.clear()
+            self.usedBytes = 0
+
+    def clear(self):
+        self.setSource(None)
+
+    def get(self, index, width, height):
+        # Before the widget has been laid out there is no size to scale to, full frames are not cached
+        if width <= 0 or height <= 0:
+            return None
+        key = (index, width, height)
+        with self.lock:
+            frame = self.frames.get(key)
+            if frame is not None:
+                self.frames.move_to_end(key)
+                self.hits += 1
+                return frame
+            self.misses += 1
+            images, generation = self.images, self.generation
+
+        if not images:
+            return None
+        frame = fitImage(images[index], width, height)
+        self._store(key, frame, generation)
+        return frame
+
+    def prefetch(self, index, direction, width, height):
+        if width <= 0 or height <= 0:
+            return
+        with self.lock:
+            images, generation = self.images, self.generation
+            if not images:
+                return
+            count = len(images)
+            limit = min(self.prefetchCount, count - 1)
+            if self.frameBytes:
+                # Never prefetch so far ahead that the next frames get evicted by later ones
+                limit = min(limit, self.budgetBytes // self.frameBytes - 1)
+            keys = []
+            for step in range(1, limit + 1):
+                key = ((index + step * direction) % count, width, height)
+                if key not in self.frames and key not in self.pending:
+                    self.pending.add(key)
+                    keys.append(key)
+
+        for key in keys:
+            self.executor.submit(self._prefetch, key, images, generation)
+
+    def _prefetch(self, key, images, generation):
+        try:
+            index, width, height = key
+            frame = fitImage(images[index], width, height)
+        except Exception as e:
+            print(f"Error prefetching frame {key[0]}: {e}")
+            with self.lock:
+                self.pending.discard(key)
+            return
+        if self._store(key, frame, generation):
+            self.prefetched += 1
+
+    def _store(self, key, frame, generation):
+        with self.lock:
+            self.pending.discard(key)
+            # The source changed while this frame was being scaled
+            if generation != self.generation or key in self.frames:
+                return False
+            self.frames[key] = frame
+            self.usedBytes += frame.nbytes
+            self.frameBytes = frame.nbytes
+            while self.usedBytes > self.budgetBytes and len(self.frames) > 1:
+                evictedKey, evictedFrame = self.frames.popitem(last=False)
+                self.usedBytes -= evictedFrame.nbytes
+                self.evicted += 1
+            return True
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def getStatistics(self):
+        with self.lock:
+            return {
+                "frames" : len(self.frames),
+                "usedBytes" : self.usedBytes,
+                "budgetBytes" : self.budgetBytes,
+                "hits" : self.hits,
+                "misses" : self.misses,
+                "prefetched" : self.prefetched,
+                "evicted" : self.evicted,
+                "pending" : len(self.pending),
+            }
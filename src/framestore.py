@@ -0,0 +1,192 @@
+import copy
+import numpy as np
+import cv2
+from collections import OrderedDict
+from threading import Lock
+
+# OpenCV names Bayer patterns by the second row, the aliases below follow the sensor naming
+BAYER_CONVERSIONS = {
+    "BAYER_RG" : cv2.COLOR_BayerRGGB2RGB,
+    "BAYER_GR" : cv2.COLOR_BayerGRBG2RGB,
+    "BAYER_GB" : cv2.COLOR_BayerGBRG2RGB,
+    "BAYER_BG" : cv2.COLOR_BayerBGGR2RGB,
+}
+
+
+def isBayerFormat(pixelFormat):
+    # Only unpacked formats, packed 10/12 bit data has no numpy layout to demosaic from
+    return bool(pixelFormat) and pixelFormat[:8] in BAYER_CONVERSIONS and pixelFormat[8:].isdigit()
+
+
+def demosaic(rawFrame, pixelFormat):
+    # pixelFormat uses GxPixelFormatEntry names, e.g. BAYER_RG8 or BAYER_GB12
+    rgb = cv2.cvtColor(rawFrame, BAYER_CONVERSIONS[pixelFormat[:8]])
+    bits = int(pixelFormat[8:])
+    if bits > 8:
+        rgb = (rgb >> (bits - 8)).astype(np.uint8)
+    return rgb
+
+
+# Canonical storage of a captured burst: one preallocated array holding every frame.
+# Behaves like a list of numpy frames so the FrameViewer can index it directly,
+# PIL images and QImages are only built from it on demand.
+class FrameStore:
+    def __init__(self, capacity=0):
+        self.capacity = capacity
+        self.frames = None
+        self.count = 0
+        self.frameIds:list[int] = []
+        # Slots a frame was written to, a slot whose conversion failed is left out of the burst by compact()
+        self.written = set()
+        self.droppedFrameIds:list[int] = []
+        # Capture directory once the burst has been saved, used for side caches such as thumbnails
+        self.path = None
+        self.lock = Lock()
+
+    def allocate(self, frameShape, dtype=np.uint8):
+        with self.lock:
+            if self.frames is None:
+                self.frames = np.zeros((self.capacity,) + tuple(frameShape), dtype=dtype)
+            return self.frames
+
+    def write(self, index, image):
+        if not 0 <= index < self.capacity:
+            raise IndexError(f"Frame {index} is outside the store capacity {self.capacity}")
+        frames = self.frames if self.frames is not None else self.allocate(image.shape, image.dtype)
+        np.copyto(frames[index], image)
+        with self.lock:
+            self.written.add(index)
+            if index + 1 > self.count:
+                self.count = index + 1
+
+    def compact(self, expected=None):
+        # Moves the written frames to the front, returns the indices of the slots that were never written.
+        # expected is the number of frames the burst should have, slots past the last write count as missing too.
+        with self.lock:
+            total = max(self.count, expected or 0)
+            missing = [index for index in range(total) if index not in self.written]
+            if not missing:
+                return []
+            kept = sorted(self.written)
+            if self.frames is not None and kept:
+                self.frames[:len(kept)] = self.frames[kept]
+            self.droppedFrameIds = [self.frameIds[index] for index in missing if index < len(self.frameIds)]
+            self.frameIds = [self.frameIds[index] for index in kept if index < len(self.frameIds)]
+            self.written = set(range(len(kept)))
+            self.count = len(kept)
+            return missing
+
+    def asArray(self):
+        # Contiguous (frames, height, width[, channels]) view of everything written so far
+        if self.frames is None:
+            return np.empty((0,), dtype=np.uint8)
+        return self.frames[:self.count]
+
+    def snapshot(self):
+        # Shares the frame buffer, clearing this store afterwards does not pull frames from under a reader
+        other = copy.copy(self)
+        other.lock = Lock()
+        return other
+
+    def clear(self):
+        with self.lock:
+            self.frames = None
+            self.count = 0
+            self.frameIds = []
+            self.written = set()
+            self.droppedFrameIds = []
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"Frame index {index} out of range")
+        return self.frames[index]
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.frames[index]
+
+
+# Small LRU of demosaiced frames, shared by every reader of one raw burst
+class DemosaicCache:
+    def __init__(self, pixelFormat, capacity=32):
+        self.pixelFormat = pixelFormat
+        self.capacity = capacity
+        self.frames = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def get(self, index, rawFrame):
+        with self.lock:
+            frame = self.frames.get(index)
+            if frame is not None:
+                self.frames.move_to_end(index)
+                self.hits += 1
+                return frame
+            self.misses += 1
+
+        frame = demosaic(rawFrame, self.pixelFormat)
+        with self.lock:
+            self.frames[index] = frame
+            while len(self.frames) > self.capacity:
+                self.frames.popitem(last=False)
+        return frame
+
+    def getStatistics(self):
+        with self.lock:
+            return {
+                "cached" : len(self.frames),
+                "capacity" : self.capacity,
+                "hits" : self.hits,
+                "misses" : self.misses,
+            }
+
+
+# Keeps the undemosaiced Bayer frames (8 bit, or 10/12 bit in uint16) and hands out RGB8
+# frames on demand, a third of the memory of a converted burst for 8 bit sensors.
+class RawFrameStore(FrameStore):
+    def __init__(self, capacity=0, pixelFormat=None, cacheSize=32):
+        super().__init__(capacity)
+        self.cacheSize = cacheSize
+        self.cache = None
+        self.pixelFormat = None
+        if pixelFormat:
+            self.setPixelFormat(pixelFormat)
+
+    def setPixelFormat(self, pixelFormat):
+        if not isBayerFormat(pixelFormat):
+            raise ValueError(f"Raw storage needs a Bayer pixel format, got {pixelFormat}")
+        if pixelFormat != self.pixelFormat:
+            self.pixelFormat = pixelFormat
+            self.cache = DemosaicCache(pixelFormat, self.cacheSize)
+
+    def compact(self, expected=None):
+        missing = super().compact(expected)
+        if missing and self.pixelFormat:
+            # Cached frames are keyed by slot, compacting moved them
+            self.cache = DemosaicCache(self.pixelFormat, self.cacheSize)
+        return missing
+
+    def clear(self):
+        super().clear()
+        if self.pixelFormat:
+            self.cache = DemosaicCache(self.pixelFormat, self.cacheSize)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        rawFrame = super().__getitem__(index)
+        return self.cache.get(index, rawFrame)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
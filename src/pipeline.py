@@ -0,0 +1,248 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Full, Empty
+from threading import Thread, Lock, local
+
+
+class StageTimer:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.lock = Lock()
+
+    def add(self, seconds):
+        with self.lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.maximum:
+                self.maximum = seconds
+
+    def getStatistics(self):
+        with self.lock:
+            mean = self.total / self.count if self.count else 0.0
+            return {
+                "count" : self.count,
+                "totalMs" : self.total * 1000,
+                "meanMs" : mean * 1000,
+                "maxMs" : self.maximum * 1000,
+            }
+
+
+# Bounded queue between one acquiring thread and a pool of converting threads.
+# Frames are numbered when they enter the queue and results are delivered in that order.
+# When the queue is full the new frame is dropped instead of blocking acquisition.
+class FramePipeline:
+    def __init__(self, convert, deliver, workers=2, queueSize=4, createWorkerState=None, release=None):
+        self.convert = convert
+        self.deliver = deliver
+        self.workers = max(1, workers)
+        self.createWorkerState = createWorkerState
+        self.release = release
+
+        self.queue = Queue(maxsize=max(1, queueSize))
+        self.threads:list[Thread] = []
+        self.running = False
+
+        self.nextSequence = 0
+        self.nextDelivery = 0
+        self.pending = {}
+        self.orderLock = Lock()
+
+        self.submitted = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+        self.maxQueueDepth = 0
+
+        self.acquireTimer = StageTimer()
+        self.queueTimer = StageTimer()
+        self.convertTimer = StageTimer()
+
+    def start(self):
+        self.running = True
+        for i in range(self.workers):
+            thread = Thread(target=self._work, name=f"FramePipelineWorker{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        self.running = False
+        for thread in self.threads:
+            thread.join()
+        self.threads.clear()
+
+        while True:
+            try:
+                sequence, queuedAt, frame = self.queue.get_nowait()
+            except Empty:
+                break
+            self._release(frame)
+
+        with self.orderLock:
+            self.pending.clear()
+            self.nextDelivery = self.nextSequence
+
+    def recordAcquire(self, seconds):
+        self.acquireTimer.add(seconds)
+
+    def submit(self, frame):
+        try:
+            self.queue.put_nowait((self.nextSequence, time.perf_counter(), frame))
+        except Full:
+            self.dropped += 1
+            self._release(frame)
+            return False
+
+        self.nextSequence += 1
+        self.submitted += 1
+        depth = self.queue.qsize()
+        if depth > self.maxQueueDepth:
+            self.maxQueueDepth = depth
+        return True
+
+    def _work(self):
+        state = self.createWorkerState() if self.createWorkerState else None
+        while self.running:
+            try:
+                sequence, queuedAt, frame = self.queue.get(timeout=0.1)
+            except Empty:
+                continue
+
+            start = time.perf_counter()
+            self.queueTimer.add(start - queuedAt)
+            try:
+                result = self.convert(frame, state)
+            except Exception as e:
+                print(f"Error converting frame {sequence}: {e}")
+                result = None
+            finally:
+                self._release(frame)
+            self.convertTimer.add(time.perf_counter() - start)
+
+            self._complete(sequence, result)
+
+    def _complete(self, sequence, result):
+        with self.orderLock:
+            if sequence < self.nextDelivery:
+                return
+            self.pending[sequence] = result
+            while self.nextDelivery in self.pending:
+                result = self.pending.pop(self.nextDelivery)
+                self.nextDelivery += 1
+                if result is None:
+                    self.failed += 1
+                    continue
+                self.delivered += 1
+                self.deliver(result)
+
+    def _release(self, frame):
+        if self.release is None:
+            return
+        try:
+            self.release(frame)
+        except Exception as e:
+            print(f"Error releasing frame: {e}")
+
+    def getStatistics(self):
+        return {
+            "queueDepth" : self.queue.qsize(),
+            "maxQueueDepth" : self.maxQueueDepth,
+            "queueSize" : self.queue.maxsize,
+            "workers" : self.workers,
+            "submitted" : self.submitted,
+            "dropped" : self.dropped,
+            "delivered" : self.delivered,
+            "failed" : self.failed,
+            "acquire" : self.acquireTimer.getStatistics(),
+            "queueWait" : self.queueTimer.getStatistics(),
+            "convert" : self.convertTimer.getStatistics(),
+        }
+
+
+# Single slot hand-off between a producing thread and the GUI: posting overwrites
+# the previous frame, so the GUI only ever renders the newest one.
+class FrameMailbox:
+    def __init__(self):
+        self.lock = Lock()
+        self.frame = None
+        self.produced = 0
+        self.displayed = 0
+
+    def post(self, frame):
+        with self.lock:
+            self.frame = frame
+            self.produced += 1
+
+    def take(self):
+        with self.lock:
+            frame = self.frame
+            self.frame = None
+            if frame is not None:
+                self.displayed += 1
+            return frame
+
+    def getStatistics(self):
+        with self.lock:
+            pending = 0 if self.frame is None else 1
+            return {
+                "produced" : self.produced,
+                "displayed" : self.displayed,
+                "skipped" : self.produced - self.displayed - pending,
+            }
+
+
+# Converts burst frames on a thread pool while capture is still running and writes
+# each result straight into its slot of a FrameStore. release(rawImage), when given, is
+# called once the frame has been written, so pooled frames stay zero-copy until then.
+class BurstConverter:
+    def __init__(self, convert, store, workers=2, createWorkerState=None, release=None):
+        self.convert = convert
+        self.store = store
+        self.createWorkerState = createWorkerState
+        self.release = release
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="BurstConverter")
+        self.local = local()
+        self.futures = []
+        self.failed = 0
+        self.convertTimer = StageTimer()
+
+    def submit(self, index, rawImage):
+        self.futures.append(self.executor.submit(self._convert, index, rawImage))
+
+    def _convert(self, index, rawImage):
+        state = getattr(self.local, "state", None)
+        if state is None and self.createWorkerState is not None:
+            state = self.local.state = self.createWorkerState()
+        start = time.perf_counter()
+        try:
+            image = self.convert(rawImage, state)
+            if image is None:
+                raise ValueError(f"Frame {index} could not be converted")
+            self.store.write(index, image)
+        finally:
+            if self.release is not None:
+                self.release(rawImage)
+        self.convertTimer.add(time.perf_counter() - start)
+
+    def finish(self):
+        for future in self.futures:
+            try:
+                future.result()
+            except Exception as e:
+                self.failed += 1
+                print(f"Error converting burst frame: {e}")
+        self.futures.clear()
+        self.executor.shutdown(wait=True)
+        return self.failed
+
+    def cancel(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.futures.clear()
+
+    def getStatistics(self):
+        return {
+            "pending" : sum(1 for future in self.futures if not future.done()),
+            "failed" : self.failed,
+            "convert" : self.convertTimer.getStatistics(),
+        }
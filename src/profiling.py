@@ -0,0 +1,168 @@
+import os
+import time
+from threading import Lock, local
+
+# Histogram buckets: values below 2 * SUB_BUCKETS are exact, above that every power of two is
+# split into SUB_BUCKETS linear buckets, which keeps the relative error around 3%.
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+PROFILE_PERCENTILES = (50, 99)
+
+
+def bucketIndex(value):
+    if value < 2 * SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def bucketRange(index):
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    lower = (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+    return lower, lower + (1 << shift) - 1
+
+
+# Log-linear histogram of nanosecond durations, sparse so idle stages cost nothing
+class Histogram:
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+
+    def record(self, value):
+        index = bucketIndex(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        for index, count in list(other.counts.items()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    def percentile(self, percent):
+        if not self.count:
+            return 0
+        target = self.count * percent / 100
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                lower, upper = bucketRange(index)
+                return min((lower + upper) // 2, self.maximum)
+        return self.maximum
+
+    def getStatistics(self):
+        statistics = {
+            "count" : self.count,
+            "meanUs" : self.total / self.count / 1000 if self.count else 0.0,
+            "maxUs" : self.maximum / 1000,
+        }
+        for percent in PROFILE_PERCENTILES:
+            statistics[f"p{percent}Us"] = self.percentile(percent) / 1000
+        return statistics
+
+
+class Span:
+    __slots__ = ("histograms", "key", "start")
+
+    def __init__(self, histograms, key):
+        self.histograms = histograms
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        elapsed = time.perf_counter_ns() - self.start
+        histogram = self.histograms.get(self.key)
+        if histogram is None:
+            histogram = self.histograms[self.key] = Histogram()
+        histogram.record(elapsed)
+        return False
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+# Times named stages per camera. Every thread records into its own histograms, so the hot path
+# never takes a lock; the thread tables are only merged when statistics are read. Disabled,
+# span() hands back one shared no-op context manager.
+class Profiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.local = local()
+        self.threadHistograms = []
+        self.lock = Lock()
+
+    def setEnabled(self, enabled):
+        self.enabled = enabled
+
+    def _histograms(self):
+        histograms = getattr(self.local, "histograms", None)
+        if histograms is None:
+            histograms = self.local.histograms = {}
+            with self.lock:
+                self.threadHistograms.append(histograms)
+        return histograms
+
+    def span(self, stage, key=None):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self._histograms(), (stage, key))
+
+    def record(self, stage, key, nanoseconds):
+        if not self.enabled:
+            return
+        histograms = self._histograms()
+        histogram = histograms.get((stage, key))
+        if histogram is None:
+            histogram = histograms[(stage, key)] = Histogram()
+        histogram.record(nanoseconds)
+
+    def reset(self):
+        with self.lock:
+            for histograms in self.threadHistograms:
+                histograms.clear()
+
+    def getStatistics(self):
+        merged = {}
+        with self.lock:
+            tables = list(self.threadHistograms)
+        for histograms in tables:
+            for stageKey, histogram in list(histograms.items()):
+                merged.setdefault(stageKey, Histogram()).merge(histogram)
+        return {stageKey : histogram.getStatistics() for stageKey, histogram in merged.items()}
+
+    def report(self):
+        statistics = self.getStatistics()
+        if not statistics:
+            return "Profiler: no samples"
+        lines = ["Profiler (µs):"]
+        for (stage, key), stats in sorted(statistics.items(), key=lambda item: (str(item[0][1]), item[0][0])):
+            source = "" if key is None else f"camera {key + 1} " if isinstance(key, int) else f"{key} "
+            lines.append(f"  {source}{stage}: n={stats['count']} p50={stats['p50Us']:.1f} "
+                         f"p99={stats['p99Us']:.1f} max={stats['maxUs']:.1f}")
+        return "\n".join(lines)
+
+
+# Shared by the whole app, CAMERAAPP_PROFILE=1 switches it on from the start
+profiler = Profiler(enabled=os.environ.get("CAMERAAPP_PROFILE", "") not in ("", "0"))
@@ -0,0 +1,115 @@
+import os
+import json
+import numpy as np
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from src.burstfile import writeBurst, BURST_EXTENSION
+
+SAVE_FORMATS = ("png", "tiff", "npy", "container")
+PNG_COMPRESSION_LEVELS = range(0, 10)
+
+
+# Writes a burst to disk on a thread pool. PIL and NumPy release the GIL while encoding
+# and writing, so threads scale without copying frames into worker processes.
+class FrameSaver:
+    def __init__(self, workers=None, saveFormat="png", pngCompression=1):
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="FrameSaver")
+        self.saveFormat = saveFormat
+        self.pngCompression = pngCompression
+
+    def setFormat(self, saveFormat):
+        if saveFormat not in SAVE_FORMATS:
+            raise ValueError(f"Unsupported save format {saveFormat}, expected one of {SAVE_FORMATS}")
+        self.saveFormat = saveFormat
+
+    def setPngCompression(self, level):
+        if level not in PNG_COMPRESSION_LEVELS:
+            raise ValueError(f"PNG compression level must be 0..9, got {level}")
+        self.pngCompression = level
+
+    def save(self, dirPath, frames, timestamps, colored, onProgress=None, onFinished=None, metadata=None):
+        # A snapshot shares the frame buffer, so the burst stays alive even if the store is cleared meanwhile
+        if hasattr(frames, "snapshot"):
+            frames = frames.snapshot()
+        count = min(len(frames), len(timestamps))
+        timestamps = list(timestamps[:count])
+        job = SaveJob(dirPath, count, onProgress, onFinished)
+
+        if not count:
+            job.complete()
+        elif self.saveFormat == "container":
+            job.total = 1
+            frameIds = list(getattr(frames, "frameIds", []))
+            array = frames.asArray()[:count] if hasattr(frames, "asArray") else np.stack(frames[:count])
+            job.track(self.executor.submit(self._saveContainer, dirPath, array, timestamps, frameIds, metadata or {}))
+        else:
+            saveFrame = {
+                "png" : self._savePng,
+                "tiff" : self._saveTiff,
+                "npy" : self._saveNpy,
+            }[self.saveFormat]
+            mode = "RGB" if colored else "L"
+            droppedFrameIds = (metadata or {}).get("droppedFrameIds")
+            if droppedFrameIds:
+                # Frame files are numbered consecutively, the gaps are only recorded here
+                with open(f"{dirPath}/Capture_info.json", "w", encoding="utf-8") as file:
+                    json.dump({"droppedFrameIds" : droppedFrameIds}, file, indent=4)
+            for i, timestamp in enumerate(timestamps):
+                path = f"{dirPath}/Frame{i+1}__T{timestamp} µs"
+                job.track(self.executor.submit(saveFrame, path, frames, i, mode))
+        return job
+
+    # Frames are fetched inside the worker so lazily decoded stores are decoded in parallel
+    def _savePng(self, path, frames, index, mode):
+        Image.fromarray(frames[index], mode).save(f"{path}.png", compress_level=self.pngCompression)
+
+    def _saveTiff(self, path, frames, index, mode):
+        Image.fromarray(frames[index], mode).save(f"{path}.tiff", format="TIFF")
+
+    def _saveNpy(self, path, frames, index, mode):
+        np.save(f"{path}.npy", frames[index])
+
+    def _saveContainer(self, dirPath, frames, timestamps, frameIds, metadata):
+        writeBurst(f"{dirPath}/Burst{BURST_EXTENSION}", frames, timestamps, frameIds,
+                   pixelFormat=metadata.get("pixelFormat"), preset=metadata.get("preset"),
+                   droppedFrameIds=metadata.get("droppedFrameIds"))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+class SaveJob:
+    def __init__(self, dirPath, total, onProgress=None, onFinished=None):
+        self.dirPath = dirPath
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.onProgress = onProgress
+        self.onFinished = onFinished
+        self.lock = Lock()
+
+    def track(self, future):
+        future.add_done_callback(self._onDone)
+
+    def _onDone(self, future):
+        error = future.exception()
+        with self.lock:
+            self.done += 1
+            if error is not None:
+                self.failed += 1
+                print(f"Error saving frame to {self.dirPath}: {error}")
+            done, finished = self.done, self.done == self.total
+        if self.onProgress:
+            self.onProgress(done, self.total)
+        if finished:
+            self.complete()
+
+    def complete(self):
+        if self.onFinished:
+            self.onFinished(self.dirPath, self.failed)
+
+    def isFinished(self):
+        with self.lock:
+            return self.done >= self.total
@@ -0,0 +1,143 @@
+import time
+from threading import Barrier, Condition, Thread
+
+ACTION_TRIGGER_SOURCE = "Action0"
+SYNC_MODES = ("scheduled", "action", "software")
+ACTION_ACK_TIMEOUT_MS = 100
+
+
+# Starts one burst on several cameras at the same moment. GigE cameras that all support action
+# commands are fired with one scheduled action command when PTP keeps their clocks in step, or
+# with a plain action command otherwise; any other mix gets software triggers released together.
+# Before firing, every device clock is latched against the host clock, so the first frame of each
+# burst can be put on one time axis: the start skew is measured and the burst timestamps shifted.
+# The report is passed to onReport(report) once every armed camera gathered its burst.
+class SyncCapture:
+    def __init__(self, cameras, deviceManager, leadTime=0.05, deviceKey=1, groupKey=1, groupMask=1,
+                 broadcastAddress="255.255.255.255", gatherTimeout=30.0, onReport=None):
+        self.cameras = cameras
+        self.deviceManager = deviceManager
+        self.leadTime = leadTime
+        self.deviceKey = deviceKey
+        self.groupKey = groupKey
+        self.groupMask = groupMask
+        self.broadcastAddress = broadcastAddress
+        self.gatherTimeout = gatherTimeout
+        self.onReport = onReport
+
+        self.mode = self._chooseMode()
+        self.clockOffsets = {}
+        self.firstTimestamps = {}
+        self.expected = set(range(len(cameras)))
+        self.fireSpread = None
+        self.startOffsets = None
+        self.report = None
+        self.condition = Condition()
+
+    def _chooseMode(self):
+        if self.cameras and all(camera.supportsActionTrigger() for camera in self.cameras):
+            if all(camera.isPtpSynchronized() for camera in self.cameras):
+                return "scheduled"
+            return "action"
+        return "software"
+
+    def triggerSource(self):
+        return "Software" if self.mode == "software" else ACTION_TRIGGER_SOURCE
+
+    def arm(self):
+        if self.mode != "software":
+            for camera in self.cameras:
+                camera.configureActionCommand(self.deviceKey, self.groupKey, self.groupMask)
+
+    def drop(self, index):
+        # A camera that could not be armed is not waited for
+        with self.condition:
+            self.expected.discard(index)
+            self.condition.notify_all()
+
+    def calibrate(self):
+        # Device clock (ns) minus host clock (ns) per camera, read right before firing
+        for index, camera in enumerate(self.cameras):
+            try:
+                latched = camera.latchDeviceTime()
+            except Exception as e:
+                print(f"Could not latch the clock of camera {index+1}: {e}")
+                continue
+            if latched is not None:
+                deviceTime, hostTime = latched
+                self.clockOffsets[index] = deviceTime - hostTime
+
+    def fire(self):
+        if self.mode == "scheduled" and self.clockOffsets:
+            # PTP keeps the device clocks equal, one latched offset tells the time on all of them
+            offset = next(iter(self.clockOffsets.values()))
+            actionTime = time.perf_counter_ns() + offset + int(self.leadTime * 1e9)
+            self.deviceManager.issue_scheduled_action_command(
+                self.deviceKey, self.groupKey, self.groupMask, actionTime,
+                self.broadcastAddress, None, ACTION_ACK_TIMEOUT_MS, len(self.cameras))
+        elif self.mode in ("scheduled", "action"):
+            self.deviceManager.issue_action_command(
+                self.deviceKey, self.groupKey, self.groupMask,
+                self.broadcastAddress, None, ACTION_ACK_TIMEOUT_MS, len(self.cameras))
+        else:
+            self._fireSoftware()
+
+    def _fireSoftware(self):
+        # One thread per camera parked on a barrier, the commands leave as close together as the GIL allows
+        barrier = Barrier(len(self.cameras))
+        sent = [None] * len(self.cameras)
+
+        def send(index, camera):
+            barrier.wait()
+            try:
+                camera.TriggerSoftware.send_command()
+                sent[index] = time.perf_counter_ns()
+            except Exception as e:
+                print(f"Software trigger of camera {index+1} failed: {e}")
+
+        threads = [Thread(target=send, args=(index, camera), daemon=True) for index, camera in enumerate(self.cameras)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sentTimes = [sentTime for sentTime in sent if sentTime is not None]
+        self.fireSpread = (max(sentTimes) - min(sentTimes)) / 1000 if sentTimes else None
+
+    def burstGathered(self, index, firstTimestamp):
+        # Called by every capture thread with the device timestamp of its first frame (None without frames).
+        # Blocks until all cameras reported or gatherTimeout passed, returns this burst's start offset in µs.
+        with self.condition:
+            if index in self.expected and index not in self.firstTimestamps:
+                self.firstTimestamps[index] = firstTimestamp
+                self.condition.notify_all()
+            self.condition.wait_for(lambda: self.expected <= self.firstTimestamps.keys(), timeout=self.gatherTimeout)
+            if self.startOffsets is None:
+                self._align()
+                report = self.report
+            else:
+                report = None
+            startOffset = self.startOffsets.get(index, 0.0)
+
+        if report is not None:
+            if self.onReport:
+                self.onReport(report)
+        return startOffset
+
+    def _align(self):
+        if self.mode == "scheduled":
+            # PTP clocks share one time base, device timestamps compare directly
+            starts = {index: timestamp for index, timestamp in self.firstTimestamps.items() if timestamp is not None}
+        else:
+            starts = {index: timestamp - self.clockOffsets[index] for index, timestamp in self.firstTimestamps.items()
+                      if timestamp is not None and index in self.clockOffsets}
+
+        first = min(starts.values()) if starts else 0
+        self.startOffsets = {index: (start - first) / 1000 for index, start in starts.items()}
+        self.report = {
+            "mode" : self.mode,
+            "cameras" : len(self.cameras),
+            "gathered" : len(starts),
+            "skewUs" : max(self.startOffsets.values()) if len(starts) > 1 else None,
+            "startOffsetsUs" : dict(self.startOffsets),
+            "fireSpreadUs" : self.fireSpread,
+        }
@@ -0,0 +1,177 @@
+import os
+import csv
+import json
+import time
+from collections import deque
+from threading import Event, Lock, Thread
+
+TELEMETRY_INTERVAL = 1.0
+HISTORY_LENGTH = 600
+TELEMETRY_LOG_FORMATS = ("csv", "jsonl")
+
+# Cumulative counters of the SDK stream layer. The GigE ones only exist on GEV streams.
+STREAM_COUNTERS = (
+    "StreamDeliveredFrameCount",
+    "StreamLostFrameCount",
+    "StreamIncompleteFrameCount",
+    "StreamDeliveredPacketCount",
+    "StreamResendPacketCount",
+    "StreamRescuedPacketCount",
+    "StreamResendCommandCount",
+    "StreamUnexpectedPacketCount",
+    "StreamMissingBlockIDCount",
+)
+
+
+# Writes samples as CSV or JSON lines, chosen by the file extension. The CSV columns are
+# fixed by the first batch of samples, keys that show up later are only in JSON lines logs.
+class TelemetryLog:
+    def __init__(self, path):
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        self.format = "jsonl" if extension in ("jsonl", "json") else "csv"
+        self.path = path
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = None
+
+    def write(self, samples):
+        if self.format == "jsonl":
+            for sample in samples:
+                self.file.write(json.dumps(sample) + "\n")
+        else:
+            if self.writer is None:
+                fieldnames = []
+                for sample in samples:
+                    fieldnames += [key for key in sample if key not in fieldnames]
+                self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, extrasaction="ignore")
+                self.writer.writeheader()
+            self.writer.writerows(samples)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+# Samples every registered source at a fixed interval on its own thread. A source is a
+# callable returning {"counters": {...}, "timers": {...}, "gauges": {...}}:
+#   counters are cumulative, the sample holds the value and <name>Rate per second
+#   timers are cumulative (count, totalMs) pairs, the sample holds <name>Ms, the mean over the interval
+#   gauges are taken as they are
+# The last historyLength samples per source are kept, each one is passed to onSample(key, sample).
+class TelemetryService:
+    def __init__(self, interval=TELEMETRY_INTERVAL, historyLength=HISTORY_LENGTH, onSample=None):
+        self.interval = interval
+        self.historyLength = historyLength
+        self.onSample = onSample
+        self.sources = {}
+        self.history = {}
+        self.previous = {}
+        self.log = None
+        self.lock = Lock()
+        self.stopEvent = Event()
+        self.thread = None
+
+    def addSource(self, key, source):
+        with self.lock:
+            self.sources[key] = source
+            self.history[key] = deque(maxlen=self.historyLength)
+            self.previous.pop(key, None)
+
+    def removeSource(self, key):
+        with self.lock:
+            self.sources.pop(key, None)
+            self.previous.pop(key, None)
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.stopEvent.clear()
+        self.thread = Thread(target=self._run, name="Telemetry", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.stopLog()
+
+    def startLog(self, path):
+        log = TelemetryLog(path)
+        with self.lock:
+            previous, self.log = self.log, log
+        if previous is not None:
+            previous.close()
+        return log.format
+
+    def stopLog(self):
+        with self.lock:
+            log, self.log = self.log, None
+        if log is not None:
+            log.close()
+
+    def _run(self):
+        # Deadlines are kept on a fixed grid so slow sources don't make the interval drift
+        deadline = time.perf_counter()
+        while not self.stopEvent.is_set():
+            self.sampleAll()
+            deadline += self.interval
+            self.stopEvent.wait(max(0.0, deadline - time.perf_counter()))
+
+    def sampleAll(self):
+        with self.lock:
+            sources = list(self.sources.items())
+        samples = []
+        for key, source in sources:
+            try:
+                sample = self._sample(key, source())
+            except Exception as e:
+                print(f"Error sampling telemetry of {key}: {e}")
+                continue
+            samples.append(sample)
+            if self.onSample:
+                self.onSample(key, sample)
+
+        with self.lock:
+            log = self.log
+        if log is not None and samples:
+            try:
+                log.write(samples)
+            except Exception as e:
+                print(f"Error writing telemetry log {log.path}: {e}")
+        return samples
+
+    def _sample(self, key, values):
+        now = time.perf_counter()
+        counters = values.get("counters", {})
+        timers = values.get("timers", {})
+        sample = {"time" : time.time(), "source" : key}
+        sample.update(values.get("gauges", {}))
+
+        with self.lock:
+            previous = self.previous.get(key)
+            elapsed = now - previous[0] if previous else 0.0
+            for name, value in counters.items():
+                sample[name] = value
+                if previous and elapsed > 0 and name in previous[1]:
+                    sample[name + "Rate"] = (value - previous[1][name]) / elapsed
+                else:
+                    sample[name + "Rate"] = 0.0
+            for name, (count, totalMs) in timers.items():
+                if previous and name in previous[2]:
+                    lastCount, lastTotal = previous[2][name]
+                    count, totalMs = count - lastCount, totalMs - lastTotal
+                sample[name + "Ms"] = totalMs / count if count > 0 else 0.0
+
+            self.previous[key] = (now, dict(counters), dict(timers))
+            if key in self.history:
+                self.history[key].append(sample)
+        return sample
+
+    def getHistory(self, key):
+        with self.lock:
+            return list(self.history.get(key, ()))
+
+    def latest(self, key):
+        with self.lock:
+            history = self.history.get(key)
+            return history[-1] if history else None
@@ -0,0 +1,130 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from src.framestore import isBayerFormat, demosaic
+
+THUMBNAIL_HEIGHT = 48
+THUMBNAIL_MAX_WIDTH = THUMBNAIL_HEIGHT * 4 // 3
+
+
+def thumbnailStep(shape, height=THUMBNAIL_HEIGHT, maxWidth=THUMBNAIL_MAX_WIDTH):
+    # Wide, short ROIs are limited by their width, not their height
+    return max(1, -(-shape[0] // height), -(-shape[1] // maxWidth))
+
+
+def decimate(frame, height=THUMBNAIL_HEIGHT, maxWidth=THUMBNAIL_MAX_WIDTH):
+    # Plain strided sampling: no filtering, but a view plus one small copy per frame
+    step = thumbnailStep(frame.shape, height, maxWidth)
+    return np.ascontiguousarray(frame[::step, ::step])
+
+
+def decimateMosaic(rawFrame, pixelFormat, height=THUMBNAIL_HEIGHT, maxWidth=THUMBNAIL_MAX_WIDTH):
+    # Whole 2x2 cells are sampled on an even step so the colour filter pattern survives,
+    # only the small mosaic is demosaiced
+    step = 2 * thumbnailStep(rawFrame.shape, height, maxWidth)
+    rows = (np.arange(0, rawFrame.shape[0] - 1, step)[:, None] + (0, 1)).ravel()
+    columns = (np.arange(0, rawFrame.shape[1] - 1, step)[:, None] + (0, 1)).ravel()
+    return demosaic(np.ascontiguousarray(rawFrame[np.ix_(rows, columns)]), pixelFormat)
+
+
+def buildThumbnail(images, index, height=THUMBNAIL_HEIGHT, maxWidth=THUMBNAIL_MAX_WIDTH):
+    # Raw bursts are sampled from their mosaic: images[index] would demosaic the full frame
+    # through the DemosaicCache the viewer shares and push its frames out
+    pixelFormat = getattr(images, "pixelFormat", None)
+    if isBayerFormat(pixelFormat) and hasattr(images, "asArray"):
+        return decimateMosaic(images.asArray()[index], pixelFormat, height, maxWidth)
+    return decimate(images[index], height, maxWidth)
+
+
+def thumbnailCachePath(directory, height=THUMBNAIL_HEIGHT, maxWidth=THUMBNAIL_MAX_WIDTH):
+    return os.path.join(directory, f"thumbnails_{maxWidth}x{height}.npy")
+
+
+# Builds thumbnails for a whole burst on a thread pool in chunks and reports every finished
+# chunk through onReady(indices). Results are kept in memory and, when the burst lives in a
+# directory, stored next to it so reopening the capture skips the work.
+class ThumbnailCache:
+    def __init__(self, height=THUMBNAIL_HEIGHT, maxWidth=THUMBNAIL_MAX_WIDTH, workers=4, chunkSize=64):
+        self.height = height
+        self.maxWidth = maxWidth
+        self.chunkSize = chunkSize
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="Thumbnails")
+        self.thumbnails = []
+        self.generation = 0
+        self.remaining = 0
+        self.lock = Lock()
+
+    def load(self, images, onReady, cacheDir=None):
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+            self.thumbnails = [None] * len(images)
+            self.remaining = len(images)
+        if not len(images):
+            return
+
+        cachePath = thumbnailCachePath(cacheDir, self.height, self.maxWidth) if cacheDir else None
+        if cachePath and os.path.exists(cachePath):
+            try:
+                cached = np.load(cachePath, mmap_mode="r")
+                if len(cached) == len(images):
+                    with self.lock:
+                        self.thumbnails = list(cached)
+                        self.remaining = 0
+                    onReady(list(range(len(images))))
+                    return
+            except Exception as e:
+                print(f"Ignoring thumbnail cache {cachePath}: {e}")
+
+        for start in range(0, len(images), self.chunkSize):
+            indices = range(start, min(start + self.chunkSize, len(images)))
+            self.executor.submit(self._build, images, indices, generation, onReady, cachePath)
+
+    def _build(self, images, indices, generation, onReady, cachePath):
+        thumbnails = []
+        for index in indices:
+            if generation != self.generation:
+                return
+            try:
+                thumbnails.append((index, buildThumbnail(images, index, self.height, self.maxWidth)))
+            except Exception as e:
+                print(f"Error building thumbnail {index}: {e}")
+
+        with self.lock:
+            if generation != self.generation:
+                return
+            for index, thumbnail in thumbnails:
+                self.thumbnails[index] = thumbnail
+            self.remaining -= len(indices)
+            finished = self.remaining == 0
+        onReady([index for index, _ in thumbnails])
+
+        if finished and cachePath:
+            self._store(cachePath, generation)
+
+    def _store(self, cachePath, generation):
+        with self.lock:
+            thumbnails = self.thumbnails
+            if generation != self.generation or any(thumbnail is None for thumbnail in thumbnails):
+                return
+        try:
+            np.save(cachePath, np.stack(thumbnails))
+        except Exception as e:
+            print(f"Could not write thumbnail cache {cachePath}: {e}")
+
+    def get(self, index):
+        with self.lock:
+            if 0 <= index < len(self.thumbnails):
+                return self.thumbnails[index]
+        return None
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.thumbnails = []
+            self.remaining = 0
+
+    def shutdown(self):
+        self.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
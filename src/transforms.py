@@ -0,0 +1,58 @@
+import numpy as np
+import cv2
+
+CROSSHAIR_COLOR = (255, 0, 0)
+CROSSHAIR_WIDTH = 3
+
+
+def fitImage(image, width, height):
+    imageHeight, imageWidth = image.shape[:2]
+    if width <= 0 or height <= 0 or imageWidth == 0 or imageHeight == 0:
+        return image
+
+    scale = min(width / imageWidth, height / imageHeight)
+    targetWidth = max(1, int(imageWidth * scale))
+    targetHeight = max(1, int(imageHeight * scale))
+    if targetWidth == imageWidth and targetHeight == imageHeight:
+        return image
+
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    return cv2.resize(image, (targetWidth, targetHeight), interpolation=interpolation)
+
+
+def orientImage(image, angle, flipHorizontal, flipVertical):
+    # angle follows QTransform.rotate on screen: positive values turn the image clockwise
+    turns = (-angle // 90) % 4
+    if turns:
+        image = np.rot90(image, turns)
+    if flipHorizontal:
+        image = image[:, ::-1]
+    if flipVertical:
+        image = image[::-1]
+    return image
+
+
+def addCrosshair(image, color=CROSSHAIR_COLOR, lineWidth=CROSSHAIR_WIDTH):
+    if image.ndim == 2:
+        image = np.dstack((image, image, image))
+    else:
+        image = image.copy()
+
+    height, width = image.shape[:2]
+    x = width // 2
+    y = height // 2
+    half = lineWidth // 2
+    image[max(0, y - half):y + half + 1, :] = color
+    image[:, max(0, x - half):x + half + 1] = color
+    return image
+
+
+def prepareDisplayImage(image, width, height, angle=0, flipHorizontal=False, flipVertical=False, crosshair=False):
+    # Scale before orienting so cv2 always works on the contiguous source buffer
+    if (angle // 90) % 2:
+        width, height = height, width
+    image = fitImage(image, width, height)
+    image = orientImage(image, angle, flipHorizontal, flipVertical)
+    if crosshair:
+        image = addCrosshair(image)
+    return np.ascontiguousarray(image)
@@ -0,0 +1,225 @@
+import os
+import sys
+import ctypes
+import unittest
+from collections import deque
+from unittest import mock
+
+# The driver calls are stubbed below, the GxIAPI library is not needed
+os.environ.setdefault("GXIPY_SIMULATOR", "1")
+import gxipy as gx
+from src.framestore import FrameStore
+from src.pipeline import BurstConverter
+
+dataStreamModule = sys.modules["gxipy.DataStream"]
+featureModule = sys.modules["gxipy.Feature"]
+
+FRAME_WIDTH = 8
+FRAME_HEIGHT = 4
+
+
+# Stands in for the GxIAPI buffer calls: a ring of driver buffers, the ones in ready are
+# handed out by dq, q puts them back at the end of ready
+class StubDriver:
+    def __init__(self, bufferCount):
+        self.memory = [(ctypes.c_ubyte * (FRAME_WIDTH * FRAME_HEIGHT))() for _ in range(bufferCount)]
+        self.buffers = []
+        for bufId, memory in enumerate(self.memory):
+            frameBuffer = gx.GxFrameBuffer()
+            frameBuffer.buf_id = bufId
+            frameBuffer.frame_id = bufId
+            frameBuffer.image_buf = ctypes.addressof(memory)
+            frameBuffer.width = FRAME_WIDTH
+            frameBuffer.height = FRAME_HEIGHT
+            frameBuffer.pixel_format = gx.GxPixelFormatEntry.MONO8
+            frameBuffer.image_size = FRAME_WIDTH * FRAME_HEIGHT
+            self.buffers.append(frameBuffer)
+        self.ready = deque(range(bufferCount))
+        self.queued = []
+        self.dqRequests = []
+
+    def gx_dq_buf(self, handle, ppFrameBuffer, timeout=200):
+        if not self.ready:
+            return gx.GxStatusList.TIMEOUT
+        ppFrameBuffer._obj.contents = self.buffers[self.ready.popleft()]
+        return gx.GxStatusList.SUCCESS
+
+    def gx_dq_all_bufs(self, handle, frameBufferArray, buffNum, timeout=200):
+        self.dqRequests.append(buffNum)
+        if not self.ready:
+            return gx.GxStatusList.TIMEOUT, 0
+        count = 0
+        while self.ready and count < buffNum:
+            frameBufferArray[count] = ctypes.pointer(self.buffers[self.ready.popleft()])
+            count += 1
+        return gx.GxStatusList.SUCCESS, count
+
+    def gx_q_buf(self, handle, pFrameBuffer):
+        bufId = pFrameBuffer.contents.buf_id
+        self.queued.append(bufId)
+        self.ready.append(bufId)
+        return gx.GxStatusList.SUCCESS
+
+    def gx_set_acquisition_buffer_number(self, handle, bufNum):
+        return gx.GxStatusList.SUCCESS
+
+    def gx_get_feature_name(self, handle, feature):
+        return gx.GxStatusList.SUCCESS, "Stub"
+
+
+class BufferPoolTestCase(unittest.TestCase):
+    bufferCount = 4
+    poolSize = 3
+
+    def setUp(self):
+        self.driver = StubDriver(self.bufferCount)
+        for name in ("gx_dq_buf", "gx_dq_all_bufs", "gx_q_buf", "gx_set_acquisition_buffer_number"):
+            patcher = mock.patch.object(dataStreamModule, name, getattr(self.driver, name), create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(featureModule, "gx_get_feature_name", self.driver.gx_get_feature_name, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.stream = dataStreamModule.DataStream(1, 1)
+        self.stream.enable_buffer_pool(self.poolSize)
+        self.stream.set_acquisition_flag(True)
+
+
+class AcquireFrameTest(BufferPoolTestCase):
+    def test_outstanding_frames_are_counted_until_released(self):
+        first = self.stream.acquire_frame(0)
+        second = self.stream.acquire_frame(0)
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 2)
+        self.assertEqual(first.get_numpy_array().shape, (FRAME_HEIGHT, FRAME_WIDTH))
+
+        first.release()
+        statistics = self.stream.get_pool_statistics()
+        self.assertEqual(statistics["outstanding"], 1)
+        self.assertEqual(statistics["acquired_count"], 2)
+        self.assertEqual(statistics["released_count"], 1)
+        self.assertEqual(statistics["high_water_mark"], 2)
+        self.assertEqual(self.driver.queued, [first.frame_data.buf_id])
+
+        with second:
+            pass
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 0)
+
+    def test_double_release_is_a_no_op(self):
+        image = self.stream.acquire_frame(0)
+        image.release()
+        image.release()
+        self.stream.release_frame(image)
+        self.assertEqual(self.driver.queued, [image.frame_data.buf_id])
+        self.assertEqual(self.stream.get_pool_statistics()["released_count"], 1)
+
+    def test_starves_when_every_pool_buffer_is_held(self):
+        images = [self.stream.acquire_frame(0) for _ in range(self.poolSize)]
+        self.assertNotIn(None, images)
+        self.assertIsNone(self.stream.acquire_frame(0))
+        self.assertEqual(self.stream.get_pool_statistics()["starvation_count"], 1)
+        # The driver still had a buffer ready, the pool must not have taken it
+        self.assertEqual(len(self.driver.ready), self.bufferCount - self.poolSize)
+
+        images[0].release()
+        self.assertIsNotNone(self.stream.acquire_frame(0))
+
+    def test_release_all_frames_returns_every_buffer(self):
+        images = [self.stream.acquire_frame(0) for _ in range(2)]
+        self.stream.release_all_frames()
+        self.assertEqual(sorted(self.driver.queued), sorted(image.frame_data.buf_id for image in images))
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 0)
+
+        images[0].release()
+        self.assertEqual(len(self.driver.queued), 2)
+
+    def test_frames_from_before_a_pool_reset_are_not_released(self):
+        stale = self.stream.acquire_frame(0)
+        self.stream.release_all_frames()
+        self.stream.set_acquisition_flag(False)
+        self.stream.enable_buffer_pool(self.poolSize)
+        self.stream.set_acquisition_flag(True)
+        self.driver.ready = deque([stale.frame_data.buf_id])
+        current = self.stream.acquire_frame(0)
+        self.assertEqual(current.frame_data.buf_id, stale.frame_data.buf_id)
+
+        stale.release()
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 1)
+        self.assertEqual(self.driver.queued, [stale.frame_data.buf_id])
+
+        current.release()
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 0)
+
+    def test_timeout_returns_none(self):
+        self.driver.ready.clear()
+        self.assertIsNone(self.stream.acquire_frame(0))
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 0)
+
+
+class DequeueBatchTest(BufferPoolTestCase):
+    bufferCount = 6
+    poolSize = 4
+
+    def test_partial_batch_returns_what_is_ready(self):
+        self.driver.ready = deque([0, 1])
+        images = self.stream.dequeue_batch(4, 0)
+        self.assertEqual([image.frame_data.buf_id for image in images], [0, 1])
+        self.assertTrue(all(isinstance(image, gx.PooledRawImage) for image in images))
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 2)
+
+    def test_timeout_returns_empty_list(self):
+        self.driver.ready.clear()
+        self.assertEqual(self.stream.dequeue_batch(4, 0), [])
+        statistics = self.stream.get_pool_statistics()
+        self.assertEqual(statistics["outstanding"], 0)
+        self.assertEqual(statistics["acquired_count"], 0)
+
+    def test_batch_is_capped_by_free_pool_capacity(self):
+        held = self.stream.acquire_frame(0)
+        images = self.stream.dequeue_batch(10, 0)
+        self.assertEqual(self.driver.dqRequests, [self.poolSize - 1])
+        self.assertEqual(len(images), self.poolSize - 1)
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], self.poolSize)
+
+        self.assertEqual(self.stream.dequeue_batch(10, 0), [])
+        self.assertEqual(self.driver.dqRequests, [self.poolSize - 1])
+        self.assertEqual(self.stream.get_pool_statistics()["starvation_count"], 1)
+
+        held.release()
+        images[0].release()
+        self.assertEqual(len(self.stream.dequeue_batch(10, 0)), 2)
+        self.assertEqual(self.driver.dqRequests[-1], 2)
+
+    def test_max_frames_below_one_does_not_call_the_driver(self):
+        self.assertEqual(self.stream.dequeue_batch(0, 0), [])
+        self.assertEqual(self.driver.dqRequests, [])
+
+
+class BurstConverterReleaseTest(BufferPoolTestCase):
+    def test_pooled_frames_are_released_once_stored(self):
+        for bufId, memory in enumerate(self.driver.memory):
+            ctypes.memset(memory, bufId + 1, len(memory))
+        images = self.stream.dequeue_batch(self.poolSize, 0)
+        store = FrameStore(len(images))
+        converter = BurstConverter(lambda rawImage, state: rawImage.get_numpy_array(), store,
+                                   release=lambda rawImage: rawImage.release())
+        for index, image in enumerate(images):
+            converter.submit(index, image)
+
+        self.assertEqual(converter.finish(), 0)
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 0)
+        self.assertEqual(sorted(self.driver.queued), sorted(image.frame_data.buf_id for image in images))
+        for index, image in enumerate(images):
+            self.assertTrue((store[index] == image.frame_data.buf_id + 1).all())
+
+    def test_frames_are_released_when_conversion_fails(self):
+        image = self.stream.acquire_frame(0)
+        converter = BurstConverter(lambda rawImage, state: None, FrameStore(1),
+                                   release=lambda rawImage: rawImage.release())
+        converter.submit(0, image)
+        self.assertEqual(converter.finish(), 1)
+        self.assertEqual(self.stream.get_pool_statistics()["outstanding"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()